@@ -0,0 +1,11 @@
+"""
+Замеры производительности.
+Запуск: python bench.py [--quick] [--output results.json] [--save-baseline]
+"""
+
+import sys
+
+from benchmarks.suite import main
+
+if __name__ == "__main__":
+    sys.exit(main())
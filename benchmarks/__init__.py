@@ -0,0 +1,3 @@
+"""
+Пакет benchmarks - замеры производительности.
+"""
@@ -0,0 +1,9 @@
+"""
+Запуск набора замеров: python -m benchmarks
+"""
+
+import sys
+
+from .suite import main
+
+sys.exit(main())
@@ -0,0 +1,57 @@
+"""
+Сравнение скорости Board и BitBoard.
+Запуск: python -m benchmarks.board_backends
+"""
+
+import io
+import random
+import time
+from contextlib import redirect_stdout
+
+from src.board import Board
+from src.bitboard import BitBoard
+
+
+def play_random_games(board_class, size, games, seed=0):
+    """
+    Играет случайные партии и возвращает число сделанных ходов.
+    """
+    rng = random.Random(seed)
+    cells = [(row, col) for row in range(size) for col in range(size)]
+    moves = 0
+    board = board_class(size)
+    for _ in range(games):
+        board.reset()
+        rng.shuffle(cells)
+        symbol = 'X'
+        for row, col in cells:
+            _, is_winning = board.make_move(row, col, symbol)
+            moves += 1
+            if is_winning or board.is_full():
+                break
+            symbol = 'O' if symbol == 'X' else 'X'
+    return moves
+
+
+def measure(board_class, size, games):
+    """
+    Возвращает число ходов в секунду.
+    Вывод make_move подавляется, чтобы мерить само поле.
+    """
+    with redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        moves = play_random_games(board_class, size, games)
+        elapsed = time.perf_counter() - start
+    return moves / elapsed
+
+
+def main(games=2000):
+    print(f"{'Поле':<8}{'Board, ход/с':>16}{'BitBoard, ход/с':>18}")
+    for size in range(3, Board.MAX_SIZE + 1):
+        list_rate = measure(Board, size, games)
+        bit_rate = measure(BitBoard, size, games)
+        print(f"{size}x{size:<6}{list_rate:>16,.0f}{bit_rate:>18,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Свободные клетки и ранняя ничья на 8x8.
+Мерит is_full и случайный ход против прежнего просмотра всего поля,
+а также длину и время партий с ранней ничьей и без нее.
+Запуск: python -m benchmarks.early_draw [--games 200]
+"""
+
+import argparse
+import random
+import time
+
+from src.board import Board
+from src.game import Game
+from src.players import AIPlayer
+
+SIZE = 8
+WIN_LENGTH = 5
+
+
+def scan_is_full(board):
+    """
+    Прежний is_full: просмотр всех клеток.
+    """
+    for row in range(SIZE):
+        for col in range(SIZE):
+            if board.get_cell(row, col) == ' ':
+                return False
+    return True
+
+
+def scan_random_move(board, rng):
+    """
+    Прежний случайный ход: список свободных клеток по всему полю.
+    """
+    return rng.choice([(row, col) for row in range(SIZE) for col in range(SIZE)
+                       if board.get_cell(row, col) == ' '])
+
+
+def late_position(seed):
+    """
+    Позиция без победы, где свободна одна клетка в правом нижнем углу.
+    Худший случай для просмотра поля.
+    """
+    rng = random.Random(seed)
+    while True:
+        board = Board(SIZE, WIN_LENGTH, verbose=False)
+        cells = [(row, col) for row in range(SIZE) for col in range(SIZE)][:-1]
+        rng.shuffle(cells)
+        for move in cells:
+            if board.push(*move):
+                break
+        else:
+            return board
+
+
+def per_call(function, calls):
+    """
+    Return: микросекунды на вызов.
+    """
+    start = time.perf_counter()
+    for _ in range(calls):
+        function()
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+def play_games(difficulty, games, early_draw, seed):
+    """
+    Return: (средняя длина партии, доля ничьих, мс на партию).
+    """
+    players = [AIPlayer(symbol, difficulty=difficulty, think_time=0, use_cache=False, seed=seed + index)
+               for index, symbol in enumerate(('X', 'O'))]
+    moves = draws = 0
+    start = time.perf_counter()
+    for _ in range(games):
+        game = Game(*players, board_size=SIZE, win_length=WIN_LENGTH,
+                    verbose=False, early_draw=early_draw)
+        game.play_full_game()
+        moves += len(game.history)
+        draws += game.winner is None
+    elapsed = time.perf_counter() - start
+    return moves / games, draws / games, elapsed / games * 1e3
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Замер свободных клеток и ранней ничьей")
+    parser.add_argument('--games', type=int, default=200)
+    parser.add_argument('--calls', type=int, default=100_000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    board = late_position(args.seed)
+    rng = random.Random(args.seed)
+    print(f"Поле {SIZE}x{SIZE}, свободна одна клетка, мкс на вызов:")
+    print(f"  is_full       просмотр {per_call(lambda: scan_is_full(board), args.calls):6.2f}"
+          f"   счетчик {per_call(board.is_full, args.calls):6.2f}")
+    print(f"  случайный ход просмотр {per_call(lambda: scan_random_move(board, rng), args.calls):6.2f}"
+          f"   список  {per_call(lambda: board.random_move(rng), args.calls):6.2f}")
+
+    print(f"\nПартии {SIZE}x{SIZE}, линия {WIN_LENGTH}, {args.games} партий:")
+    print(f"{'уровень':>8} {'ранняя ничья':>13} {'ходов':>7} {'ничьих':>7} {'мс на партию':>13}")
+    for difficulty in ('easy', 'medium'):
+        for early_draw in (False, True):
+            length, draws, millis = play_games(difficulty, args.games, early_draw, args.seed)
+            print(f"{difficulty:>8} {'да' if early_draw else 'нет':>13} {length:>7.1f} "
+                  f"{draws:>7.0%} {millis:>13.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Пропускная способность партий с разными приемниками событий.
+Партии компьютерных игроков без паузы; консольный и JSON-приемники
+пишут в память (io.StringIO), чтобы замер не зависел от терминала.
+Запуск: python -m benchmarks.event_sinks [--games 5000]
+"""
+
+import argparse
+import io
+import time
+
+from src.events import NULL_SINK, ConsoleSink, JsonLinesSink
+from src.game import Game
+from src.players import AIPlayer
+
+SIZES = ((3, 3), (8, 5))
+
+
+def sinks():
+    """
+    Return: [(название, фабрика приемника)].
+    """
+    return [
+        ('NullSink', lambda: NULL_SINK),
+        ('ConsoleSink', lambda: ConsoleSink(io.StringIO())),
+        ('ConsoleSink x1', lambda: ConsoleSink(io.StringIO(), buffer_lines=1)),
+        ('JsonLinesSink', lambda: JsonLinesSink(io.StringIO())),
+    ]
+
+
+def play_games(size, win_length, games, make_sink, seed):
+    """
+    Return: партий в секунду.
+    """
+    sink = make_sink()
+    players = [AIPlayer(symbol, difficulty='easy', think_time=0, seed=seed + index, events=sink)
+               for index, symbol in enumerate(('X', 'O'))]
+    start = time.perf_counter()
+    for _ in range(games):
+        Game(*players, board_size=size, win_length=win_length, events=sink).play_full_game()
+    sink.close()
+    return games / (time.perf_counter() - start)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Партии в секунду с разными приемниками событий")
+    parser.add_argument('--games', type=int, default=5000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    print(f"{'приемник':>15}" + ''.join(f"{f'{size}x{size}':>12}" for size, _ in SIZES))
+    for name, make_sink in sinks():
+        rates = [play_games(size, win_length, args.games, make_sink, args.seed)
+                 for size, win_length in SIZES]
+        print(f"{name:>15}" + ''.join(f"{rate:>12,.0f}" for rate in rates))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Поиск Монте-Карло: розыгрыши в секунду и сила против случайного игрока.
+Запуск: python -m benchmarks.mcts [--games 10] [--time-limit 0.2] [--workers 1 2]
+"""
+
+import argparse
+import time
+
+from src.board import Board
+from src.game import Game
+from src.mcts import MCTSEngine
+from src.players import AIPlayer
+
+SIZES = ((3, 3), (7, 4), (8, 5))
+
+
+def playouts_per_second(size, win_length, time_limit, workers):
+    """
+    Скорость розыгрышей из пустой позиции и позиции после двух ходов.
+    """
+    board = Board(size, win_length, verbose=False)
+    engine = MCTSEngine(time_limit=time_limit, workers=workers, reuse_tree=False, seed=1)
+    engine.search(board, 'X')
+    empty_pps = engine.last_stats['pps']
+    board.push(size // 2, size // 2)
+    board.push(size // 2, size // 2 + 1)
+    engine.search(board, 'X')
+    engine.close()
+    return empty_pps, engine.last_stats['pps']
+
+
+def strength(size, win_length, games, time_limit):
+    """
+    Партии против случайного игрока, цвета чередуются.
+    Return: (победы, ничьи, поражения, среднее время хода).
+    """
+    wins = draws = losses = 0
+    move_time = []
+    for number in range(games):
+        mcts_symbol, random_symbol = ('X', 'O') if number % 2 == 0 else ('O', 'X')
+        mcts = AIPlayer(mcts_symbol, difficulty='mcts', time_limit=time_limit, seed=number)
+        opponent = AIPlayer(random_symbol, difficulty='easy', think_time=0, seed=number)
+        players = (mcts, opponent) if mcts_symbol == 'X' else (opponent, mcts)
+        game = Game(*players, board_size=size, win_length=win_length, verbose=False)
+        game.play_full_game()
+        if game.winner is mcts:
+            wins += 1
+        elif game.winner is None:
+            draws += 1
+        else:
+            losses += 1
+        move_time.append(mcts.mcts.get_stats()['avg_time_per_move'])
+    return wins, draws, losses, sum(move_time) / len(move_time)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Замер поиска Монте-Карло")
+    parser.add_argument('--games', type=int, default=10)
+    parser.add_argument('--time-limit', type=float, default=0.2)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1])
+    args = parser.parse_args(argv)
+
+    for size, win_length in SIZES:
+        print(f"{size}x{size}, линия {win_length}:")
+        for workers in args.workers:
+            start = time.perf_counter()
+            empty_pps, middle_pps = playouts_per_second(size, win_length, args.time_limit, workers)
+            print(f"  процессов {workers}: {empty_pps:,.0f} розыгрышей/с с пустого поля, "
+                  f"{middle_pps:,.0f} после двух ходов ({time.perf_counter() - start:.1f} с)")
+        wins, draws, losses, move_time = strength(size, win_length, args.games, args.time_limit)
+        print(f"  против случайного: {wins} побед, {draws} ничьих, {losses} поражений, "
+              f"{move_time * 1000:.0f} мс на ход")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Средний уровень на 8x8: время хода по ходу партии.
+Карта угроз против наивной проверки копиями поля.
+Запуск: python -m benchmarks.medium_ai [--games 20]
+"""
+
+import argparse
+import copy
+import random
+import time
+
+from src.board import Board
+from src.players import AIPlayer
+
+SIZE = 8
+WIN_LENGTH = 5
+# Ходы партии группируются по столько штук
+BUCKET = 8
+
+
+def naive_medium_move(board, symbol, rng):
+    """
+    Победа или блокировка через копию поля на каждую пустую клетку.
+    """
+    other = 'O' if symbol == 'X' else 'X'
+    empty = [(row, col) for row in range(board.size) for col in range(board.size)
+             if board.get_cell(row, col) == ' ']
+    for test_symbol in (symbol, other):
+        for row, col in empty:
+            child = copy.deepcopy(board)
+            if child.place(row, col, test_symbol):
+                return row, col
+    return rng.choice(empty)
+
+
+def play(games, seed):
+    """
+    Партии среднего уровня против самого себя до заполнения поля.
+    Return: {номер группы ходов: [время хода карта угроз, время наивного хода]}.
+    """
+    rng = random.Random(seed)
+    timings = {}
+    for number in range(games):
+        board = Board(SIZE, WIN_LENGTH, verbose=False)
+        players = [AIPlayer(symbol, difficulty='medium', think_time=0, seed=seed + number)
+                   for symbol in ('X', 'O')]
+        turn = 0
+        while not board.winner and not board.is_full():
+            player = players[turn % 2]
+
+            start = time.perf_counter()
+            naive_medium_move(board, player.symbol, rng)
+            naive_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            row, col = player.get_move(board)
+            map_time = time.perf_counter() - start
+
+            bucket = timings.setdefault(turn // BUCKET, [[], []])
+            bucket[0].append(map_time)
+            bucket[1].append(naive_time)
+            board.place(row, col, player.symbol)
+            turn += 1
+    return timings
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Замер среднего уровня на 8x8")
+    parser.add_argument('--games', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    timings = play(args.games, args.seed)
+    print(f"{SIZE}x{SIZE}, линия {WIN_LENGTH}, партий {args.games}")
+    print(f"{'ходы':>8} {'карта угроз, мкс':>18} {'копии поля, мкс':>17}")
+    for bucket in sorted(timings):
+        map_times, naive_times = timings[bucket]
+        print(f"{bucket * BUCKET + 1:>3}-{(bucket + 1) * BUCKET:<4} "
+              f"{sum(map_times) / len(map_times) * 1e6:>18.1f} "
+              f"{sum(naive_times) / len(naive_times) * 1e6:>17.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Память на живую партию: поле и два игрока, как в сессии сервера.
+Партии доигрываются до середины и остаются в памяти,
+прирост по tracemalloc делится на их число.
+Запуск: python -m benchmarks.memory [--games 2000]
+"""
+
+import argparse
+import random
+import tracemalloc
+
+from src.board import Board
+from src.players import AIPlayer
+
+SIZES = (3, 5, 8)
+
+
+def traced(factory, count):
+    """
+    Создает count объектов и держит их в памяти.
+    Return: байт на объект.
+    """
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    objects = [factory(number) for number in range(count)]
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objects
+    return (after - before) / count
+
+
+def half_played(size, seed):
+    """
+    Поле, на котором сделана половина ходов (без победы).
+    """
+    rng = random.Random(seed)
+    win_length = min(size, 5)
+    while True:
+        board = Board(size, win_length, verbose=False)
+        for _ in range(size * size // 2):
+            if board.push(*board.random_move(rng)):
+                break
+        else:
+            return board
+
+
+def live_game(size, seed, difficulty):
+    """
+    Поле в середине партии и два компьютерных игрока.
+    """
+    board = half_played(size, seed)
+    players = [AIPlayer(symbol, difficulty=difficulty, think_time=0, seed=seed)
+               for symbol in ('X', 'O')]
+    return board, players
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Память на живую партию")
+    parser.add_argument('--games', type=int, default=2000)
+    parser.add_argument('--difficulty', default='medium', choices=AIPlayer.DIFFICULTIES)
+    args = parser.parse_args(argv)
+
+    player_bytes = traced(lambda number: AIPlayer('X', difficulty=args.difficulty,
+                                                  think_time=0, seed=number), args.games)
+    print(f"AIPlayer ({args.difficulty}): {player_bytes:,.0f} байт")
+    print(f"{'поле':>6} {'пустое поле':>12} {'середина':>10} {'партия':>10}")
+    for size in SIZES:
+        empty = traced(lambda number: Board(size, min(size, 5), verbose=False), args.games)
+        middle = traced(lambda number: half_played(size, number), args.games)
+        game = traced(lambda number: live_game(size, number, args.difficulty), args.games)
+        print(f"{size}x{size:<4} {empty:>12,.0f} {middle:>10,.0f} {game:>10,.0f}")
+
+
+if __name__ == "__main__":
+    main()
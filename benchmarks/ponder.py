@@ -0,0 +1,88 @@
+"""
+Размышление во время хода соперника: попадания и время ответа.
+Соперник - игрок 'medium', который думает think секунд, как человек.
+Компьютер 'hard' играет одни и те же партии без размышлений и с ними,
+время ответа берется из событий AI_MOVE.
+Запуск: python -m benchmarks.ponder [--games 4] [--think 0.5]
+"""
+
+import argparse
+import time
+
+from src.events import EventSink, AI_MOVE
+from src.game import Game
+from src.players import AIPlayer, Player
+
+
+class ThinkingOpponent(Player):
+    """
+    Соперник с паузой перед каждым ходом: пока он думает, компьютер размышляет.
+    """
+    __slots__ = ('brain', 'think')
+
+    def __init__(self, symbol, think, seed):
+        super().__init__(symbol, "Соперник")
+        self.brain = AIPlayer(symbol, difficulty='medium', think_time=0, seed=seed)
+        self.think = think
+
+    def get_move(self, board):
+        time.sleep(self.think)
+        return self.brain.get_move(board)
+
+
+class MoveTimes(EventSink):
+    """
+    Собирает время ответа компьютера.
+    """
+
+    def __init__(self):
+        self.times = []
+
+    def emit(self, kind, **fields):
+        if kind == AI_MOVE:
+            self.times.append(fields['elapsed'])
+
+
+def play(args, ponder):
+    """
+    Return: (время ответов компьютера в с, статистика размышлений).
+    """
+    sink = MoveTimes()
+    ai = AIPlayer('O', difficulty='hard', time_limit=args.time_limit, think_time=0,
+                  use_cache=False, events=sink, ponder=ponder)
+    for number in range(args.games):
+        opponent = ThinkingOpponent('X', args.think, seed=args.seed + number)
+        Game(opponent, ai, board_size=args.size, win_length=args.win_length,
+             verbose=False).play_full_game()
+    return sink.times, ai.ponder_stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Попадания размышлений и время ответа")
+    parser.add_argument('--games', type=int, default=4)
+    parser.add_argument('--size', type=int, default=5)
+    parser.add_argument('--win-length', type=int, default=4)
+    parser.add_argument('--think', type=float, default=0.5, help="время хода соперника, с")
+    parser.add_argument('--time-limit', type=float, default=0.3, help="время на ход компьютера, с")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    print(f"Поле {args.size}x{args.size}, линия {args.win_length}, партий {args.games}, "
+          f"соперник думает {args.think} с, компьютер - до {args.time_limit} с")
+    times, _ = play(args, ponder=False)
+    plain = sum(times) / len(times)
+    print(f"Без размышлений: {len(times)} ходов, ответ в среднем {plain * 1000:.0f} мс")
+
+    times, stats = play(args, ponder=True)
+    pondered = sum(times) / len(times)
+    latency = stats['avg_latency']
+    print(f"С размышлениями: {len(times)} ходов, ответ в среднем {pondered * 1000:.0f} мс "
+          f"({(1 - pondered / plain) * 100:.0f}% быстрее)")
+    print(f"  готово заранее {stats['hits']}, частично {stats['partial']}, мимо {stats['misses']}: "
+          f"попаданий {stats['hit_rate']:.0f}%, позиций перебрано {stats['pondered']}")
+    print(f"  ответ: попадание {latency['hit'] * 1000:.2f} мс, "
+          f"частично {latency['partial'] * 1000:.0f} мс, мимо {latency['miss'] * 1000:.0f} мс")
+
+
+if __name__ == "__main__":
+    main()
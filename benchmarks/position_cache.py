@@ -0,0 +1,55 @@
+"""
+Выигрыш кэша позиций от учета симметрий.
+Запуск: python -m benchmarks.position_cache
+"""
+
+import io
+import random
+import time
+from contextlib import redirect_stdout
+
+from src.board import Board
+from src.players import AIPlayer
+
+
+def play_game(players, size, rng, random_moves=2):
+    """
+    Играет партию. Первые random_moves ходов случайные,
+    чтобы партии отличались.
+    """
+    board = Board(size)
+    symbol = 'X'
+    while True:
+        if board.move_count < random_moves:
+            row, col = rng.choice([(r, c) for r in range(size) for c in range(size)
+                                   if board.get_cell(r, c) == ' '])
+        else:
+            row, col = players[symbol].get_move(board)
+        _, is_winning = board.make_move(row, col, symbol)
+        if is_winning or board.is_full():
+            return
+        symbol = 'O' if symbol == 'X' else 'X'
+
+
+def main(games=200, size=3):
+    rng = random.Random(0)
+    AIPlayer.position_cache.clear()
+    players = {
+        'X': AIPlayer('X', difficulty='hard', time_limit=0.2),
+        'O': AIPlayer('O', difficulty='hard', time_limit=0.2),
+    }
+    start = time.perf_counter()
+    with redirect_stdout(io.StringIO()):
+        for _ in range(games):
+            play_game(players, size, rng)
+    elapsed = time.perf_counter() - start
+
+    stats = AIPlayer.position_cache.get_stats()
+    print(f"Партий: {games} на поле {size}x{size} за {elapsed:.2f} с")
+    print(f"Позиций в кэше: {stats['size']}")
+    print(f"Попадания с симметриями: {stats['hit_rate']:.1f}%")
+    print(f"Попадания без симметрий: {stats['plain_hit_rate']:.1f}%")
+
+
+if __name__ == "__main__":
+    main()
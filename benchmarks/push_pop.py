@@ -0,0 +1,92 @@
+"""
+Поиск на Board: копирование состояния против push/pop.
+Запуск: python -m benchmarks.push_pop
+"""
+
+import copy
+import io
+import time
+import tracemalloc
+from contextlib import redirect_stdout
+
+from src.board import Board
+
+
+def search_with_copies(board, depth):
+    """
+    Перебор, где каждый узел - копия поля и проверенный make_move.
+    Возвращает число узлов.
+    """
+    nodes = 1
+    if depth == 0 or board.winner or board.is_full():
+        return nodes
+    symbol = 'O' if board.last_symbol == 'X' else 'X'
+    for row in range(board.size):
+        for col in range(board.size):
+            if board.get_cell(row, col) == ' ':
+                child = copy.deepcopy(board)
+                child.make_move(row, col, symbol)
+                child.get_state()
+                nodes += search_with_copies(child, depth - 1)
+    return nodes
+
+
+def search_with_push_pop(board, depth):
+    """
+    Тот же перебор на одном поле через push/pop.
+    """
+    nodes = 1
+    if depth == 0 or board.winner or board.move_count == board.size * board.size:
+        return nodes
+    # board.grid - копия поля, в каждом узле мерили бы копирование
+    for row in range(board.size):
+        for col in range(board.size):
+            if board.get_cell(row, col) == ' ':
+                board.push(row, col)
+                nodes += search_with_push_pop(board, depth - 1)
+                board.pop()
+    return nodes
+
+
+def measure(search, size, depth):
+    """
+    Возвращает (узлы, время, пик памяти в байтах).
+    """
+    board = Board(size)
+    with redirect_stdout(io.StringIO()):
+        tracemalloc.start()
+        start = time.perf_counter()
+        nodes = search(board, depth)
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return nodes, elapsed, peak
+
+
+def bytes_per_copy(size):
+    """
+    Сколько байт выделяет одна копия поля.
+    """
+    board = Board(size)
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    child = copy.deepcopy(board)
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del child
+    return after - before
+
+
+def main():
+    for size, depth in ((3, 5), (4, 3), (6, 2), (8, 2)):
+        copy_nodes, copy_time, copy_peak = measure(search_with_copies, size, depth)
+        push_nodes, push_time, push_peak = measure(search_with_push_pop, size, depth)
+        assert copy_nodes == push_nodes
+        print(f"{size}x{size}, глубина {depth}: {copy_nodes} узлов")
+        print(f"  копии:    {copy_time:.3f} с, пик памяти {copy_peak / 1024:.1f} КБ, "
+              f"{bytes_per_copy(size)} байт на узел")
+        print(f"  push/pop: {push_time:.3f} с, пик памяти {push_peak / 1024:.1f} КБ")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Разреженное поле: стоимость хода и память от размера поля.
+Каждая партия - одинаковое число ходов рядом с камнями,
+поэтому для разреженного поля время и память не должны расти с площадью.
+Запуск: python -m benchmarks.sparse_board [--moves 60]
+"""
+
+import argparse
+import random
+import time
+import tracemalloc
+
+from src.board import Board
+from src.sparse_board import SparseBoard
+
+SIZES = (8, 15, 19, 100, 1000, None)
+
+
+def play(board, moves, rng):
+    """
+    Делает moves ходов в случайные клетки рядом с камнями.
+    Return: среднее время хода (выбор клетки + ход) в секундах.
+    """
+    start = time.perf_counter()
+    for _ in range(moves):
+        row, col = rng.choice(board.get_available_moves())
+        board.place(row, col, 'O' if board.last_symbol == 'X' else 'X')
+        # Победа не останавливает замер: нужна одинаковая длина партий
+        board.winner = None
+    return (time.perf_counter() - start) / moves
+
+
+def measure(factory, moves, games, seed):
+    """
+    Return: (мкс на ход, байт на поле после moves ходов).
+    """
+    rng = random.Random(seed)
+    move_time = 0.0
+    for _ in range(games):
+        move_time += play(factory(), moves, rng)
+
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    board = factory()
+    play(board, moves, rng)
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return move_time / games * 1e6, after - before
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Замер разреженного поля")
+    parser.add_argument('--moves', type=int, default=60)
+    parser.add_argument('--games', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    print(f"{args.moves} ходов, линия 5")
+    print(f"{'поле':>12} {'мкс на ход':>12} {'байт на поле':>14}")
+    micros, memory = measure(lambda: Board(8, 5, verbose=False), args.moves, args.games, args.seed)
+    print(f"{'Board 8x8':>12} {micros:>12.1f} {memory:>14}")
+    for size in SIZES:
+        name = f"{size}x{size}" if size is not None else "без границ"
+        micros, memory = measure(lambda: SparseBoard(size, 5, verbose=False),
+                                 args.moves, args.games, args.seed)
+        print(f"{name:>12} {micros:>12.1f} {memory:>14}")
+
+
+if __name__ == "__main__":
+    main()
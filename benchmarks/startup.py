@@ -0,0 +1,67 @@
+"""
+Время импорта при запуске main.py по подкомандам.
+Каждый случай запускается в новом процессе с python -X importtime,
+из суммы импортов верхнего уровня вычитается пустой запуск интерпретатора.
+Медиана сравнивается с бюджетом, при превышении код возврата 1.
+Запуск: python -m benchmarks.startup [--runs 11] [--budget-scale 1.0]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Случай -> (код для python -c, бюджет импорта в мс)
+CASES = {
+    'main.py': ("import main", 8),
+    'play': ("import main; main.load_command('play')", 40),
+    'play vs AI': ("import main; main.load_command('play'); from src.players import AIPlayer", 55),
+    'simulate': ("import main; main.load_command('simulate')", 50),
+    'solve': ("import main; main.load_command('solve')", 45),
+    'bench': ("import main; main.load_command('bench')", 120),
+}
+
+
+def import_time(code):
+    """
+    Return: сумма времени импортов верхнего уровня, мс.
+    """
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], cwd=ROOT,
+                            capture_output=True, text=True, check=True)
+    total = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line.split('|')
+        # Вложенные импорты отмечены отступом, они уже учтены в cumulative
+        if not name[1:].startswith(' '):
+            total += int(cumulative)
+    return total / 1000
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Бюджет времени импорта при запуске")
+    parser.add_argument('--runs', type=int, default=11, help="запусков на случай")
+    parser.add_argument('--budget-scale', type=float, default=1.0,
+                        help="множитель бюджетов для медленных машин")
+    args = parser.parse_args(argv)
+
+    interpreter = statistics.median(import_time("pass") for _ in range(args.runs))
+    print(f"Пустой запуск интерпретатора: {interpreter:.1f} мс импорта")
+    print(f"{'случай':>12} {'медиана, мс':>12} {'бюджет, мс':>11}")
+    over = []
+    for name, (code, budget) in CASES.items():
+        median = statistics.median(import_time(code) for _ in range(args.runs)) - interpreter
+        budget *= args.budget_scale
+        mark = '' if median <= budget else '  превышен'
+        print(f"{name:>12} {median:>12.1f} {budget:>11.0f}{mark}")
+        if mark:
+            over.append(name)
+    return 1 if over else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
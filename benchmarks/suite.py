@@ -0,0 +1,333 @@
+"""
+Набор замеров с сохранением в JSON и сравнением с эталоном.
+Мерит операции поля, ход компьютера на каждом уровне
+и целые партии без вывода для полей от 3х3 до 8х8.
+
+Запуск: python bench.py [--quick] [--output results.json]
+        python bench.py --save-baseline      - сохранить эталон
+        python bench.py --require-baseline   - для CI: без эталона код 2
+Эталон (по умолчанию benchmarks/baseline.json) в репозитории не хранится:
+скорость зависит от машины, поэтому он записывается там же, где сравнивается.
+Замеры медленнее эталона больше чем на threshold считаются регрессией,
+и процесс завершается с кодом 1.
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from typing import Callable, Dict, Any, List, Optional, Tuple
+
+from src.board import Board
+from src.game import Game
+from src.players import AIPlayer
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BASELINE = os.path.join(BENCHMARKS_DIR, 'baseline.json')
+RESULTS_VERSION = 1
+
+SIZES = (3, 4, 5, 6, 7, 8)
+QUICK_SIZES = (3, 8)
+
+
+def win_length_for(size: int) -> int:
+    """
+    Длина линии для победы: на больших полях - не больше 5.
+    """
+    return min(size, 5)
+
+
+def time_operation(operation: Callable[[], int], min_time: float, repeats: int) -> Tuple[float, int]:
+    """
+    Вызывает operation, пока не наберется min_time, repeats раз.
+    operation возвращает число сделанных операций.
+    Return: (лучшее число операций в секунду, операций в одном повторе).
+    """
+    best = 0.0
+    count = 0
+    for _ in range(repeats):
+        count = 0
+        start = time.perf_counter()
+        elapsed = 0.0
+        while elapsed < min_time:
+            count += operation()
+            elapsed = time.perf_counter() - start
+        best = max(best, count / elapsed)
+    return best, count
+
+
+def random_games(size: int, games: int, seed: int) -> List[List[Tuple[int, int]]]:
+    """
+    Случайные партии до победы или заполнения поля.
+    """
+    rng = random.Random(seed)
+    result = []
+    for _ in range(games):
+        board = Board(size, win_length_for(size), verbose=False)
+        cells = [(row, col) for row in range(size) for col in range(size)]
+        rng.shuffle(cells)
+        moves = []
+        for move in cells:
+            moves.append(move)
+            if board.push(*move):
+                break
+        result.append(moves)
+    return result
+
+
+def middle_position(size: int, seed: int) -> Board:
+    """
+    Позиция без победы, заполненная примерно наполовину.
+    """
+    rng = random.Random(seed)
+    while True:
+        board = Board(size, win_length_for(size), verbose=False)
+        cells = [(row, col) for row in range(size) for col in range(size)]
+        rng.shuffle(cells)
+        for move in cells[:size * size // 2]:
+            if board.push(*move):
+                break
+        else:
+            return board
+
+
+def board_cases(size: int):
+    """
+    Замеры операций поля.
+    Return: список (имя, единица, операция).
+    """
+    win_length = win_length_for(size)
+    games = random_games(size, 50, seed=size)
+    board = Board(size, win_length, verbose=False)
+
+    def make_move():
+        count = 0
+        for moves in games:
+            board.reset()
+            symbol = 'X'
+            for row, col in moves:
+                board.make_move(row, col, symbol)
+                symbol = 'O' if symbol == 'X' else 'X'
+            count += len(moves)
+        return count
+
+    middle = middle_position(size, seed=size)
+    stones = [(row, col, middle.get_cell(row, col)) for row, col in middle.moves]
+
+    def check_winner():
+        for row, col, symbol in stones:
+            middle.check_winner_after_move(row, col, symbol)
+        return len(stones)
+
+    def is_full():
+        for _ in range(100):
+            middle.is_full()
+        return 100
+
+    rng = random.Random(size)
+
+    def random_move():
+        for _ in range(100):
+            middle.random_move(rng)
+        return 100
+
+    def is_draw():
+        for _ in range(100):
+            middle.is_draw()
+        return 100
+
+    def get_state():
+        for _ in range(100):
+            middle.get_state()
+        return 100
+
+    return [
+        (f"board.make_move[{size}x{size}]", 'moves', make_move),
+        (f"board.check_winner_after_move[{size}x{size}]", 'checks', check_winner),
+        (f"board.is_full[{size}x{size}]", 'calls', is_full),
+        (f"board.random_move[{size}x{size}]", 'calls', random_move),
+        (f"board.is_draw[{size}x{size}]", 'calls', is_draw),
+        (f"board.get_state[{size}x{size}]", 'calls', get_state),
+    ]
+
+
+def ai_cases(size: int):
+    """
+    Ход компьютера на каждом уровне. Бюджеты поиска заданы глубиной
+    и числом итераций, а не временем, чтобы работа была одинаковой.
+    """
+    win_length = win_length_for(size)
+    positions = [Board(size, win_length, verbose=False), middle_position(size, seed=size + 100)]
+    players = {
+        'easy': AIPlayer('X', difficulty='easy', think_time=0, seed=0),
+        'medium': AIPlayer('X', difficulty='medium', think_time=0, seed=0),
+        'hard': AIPlayer('X', difficulty='hard', time_limit=60, max_depth=2, use_cache=False,
+                        tt_memory_mb=1),
+        'mcts': AIPlayer('X', difficulty='mcts', time_limit=60, mcts_iterations=200, seed=0),
+    }
+    cases = []
+    for difficulty, player in players.items():
+        def get_move(player=player):
+            # Иначе со второго вызова 'hard' мерил бы попадания в таблицу транспозиций
+            if player.engine.tt is not None:
+                player.engine.tt.clear()
+            for board in positions:
+                # Ход в позиции, где ходит X, - на четном числе камней
+                if board.move_count % 2:
+                    board.push(*board.get_available_moves()[0])
+                player.get_move(board)
+            return len(positions)
+        cases.append((f"ai.get_move[{difficulty},{size}x{size}]", 'moves', get_move))
+    return cases
+
+
+def game_cases(size: int):
+    """
+    Целые партии easy против easy без вывода.
+    """
+    seeds = iter(range(10 ** 9))
+
+    def play_game():
+        seed = next(seeds)
+        game = Game(AIPlayer('X', difficulty='easy', think_time=0, seed=seed),
+                    AIPlayer('O', difficulty='easy', think_time=0, seed=seed + 1),
+                    board_size=size, win_length=win_length_for(size), verbose=False)
+        game.play_full_game()
+        return 1
+
+    return [(f"game.headless[{size}x{size}]", 'games', play_game)]
+
+
+def collect_metadata() -> Dict[str, Any]:
+    """
+    Сведения о машине и версии кода.
+    """
+    metadata = {
+        'timestamp': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'processor': platform.processor(),
+        'cpu_count': os.cpu_count(),
+    }
+    try:
+        metadata['commit'] = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=BENCHMARKS_DIR,
+            capture_output=True, text=True, timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        metadata['commit'] = None
+    return metadata
+
+
+def run_suite(sizes=SIZES, min_time: float = 0.2, repeats: int = 3,
+              only: Optional[str] = None, report=print) -> Dict[str, Any]:
+    """
+    Выполняет все замеры.
+    only - подстрока имени, чтобы запустить часть замеров.
+    Return: {'version', 'metadata', 'results': {имя: {'ops_per_sec', 'unit', 'ops'}}}.
+    """
+    results = {}
+    for size in sizes:
+        for name, unit, operation in board_cases(size) + ai_cases(size) + game_cases(size):
+            if only and only not in name:
+                continue
+            ops_per_sec, ops = time_operation(operation, min_time, repeats)
+            results[name] = {'ops_per_sec': ops_per_sec, 'unit': unit, 'ops': ops}
+            report(f"{name:<45} {ops_per_sec:>14,.1f} {unit}/с")
+    return {'version': RESULTS_VERSION, 'metadata': collect_metadata(), 'results': results}
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any],
+            threshold: float) -> List[Dict[str, Any]]:
+    """
+    Сравнивает замеры с эталоном.
+    Return: строки сравнения {'name', 'baseline', 'current', 'ratio', 'regression'}.
+    """
+    rows = []
+    for name, result in current['results'].items():
+        reference = baseline['results'].get(name)
+        if reference is None or reference['ops_per_sec'] <= 0:
+            continue
+        ratio = result['ops_per_sec'] / reference['ops_per_sec']
+        rows.append({
+            'name': name,
+            'baseline': reference['ops_per_sec'],
+            'current': result['ops_per_sec'],
+            'ratio': ratio,
+            'regression': ratio < 1 - threshold,
+        })
+    return rows
+
+
+def save_json(path: str, data: Dict[str, Any]):
+    """
+    Записывает JSON через временный файл.
+    """
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as file:
+        json.dump(data, file, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Замеры производительности")
+    parser.add_argument('--quick', action='store_true', help=f"только поля {QUICK_SIZES}, короткие замеры")
+    parser.add_argument('--sizes', type=int, nargs='+', help="размеры полей")
+    parser.add_argument('--only', help="запускать замеры, в имени которых есть строка")
+    parser.add_argument('--min-time', type=float, help="время одного повтора, с")
+    parser.add_argument('--repeats', type=int, default=3)
+    parser.add_argument('--output', help="файл для результатов JSON")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help="файл эталона")
+    parser.add_argument('--save-baseline', action='store_true', help="записать результаты как эталон")
+    parser.add_argument('--require-baseline', action='store_true',
+                        help="ошибка (код 2), если эталона нет или сравнивать не с чем")
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help="допустимое падение скорости относительно эталона (0.2 = 20%%)")
+    args = parser.parse_args(argv)
+
+    sizes = args.sizes or (QUICK_SIZES if args.quick else SIZES)
+    min_time = args.min_time or (0.05 if args.quick else 0.2)
+    data = run_suite(sizes, min_time, args.repeats, args.only)
+
+    if args.output:
+        save_json(args.output, data)
+        print(f"Результаты записаны в {args.output}")
+    if args.save_baseline:
+        save_json(args.baseline, data)
+        print(f"Эталон записан в {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        if args.require_baseline:
+            print(f"Эталона {args.baseline} нет: запишите его через --save-baseline")
+            return 2
+        print(f"Эталона {args.baseline} нет, сравнение пропущено")
+        return 0
+    with open(args.baseline, encoding='utf-8') as file:
+        baseline = json.load(file)
+
+    rows = compare(data, baseline, args.threshold)
+    if not rows and args.require_baseline:
+        print(f"В эталоне {args.baseline} нет ни одного из выполненных замеров")
+        return 2
+    regressions = [row for row in rows if row['regression']]
+    print(f"\nСравнение с эталоном ({baseline['metadata'].get('commit')}, "
+          f"{baseline['metadata'].get('timestamp')}):")
+    for row in rows:
+        mark = '  РЕГРЕССИЯ' if row['regression'] else ''
+        print(f"{row['name']:<45} {row['ratio']:>7.2f}x{mark}")
+    if regressions:
+        print(f"\nРегрессий: {len(regressions)} (порог {args.threshold:.0%})")
+        return 1
+    print("\nРегрессий нет")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
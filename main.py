@@ -1,18 +1,58 @@
 """
 Главный модуль игры "Крестики-нолики"
-Запуск игры: python main.py
+Запуск игры: python main.py [подкоманда] [параметры]
+    play      партия в консоли (по умолчанию), src/game.py
+    simulate  пакетная симуляция партий, src/simulation.py
+    bench     замеры производительности, benchmarks/suite.py
+    solve     таблицы идеальной игры, src/tablebase.py
+Параметры подкоманды: python main.py <подкоманда> --help
+Модуль подкоманды импортируется только при ее вызове, поэтому партия
+не грузит симуляцию, замеры, NumPy и поиск компьютерного игрока.
 """
 
-from src.game import TicTacToeGame
+import sys
+from importlib import import_module
 
-def main():
+# Подкоманда -> (модуль с функцией main(argv), описание)
+COMMANDS = {
+    'play': ('src.game', "партия в консоли"),
+    'simulate': ('src.simulation', "пакетная симуляция партий"),
+    'bench': ('benchmarks.suite', "замеры производительности"),
+    'solve': ('src.tablebase', "таблицы идеальной игры"),
+}
+DEFAULT_COMMAND = 'play'
+
+
+def load_command(name):
+    """
+    Импортирует модуль подкоманды.
+    Return: его функция main(argv).
+    """
+    return import_module(COMMANDS[name][0]).main
+
+
+def usage():
+    lines = ["Использование: python main.py [подкоманда] [параметры]", "", "Подкоманды:"]
+    lines.extend(f"  {name:<10} {description}" for name, (_, description) in COMMANDS.items())
+    lines.append(f"Без подкоманды - {DEFAULT_COMMAND}.")
+    return '\n'.join(lines)
+
+
+def main(argv=None):
     """Точка входа в игру"""
-    print("=" * 40)
-    print("   Добро пожаловать в Крестики-нолики!")
-    print("=" * 40)
-    
-    game = TicTacToeGame()
-    game.start()
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if argv and argv[0] in ('-h', '--help'):
+        print(usage())
+        return 0
+    if argv and not argv[0].startswith('-'):
+        command, argv = argv[0], argv[1:]
+    else:
+        command = DEFAULT_COMMAND
+    if command not in COMMANDS:
+        print(f"Неизвестная подкоманда: {command}\n\n{usage()}", file=sys.stderr)
+        return 2
+    return load_command(command)(argv)
+
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
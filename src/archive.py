@@ -0,0 +1,452 @@
+"""
+Архив сыгранных партий с индексом позиций.
+Партии хранятся в файле записей (src/records.py), индекс -
+в отсортированных сегментах, которые читаются через mmap без копирования.
+
+Каждая новая порция партий получает свой сегмент, поэтому дозапись
+не перестраивает индекс. Когда сегментов становится много,
+они сливаются в один (как в LSM-дереве).
+
+Запуск: python -m src.archive archive_dir --import games.rec
+"""
+
+import argparse
+import heapq
+import mmap
+import os
+import struct
+import sys
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .board import Board
+from .records import (FILE_HEADER, GameRecord, GameRecordWriter, RecordError,
+                      check_header, decode_game, read_games)
+
+RECORDS_FILE = 'games.rec'
+SEGMENT_PREFIX = 'index-'
+SEGMENT_SUFFIX = '.seg'
+
+# Формат сегмента:
+#   заголовок: сигнатура, версия, число ссылок, число счетчиков,
+#              диапазон файла записей, который покрывает сегмент;
+#   ссылки: (ключ позиции, смещение партии), отсортированы;
+#   счетчики: (ключ позиции, клетка хода, победы, поражения, ничьи
+#             для сделавшего ход), отсортированы.
+SEGMENT_MAGIC = b'TTTI'
+SEGMENT_VERSION = 1
+SEGMENT_HEADER = struct.Struct('<4sHxxQQQQ')
+POSTING = struct.Struct('<QQ')
+COUNTER = struct.Struct('<QB3xIII')
+
+# Партий в одном новом сегменте
+SEGMENT_GAMES = 100_000
+# Сверх этого числа сегменты сливаются
+MAX_SEGMENTS = 8
+
+MASK64 = (1 << 64) - 1
+
+
+def position_key(board) -> int:
+    """
+    Ключ позиции для индекса: хеш Зобриста поля с примесью размеров.
+    Без примеси пустые поля разных размеров имели бы один ключ.
+    """
+    salt = ((board.size << 8 | board.win_length) * 0x9E3779B97F4A7C15) & MASK64
+    return board.hash ^ salt
+
+
+def replay_positions(record: GameRecord) -> Iterator[Tuple[int, Optional[int], str]]:
+    """
+    Проигрывает партию на Board.
+    Return: для каждой позиции (ключ, клетка следующего хода, символ ходящего);
+            у конечной позиции клетка None.
+    """
+    board = Board(record.size, record.win_length, verbose=False)
+    for turn, (row, col) in enumerate(record.moves):
+        symbol = record.symbol_of(turn)
+        yield position_key(board), row * record.size + col, symbol
+        board.place(row, col, symbol)
+    yield position_key(board), None, record.symbol_of(len(record.moves))
+
+
+def write_segment(path: str, postings: Iterable[Tuple[int, int]], n_postings: int,
+                  counters: Iterable[Tuple[int, int, int, int, int]], n_counters: int,
+                  records_start: int, records_end: int):
+    """
+    Записывает отсортированные ссылки и счетчики в файл сегмента.
+    Файл появляется целиком, через временный файл и os.replace.
+    """
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as file:
+        file.write(SEGMENT_HEADER.pack(SEGMENT_MAGIC, SEGMENT_VERSION, n_postings, n_counters,
+                                       records_start, records_end))
+        for posting in postings:
+            file.write(POSTING.pack(*posting))
+        for counter in counters:
+            file.write(COUNTER.pack(*counter))
+    os.replace(tmp_path, path)
+
+
+class IndexSegment:
+    """
+    Один сегмент индекса, открытый через mmap.
+    Поиск - двоичный, прямо по отображенному файлу.
+    """
+
+    def __init__(self, path: str):
+        """
+        Открывает и проверяет файл сегмента.
+        """
+        self.path = path
+        with open(path, 'rb') as file:
+            self._mm = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if len(self._mm) < SEGMENT_HEADER.size:
+            self.close()
+            raise RecordError(f"{path}: файл слишком короткий")
+        (magic, version, self.n_postings, self.n_counters,
+         self.records_start, self.records_end) = SEGMENT_HEADER.unpack_from(self._mm)
+        if magic != SEGMENT_MAGIC or version != SEGMENT_VERSION:
+            self.close()
+            raise RecordError(f"{path}: не сегмент индекса или другая версия")
+        self._postings_at = SEGMENT_HEADER.size
+        self._counters_at = self._postings_at + self.n_postings * POSTING.size
+        if len(self._mm) != self._counters_at + self.n_counters * COUNTER.size:
+            self.close()
+            raise RecordError(f"{path}: размер файла не совпадает с заголовком")
+
+    def close(self):
+        self._mm.close()
+
+    def _lower_bound(self, key: int, start: int, count: int, item: struct.Struct) -> int:
+        """
+        Первый элемент с ключом >= key.
+        """
+        low, high = 0, count
+        while low < high:
+            middle = (low + high) // 2
+            if item.unpack_from(self._mm, start + middle * item.size)[0] < key:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def find_games(self, key: int) -> Iterator[int]:
+        """
+        Смещения партий, прошедших через позицию.
+        """
+        index = self._lower_bound(key, self._postings_at, self.n_postings, POSTING)
+        while index < self.n_postings:
+            found, offset = POSTING.unpack_from(self._mm, self._postings_at + index * POSTING.size)
+            if found != key:
+                return
+            yield offset
+            index += 1
+
+    def find_counters(self, key: int) -> Iterator[Tuple[int, int, int, int]]:
+        """
+        Счетчики ходов из позиции: (клетка, победы, поражения, ничьи).
+        """
+        index = self._lower_bound(key, self._counters_at, self.n_counters, COUNTER)
+        while index < self.n_counters:
+            found, cell, wins, losses, draws = COUNTER.unpack_from(
+                self._mm, self._counters_at + index * COUNTER.size)
+            if found != key:
+                return
+            yield cell, wins, losses, draws
+            index += 1
+
+    def iter_postings(self) -> Iterator[Tuple[int, int]]:
+        for index in range(self.n_postings):
+            yield POSTING.unpack_from(self._mm, self._postings_at + index * POSTING.size)
+
+    def iter_counters(self) -> Iterator[Tuple[int, int, int, int, int]]:
+        for index in range(self.n_counters):
+            yield COUNTER.unpack_from(self._mm, self._counters_at + index * COUNTER.size)
+
+
+class GameArchive:
+    """
+    Каталог с файлом записей и сегментами индекса.
+    Arg:
+        directory - каталог архива, создается при необходимости.
+        segment_games - партий в одном новом сегменте.
+        max_segments - сверх этого числа сегменты сливаются.
+    """
+
+    def __init__(self, directory: str, segment_games: int = SEGMENT_GAMES,
+                 max_segments: int = MAX_SEGMENTS):
+        """
+        Открывает архив и все его сегменты.
+        """
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.records_path = os.path.join(directory, RECORDS_FILE)
+        self.segment_games = segment_games
+        self.max_segments = max_segments
+        self._records_mm: Optional[mmap.mmap] = None
+
+        if not os.path.exists(self.records_path):
+            GameRecordWriter(self.records_path).close()
+        with open(self.records_path, 'rb') as file:
+            check_header(file.read(FILE_HEADER.size), self.records_path)
+
+        self.segments: List[IndexSegment] = []
+        self._next_number = 1
+        self._load_segments()
+
+    def _segment_path(self, number: int) -> str:
+        return os.path.join(self.directory, f"{SEGMENT_PREFIX}{number:06d}{SEGMENT_SUFFIX}")
+
+    def _load_segments(self):
+        """
+        Открывает сегменты по порядку номеров.
+        Сегменты, уже вошедшие в слитый (если слияние прервалось
+        до удаления старых файлов), удаляются.
+        """
+        numbers = sorted(
+            int(name[len(SEGMENT_PREFIX):-len(SEGMENT_SUFFIX)])
+            for name in os.listdir(self.directory)
+            if name.startswith(SEGMENT_PREFIX) and name.endswith(SEGMENT_SUFFIX)
+        )
+        segments = [IndexSegment(self._segment_path(number)) for number in numbers]
+        if numbers:
+            self._next_number = numbers[-1] + 1
+
+        for segment in segments:
+            covered = any(
+                other is not segment
+                and other.records_start <= segment.records_start
+                and segment.records_end <= other.records_end
+                and (other.records_start, other.records_end) != (segment.records_start, segment.records_end)
+                for other in segments
+            )
+            if covered:
+                segment.close()
+                os.remove(segment.path)
+            else:
+                self.segments.append(segment)
+
+    @property
+    def indexed_until(self) -> int:
+        """
+        Смещение в файле записей, до которого партии проиндексированы.
+        """
+        return max((segment.records_end for segment in self.segments), default=FILE_HEADER.size)
+
+    def close(self):
+        for segment in self.segments:
+            segment.close()
+        self.segments = []
+        if self._records_mm is not None:
+            self._records_mm.close()
+            self._records_mm = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def writer(self) -> GameRecordWriter:
+        """
+        Запись партий прямо в архив, например через Game(record_writer=...).
+        Новые партии попадут в индекс после refresh().
+        """
+        return GameRecordWriter(self.records_path)
+
+    def append(self, records: Iterable[GameRecord]) -> int:
+        """
+        Дописывает партии и индексирует их.
+        Return: число новых проиндексированных партий.
+        """
+        with self.writer() as writer:
+            for record in records:
+                writer.write_record(record)
+        return self.refresh()
+
+    def refresh(self) -> int:
+        """
+        Индексирует партии, дописанные после последнего сегмента.
+        Незаконченная партия в конце файла ждет следующего вызова.
+        Return: число новых проиндексированных партий.
+        """
+        records = self._map_records()
+        pos = self.indexed_until
+        indexed = 0
+        while True:
+            start = pos
+            postings: List[Tuple[int, int]] = []
+            counters: Dict[Tuple[int, int], List[int]] = {}
+            games = 0
+            while games < self.segment_games:
+                record, end = decode_game(records, pos)
+                if record is None:
+                    break
+                self._index_game(start=pos, record=record, postings=postings, counters=counters)
+                pos = end
+                games += 1
+            if games == 0:
+                break
+
+            postings.sort()
+            rows = sorted((key, cell, *counts) for (key, cell), counts in counters.items())
+            path = self._segment_path(self._next_number)
+            write_segment(path, postings, len(postings), rows, len(rows), start, pos)
+            self._next_number += 1
+            self.segments.append(IndexSegment(path))
+            indexed += games
+
+        if len(self.segments) > self.max_segments:
+            self.compact()
+        return indexed
+
+    def _index_game(self, start: int, record: GameRecord, postings: list, counters: dict):
+        """
+        Добавляет ссылки и счетчики одной партии.
+        """
+        for key, cell, symbol in replay_positions(record):
+            postings.append((key, start))
+            if cell is None or record.result is None:
+                continue
+            counts = counters.get((key, cell))
+            if counts is None:
+                counts = counters[(key, cell)] = [0, 0, 0]
+            if record.result == 'draw':
+                counts[2] += 1
+            elif record.result == symbol:
+                counts[0] += 1
+            else:
+                counts[1] += 1
+
+    def compact(self):
+        """
+        Сливает все сегменты в один потоковым слиянием.
+        Старые файлы удаляются после записи нового.
+        """
+        if len(self.segments) < 2:
+            return
+        old = self.segments
+        n_postings = sum(segment.n_postings for segment in old)
+        counters = list(_sum_counters(heapq.merge(*(segment.iter_counters() for segment in old))))
+        path = self._segment_path(self._next_number)
+        write_segment(path, heapq.merge(*(segment.iter_postings() for segment in old)), n_postings,
+                      counters, len(counters),
+                      min(segment.records_start for segment in old),
+                      max(segment.records_end for segment in old))
+        self._next_number += 1
+
+        self.segments = [IndexSegment(path)]
+        for segment in old:
+            segment.close()
+            os.remove(segment.path)
+
+    def _map_records(self) -> mmap.mmap:
+        """
+        Отображает файл записей заново, если он вырос.
+        """
+        length = os.path.getsize(self.records_path)
+        if self._records_mm is None or len(self._records_mm) != length:
+            # Старое отображение не закрываем: его могут читать незаконченные генераторы
+            with open(self.records_path, 'rb') as file:
+                self._records_mm = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._records_mm
+
+    def game_offsets(self, board) -> List[int]:
+        """
+        Смещения партий, прошедших через позицию на поле board.
+        """
+        key = position_key(board)
+        return sorted(offset for segment in self.segments for offset in segment.find_games(key))
+
+    def games_through(self, board) -> Iterator[GameRecord]:
+        """
+        Партии, прошедшие через позицию на поле board (Board или BitBoard).
+        """
+        records = self._map_records()
+        for offset in self.game_offsets(board):
+            record, _ = decode_game(records, offset)
+            yield record
+
+    def move_stats(self, board) -> Dict[Tuple[int, int], Dict[str, float]]:
+        """
+        Статистика ходов из позиции.
+        Победы, поражения и ничьи считаются для игрока, сделавшего ход.
+        Return: {(row, col): {'games', 'wins', 'losses', 'draws', 'win_rate'}}
+        """
+        key = position_key(board)
+        totals: Dict[int, List[int]] = {}
+        for segment in self.segments:
+            for cell, wins, losses, draws in segment.find_counters(key):
+                counts = totals.setdefault(cell, [0, 0, 0])
+                counts[0] += wins
+                counts[1] += losses
+                counts[2] += draws
+
+        stats = {}
+        for cell, (wins, losses, draws) in sorted(totals.items()):
+            games = wins + losses + draws
+            stats[divmod(cell, board.size)] = {
+                'games': games,
+                'wins': wins,
+                'losses': losses,
+                'draws': draws,
+                'win_rate': wins / games * 100 if games else 0.0,
+            }
+        return stats
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Возвращает статистику архива
+        """
+        return {
+            'segments': len(self.segments),
+            'positions': sum(segment.n_postings for segment in self.segments),
+            'counters': sum(segment.n_counters for segment in self.segments),
+            'indexed_bytes': self.indexed_until,
+            'records_bytes': os.path.getsize(self.records_path),
+        }
+
+
+def _sum_counters(rows: Iterator[Tuple[int, int, int, int, int]]):
+    """
+    Складывает счетчики с одинаковыми (ключ, клетка) в отсортированном потоке.
+    """
+    current = None
+    for key, cell, wins, losses, draws in rows:
+        if current is not None and current[0] == key and current[1] == cell:
+            current[2] += wins
+            current[3] += losses
+            current[4] += draws
+            continue
+        if current is not None:
+            yield tuple(current)
+        current = [key, cell, wins, losses, draws]
+    if current is not None:
+        yield tuple(current)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Архив партий с индексом позиций")
+    parser.add_argument('directory', help="каталог архива")
+    parser.add_argument('--import', dest='sources', nargs='*', default=[],
+                        help="файлы записей партий для добавления")
+    parser.add_argument('--compact', action='store_true', help="слить сегменты в один")
+    args = parser.parse_args(argv)
+
+    with GameArchive(args.directory) as archive:
+        for source in args.sources:
+            added = archive.append(read_games(source))
+            print(f"{source}: добавлено {added} партий")
+        added = archive.refresh()
+        if added:
+            print(f"Проиндексировано дописанных партий: {added}")
+        if args.compact:
+            archive.compact()
+        stats = archive.get_stats()
+        print(f"Сегментов: {stats['segments']}, позиций: {stats['positions']}, "
+              f"счетчиков: {stats['counters']}, записи: {stats['records_bytes']} байт")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
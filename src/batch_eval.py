@@ -0,0 +1,105 @@
+"""
+Пакетная оценка позиций на NumPy.
+Позиции передаются массивом (N, size, size) типа int8:
+0 - пусто, 1 - X, 2 - O.
+Используются те же выигрышные линии, что и в Board (src/lines.py).
+"""
+
+from functools import lru_cache
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+
+from .lines import get_win_lines
+
+EMPTY = 0
+X = 1
+O = 2
+
+# Значения winner для позиций, где линии собраны у обоих
+BOTH_WIN = 3
+
+CELL_VALUES = {' ': EMPTY, 'X': X, 'O': O}
+
+
+@lru_cache(maxsize=None)
+def get_line_index(size: int, win_length: int) -> np.ndarray:
+    """
+    Индексы клеток всех выигрышных линий, массив (L, win_length).
+    Клетка (row, col) имеет индекс row * size + col.
+    """
+    lines = get_win_lines(size, win_length)
+    index = np.array([[row * size + col for row, col in line] for line in lines], dtype=np.intp)
+    index.setflags(write=False)
+    return index
+
+
+def boards_to_array(boards: Iterable) -> np.ndarray:
+    """
+    Переводит список полей (Board или BitBoard) в массив (N, size, size).
+    """
+    boards = list(boards)
+    if not boards:
+        raise ValueError("Список полей пуст")
+    size = boards[0].size
+    array = np.zeros((len(boards), size, size), dtype=np.int8)
+    for number, board in enumerate(boards):
+        if board.size != size:
+            raise ValueError("Все поля должны быть одного размера")
+        for row in range(size):
+            for col in range(size):
+                array[number, row, col] = CELL_VALUES[board.get_cell(row, col)]
+    return array
+
+
+def line_counts(boards: np.ndarray, win_length: int):
+    """
+    Число X и O на каждой линии каждой позиции.
+    Return: два массива (N, L).
+    """
+    if boards.ndim != 3 or boards.shape[1] != boards.shape[2]:
+        raise ValueError(f"Ожидается массив (N, size, size), получен {boards.shape}")
+    size = boards.shape[1]
+    flat = boards.reshape(len(boards), size * size)
+    cells = flat[:, get_line_index(size, win_length)]
+    x_counts = np.count_nonzero(cells == X, axis=2)
+    o_counts = np.count_nonzero(cells == O, axis=2)
+    return x_counts, o_counts
+
+
+def evaluate_batch(boards: np.ndarray, win_length: Optional[int] = None) -> Dict[str, np.ndarray]:
+    """
+    Оценивает пачку позиций.
+    Args:
+        boards - массив (N, size, size) int8.
+        win_length - длина линии для победы. По умолчанию size.
+    Return:
+        winner - (N,) int8: 0 - нет, 1 - X, 2 - O, 3 - линии у обоих;
+        legal_moves - (N, size, size) bool: свободные клетки, если игра не окончена;
+        x_threats, o_threats - (N,) число открытых линий, где не хватает одного камня;
+        is_full - (N,) bool: поле заполнено.
+    """
+    size = boards.shape[1]
+    win_length = win_length or size
+    x_counts, o_counts = line_counts(boards, win_length)
+
+    x_won = (x_counts == win_length).any(axis=1)
+    o_won = (o_counts == win_length).any(axis=1)
+    winner = np.zeros(len(boards), dtype=np.int8)
+    winner[x_won] = X
+    winner[o_won] = O
+    winner[x_won & o_won] = BOTH_WIN
+
+    empty = boards == EMPTY
+    legal_moves = empty & (winner == 0)[:, None, None]
+
+    x_threats = np.count_nonzero((x_counts == win_length - 1) & (o_counts == 0), axis=1)
+    o_threats = np.count_nonzero((o_counts == win_length - 1) & (x_counts == 0), axis=1)
+
+    return {
+        'winner': winner,
+        'legal_moves': legal_moves,
+        'x_threats': x_threats,
+        'o_threats': o_threats,
+        'is_full': ~empty.reshape(len(boards), -1).any(axis=1),
+    }
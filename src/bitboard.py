@@ -0,0 +1,292 @@
+"""
+Битовое представление игрового поля.
+Поле до 8х8 помещается в 64 бита, поэтому на каждый символ
+хватает одного целого числа.
+"""
+
+from typing import List, Tuple
+from .board import Board
+from .events import (default_sink, MOVE_MADE, MOVE_UNDONE, OUT_OF_BOUNDS, OCCUPIED,
+                     FINISHED, WRONG_TURN, INVALID, NOTHING_TO_UNDO, ERROR)
+from .lines import get_cell_masks, mask_to_cells
+from .threats import ThreatMap, LiveLines
+from .zobrist import get_zobrist_keys
+
+
+class BitBoard:
+    """
+    Игровое поле на битовых масках.
+    Повторяет интерфейс Board: make_move, get_cell, is_full, get_state.
+    Клетка (row, col) соответствует биту row * size + col.
+    """
+    MAX_SIZE = Board.MAX_SIZE
+
+    def __init__(self, size=3, win_length=None, verbose=True, events=None):
+        """
+        Создает игровое поле.
+        Args:
+            size - размер поля от 3х3 до 8х8. По умолчанию 3х3.
+            win_length - длина линии для победы. По умолчанию size.
+            verbose - выводить сообщения о ходах в консоль.
+            events - приемник событий (src.events). По умолчанию по verbose.
+        Raises:
+            TypeError: Если size не целое число.
+            ValueError: Если size вне допустимого диапазона.
+        """
+        if not isinstance(size, int):
+            raise TypeError(f"Размер поля должен быть целым числом, а не {type(size).__name__}")
+        if size < 3 or size > self.MAX_SIZE:
+            raise ValueError(f"Допустимый размер поля от 3 до {self.MAX_SIZE}, ваше значение - {size}")
+        if win_length is not None:
+            if not isinstance(win_length, int):
+                raise TypeError(f"Длина для победы должна быть целым числом")
+            if win_length < 3 or win_length > size:
+                raise ValueError(f"Длина для победы должна быть от 3 до {size}")
+
+        self.size = size
+        self.win_length = win_length or size
+        self.verbose = verbose
+        self.events = events or default_sink(verbose, buffer_lines=1)
+
+        # Маска всего поля и маски линий через каждую клетку
+        self.full_mask = (1 << (size * size)) - 1
+        self.cell_masks = get_cell_masks(size, self.win_length)
+
+        # Биты, занятые каждым символом
+        self.bits = {'X': 0, 'O': 0}
+
+        # Хеш Зобриста текущей позиции и стек ходов для отмены
+        self.zobrist_keys = get_zobrist_keys(size)
+        self.hash = 0
+        self.moves = []
+        self._saved_states = []
+
+        # Карта угроз, строится при первом запросе (get_threat_map)
+        self.threat_map = None
+        # Счетчики живых линий, строятся при первом вызове is_draw
+        self.live_lines = None
+
+        # Состояние игры
+        self.winner = None
+        self.winning_cells = []
+        self.last_symbol = None
+        self.move_count = 0
+
+    @classmethod
+    def from_board(cls, board):
+        """
+        Создает битовое поле с той же позицией, что и board.
+        """
+        bit_board = cls(board.size, board.win_length, board.verbose, board.events)
+        for row in range(board.size):
+            for col in range(board.size):
+                symbol = board.get_cell(row, col)
+                if symbol != ' ':
+                    bit_board.bits[symbol] |= 1 << (row * board.size + col)
+                    bit_board.hash ^= bit_board.zobrist_keys[symbol][row * board.size + col]
+        bit_board.moves = list(board.moves)
+        # Board хранит для ходов без победителя только last_symbol
+        bit_board._saved_states = [state if type(state) is tuple else (None, [], state)
+                                   for state in board._saved_states]
+        bit_board.winner = board.winner
+        bit_board.winning_cells = list(board.winning_cells)
+        bit_board.last_symbol = board.last_symbol
+        bit_board.move_count = board.move_count
+        return bit_board
+
+    # Вывод, нормализация символа и карта угроз такие же, как у Board
+    render = Board.render
+    display = Board.display
+    normalize_symbol = Board.normalize_symbol
+    _reject = Board._reject
+    get_threat_map = Board.get_threat_map
+
+    @property
+    def grid(self) -> List[List[str]]:
+        """
+        Поле в виде списка строк, как у Board.
+        """
+        return [[self.get_cell(row, col) for col in range(self.size)] for row in range(self.size)]
+
+    def make_move(self, row, col, symbol):
+        """
+        Выполняет ход на поле
+        """
+        try:
+            symbol = self.normalize_symbol(symbol)
+
+            # Проверяем границы поля.
+            if not (0 <= row < self.size and 0 <= col < self.size):
+                self._reject(OUT_OF_BOUNDS, row, col, symbol, size=self.size)
+                return False, False
+
+            # Проверяем занятость клетки
+            bit = 1 << (row * self.size + col)
+            if (self.bits['X'] | self.bits['O']) & bit:
+                self._reject(OCCUPIED, row, col, symbol, occupant=self.get_cell(row, col))
+                return False, False
+
+            # Если уже есть победитель
+            if self.winner:
+                self._reject(FINISHED, row, col, symbol, winner=self.winner)
+                return False, False
+
+            # Проверка чередования ходов
+            if self.move_count > 0 and symbol == self.last_symbol:
+                self._reject(WRONG_TURN, row, col, symbol, expected='O' if symbol == 'X' else 'X')
+                return False, False
+
+            # Выполняем ход
+            is_winning = self.place(row, col, symbol)
+            if self.events.enabled:
+                self.events.emit(MOVE_MADE, symbol=symbol, row=row, col=col, winning=is_winning)
+            return True, is_winning
+
+        except ValueError as e:
+            self._reject(INVALID, row, col, symbol, detail=str(e))
+            return False, False
+        except Exception as e:
+            self._reject(ERROR, row, col, symbol, detail=str(e))
+            return False, False
+
+    def check_winner_after_move(self, row, col, symbol):
+        """
+        Проверяет только линии, проходящие через сделанный ход.
+        """
+        bits = self.bits[symbol]
+        for mask in self.cell_masks[row * self.size + col]:
+            if bits & mask == mask:
+                self.winner = symbol
+                self.winning_cells = mask_to_cells(mask, self.size)
+                return True
+        return False
+
+    def place(self, row, col, symbol):
+        """
+        Ставит символ без проверок и вывода.
+        Return: True, если ход выигрышный.
+        """
+        self.moves.append((row, col))
+        self._saved_states.append((self.winner, self.winning_cells, self.last_symbol))
+
+        index = row * self.size + col
+        self.bits[symbol] |= 1 << index
+        self.last_symbol = symbol
+        self.move_count += 1
+        self.hash ^= self.zobrist_keys[symbol][index]
+        if self.threat_map is not None:
+            self.threat_map.place(index, symbol)
+        if self.live_lines is not None:
+            self.live_lines.place(index, symbol)
+        return self.check_winner_after_move(row, col, symbol)
+
+    def push(self, row, col):
+        """
+        Быстрый ход для поиска: без проверок и вывода.
+        Return: True, если ход выигрышный.
+        """
+        return self.place(row, col, 'O' if self.last_symbol == 'X' else 'X')
+
+    def pop(self):
+        """
+        Отменяет последний ход без проверок и вывода.
+        Return: координаты отмененного хода.
+        """
+        row, col = self.moves.pop()
+        self.winner, self.winning_cells, self.last_symbol = self._saved_states.pop()
+
+        index = row * self.size + col
+        symbol = 'X' if self.bits['X'] >> index & 1 else 'O'
+        self.bits[symbol] &= ~(1 << index)
+        self.move_count -= 1
+        self.hash ^= self.zobrist_keys[symbol][index]
+        if self.threat_map is not None:
+            self.threat_map.remove(index, symbol)
+        if self.live_lines is not None:
+            self.live_lines.remove(index, symbol)
+        return row, col
+
+    def undo_move(self):
+        """
+        Отменяет последний ход.
+        Return: True, если ход отменен.
+        """
+        if not self.moves:
+            self._reject(NOTHING_TO_UNDO)
+            return False
+
+        row, col = self.moves[-1]
+        symbol = self.get_cell(row, col)
+        self.pop()
+
+        if self.events.enabled:
+            self.events.emit(MOVE_UNDONE, symbol=symbol, row=row, col=col)
+        return True
+
+    def is_full(self):
+        """
+        Проверяет заполнено ли поле
+        """
+        return (self.bits['X'] | self.bits['O']) == self.full_mask
+
+    is_draw = Board.is_draw
+
+    def get_cell(self, row, col):
+        """
+        Возвращает символ в указанной ячейке
+        """
+        if 0 <= row < self.size and 0 <= col < self.size:
+            bit = 1 << (row * self.size + col)
+            if self.bits['X'] & bit:
+                return 'X'
+            if self.bits['O'] & bit:
+                return 'O'
+            return ' '
+        return None
+
+    def get_available_moves(self) -> List[Tuple[int, int]]:
+        """
+        Возвращает список свободных клеток
+        """
+        return mask_to_cells(self.full_mask & ~(self.bits['X'] | self.bits['O']), self.size)
+
+    def random_move(self, rng):
+        """
+        Случайная свободная клетка.
+        Return: (row, col) или None, если поле заполнено.
+        """
+        moves = self.get_available_moves()
+        return rng.choice(moves) if moves else None
+
+    def reset(self):
+        """
+        Сбрасывает поле
+        """
+        self.bits = {'X': 0, 'O': 0}
+        self.hash = 0
+        self.moves = []
+        self._saved_states = []
+        self.threat_map = None
+        self.live_lines = None
+        self.winner = None
+        self.winning_cells = []
+        self.last_symbol = None
+        self.move_count = 0
+
+    def get_state(self):
+        """
+        Возвращает текущее состояние игры
+        """
+        return {
+            'size': self.size,
+            'win_length': self.win_length,
+            'grid': self.grid,
+            'winner': self.winner,
+            'winning_cells': self.winning_cells.copy(),
+            'last_symbol': self.last_symbol,
+            'move_count': self.move_count,
+            'is_full': self.is_full()
+            }
+
+    def __str__(self):
+        return f"BitBoard({self.size}x{self.size}, win={self.win_length}, moves={self.move_count})"
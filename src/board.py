@@ -1,14 +1,48 @@
 """
 Правила игры в крестики нолики
 """
+
+from array import array
+from functools import lru_cache
+from .events import (default_sink, MOVE_MADE, MOVE_REJECTED, MOVE_UNDONE, OUT_OF_BOUNDS,
+                     OCCUPIED, FINISHED, WRONG_TURN, INVALID, NOTHING_TO_UNDO, ERROR)
+from .lines import DIRECTIONS, get_cell_rays
+from .threats import ThreatMap, LiveLines, SYMBOL_INDEX
+from .zobrist import get_zobrist_keys
+
+EMPTY_CODE = ord(' ')
+
+
+@lru_cache(maxsize=None)
+def get_cell_tuples(size):
+    """
+    Общие кортежи (row, col) для каждой клетки: история ходов
+    и списки ходов ссылаются на них, а не создают свои.
+    """
+    return tuple(divmod(cell, size) for cell in range(size * size))
+
+
 class Board:
+    """
+    Игровое поле на плоском bytearray: клетка (row, col) - байт row * size + col
+    с кодом ' ', 'X' или 'O'. Экземпляры без __dict__ (__slots__), счетчики -
+    массивы чисел, поэтому тысячи живых партий занимают мало памяти.
+    """
     MAX_SIZE = 8 # максимальный размер поля
-    def __init__(self, size=3, win_length=None):
+
+    __slots__ = ('size', 'win_length', 'verbose', 'events', 'cells', 'counts', 'zobrist_keys', 'hash',
+                 'cell_tuples', 'rays', 'moves', '_saved_states', 'free_cells', 'free_index', 'threat_map',
+                 'live_lines', 'winner', 'winning_cells', 'last_symbol', 'move_count')
+
+    def __init__(self, size=3, win_length=None, verbose=True, events=None):
         """
         Создает игровое поле.
         Args:
             size - размер поля от 3х3 до 8х8. По умолчанию 3х3.
             win_length - длина линии для победы. По умолчанию size.
+            verbose - выводить сообщения о ходах в консоль.
+            events - приемник событий (src.events). По умолчанию по verbose:
+                консоль или без вывода.
         Raises:
             TypeError: Если size не целое число.
             ValueError: Если size вне допустимого диапазона.
@@ -26,14 +60,36 @@ class Board:
             
         self.size = size
         self.win_length = win_length or size
+        self.verbose = verbose
+        # Поле само по себе пишет в консоль сразу, без буфера
+        self.events = events or default_sink(verbose, buffer_lines=1)
 
         # Игровое поле
-        self.grid = [[' ' for _ in range(size)] for _ in range(size)]
+        self.cells = bytearray(b' ' * (size * size))
     
-        # Для проверки победителя
-        self.row_counts = [{'X': 0, 'O': 0} for _ in range(size)]
-        self.col_counts = [{'X': 0, 'O': 0} for _ in range(size)]
-        self.diag_counts = [{'X': 0, 'O': 0} for _ in range(2)]
+        # Для проверки победителя: камни X и O по строкам, столбцам и диагоналям,
+        # counts[line * 2 + (0 для X, 1 для O)], см. update_counters
+        self.counts = array('B', bytes(2 * (2 * size + 2)))
+
+        # Хеш Зобриста текущей позиции и стек ходов для отмены
+        self.zobrist_keys = get_zobrist_keys(size)
+        self.cell_tuples = get_cell_tuples(size)
+        self.rays = get_cell_rays(size, self.win_length)
+        self.hash = 0
+        self.moves = []
+        # Состояние до каждого хода для pop: обычно только last_symbol,
+        # кортеж (winner, winning_cells, last_symbol) - если победитель уже был
+        self._saved_states = []
+
+        # Свободные клетки (индексы row * size + col) и позиция каждой клетки
+        # в этом списке (-1 - занята): ход и отмена за O(1)
+        self.free_cells = array('B', range(size * size))
+        self.free_index = array('b', range(size * size))
+
+        # Карта угроз, строится при первом запросе (get_threat_map)
+        self.threat_map = None
+        # Счетчики живых линий, строятся при первом вызове is_draw
+        self.live_lines = None
 
         # Состояние игры
         self.winner = None
@@ -41,30 +97,40 @@ class Board:
         self.last_symbol = None
         self.move_count = 0
 
-    def display(self):
+    def render(self):
         """
-        Выводит поле в консоль
+        Return: поле в виде текста (рамка, номера строк и столбцов, итог).
         """
-        # Верхняя граница
-        print('┌' + '─' * (self.size * 2 - 1) + '┐')
-
+        border = '─' * (self.size * 2 - 1)
+        lines = ['┌' + border + '┐']
         for i, row in enumerate(self.grid):
-            row_str = f'{i}│' + '│'.join(row) + '│'
-            print(row_str)
-
+            lines.append(f'{i}│' + '│'.join(row) + '│')
             if i < self.size - 1:
-                print('├' + '─' * (self.size * 2 - 1) + '┤')
-
-        print('└' + '─' * (self.size * 2 - 1) + '┘')
-        col_numbers = ' '.join(str(i) for i in range(self.size))
-        print(' ' + col_numbers)
+                lines.append('├' + border + '┤')
+        lines.append('└' + border + '┘')
+        lines.append(' ' + ' '.join(str(i) for i in range(self.size)))
 
         if self.winner:
-            print(f"Победил - {self.winner}")
-            print(f"Выигрышная комбинация - {self.winning_cells}")
-        elif self.is_full():
-            print("Ничья!")
-    
+            lines.append(f"Победил - {self.winner}")
+            lines.append(f"Выигрышная комбинация - {self.winning_cells}")
+        elif self.is_draw():
+            lines.append("Ничья!")
+        return '\n'.join(lines)
+
+    def display(self):
+        """
+        Выводит поле в консоль
+        """
+        print(self.render())
+
+    def _reject(self, reason, row=None, col=None, symbol=None, **fields):
+        """
+        Сообщает приемнику об отклоненном ходе (или отмене).
+        В режиме без вывода ничего не собирает.
+        """
+        if self.events.enabled:
+            self.events.emit(MOVE_REJECTED, reason=reason, row=row, col=col, symbol=symbol, **fields)
+
     def normalize_symbol(self, symbol):
         """
         Приводит символ к стандарному виду.
@@ -91,130 +157,315 @@ class Board:
 
             # Проверяем границы поля.
             if not (0 <= row < self.size and 0 <= col < self.size):
-                print(f"Введенные координаты находятся вне поля. Доступное поле: {self.size}x{self.size}")
+                self._reject(OUT_OF_BOUNDS, row, col, symbol, size=self.size)
                 return False, False
         
             # Проверяем занятость клетки
-            if self.grid[row][col] != ' ':
-                print(f"Ячейка ({row}x{col}) уже занята символом '{self.grid[row][col]}'")
+            if self.cells[row * self.size + col] != EMPTY_CODE:
+                self._reject(OCCUPIED, row, col, symbol, occupant=self.get_cell(row, col))
                 return False, False
         
             # Если уже есть победитель
             if self.winner:
-                print(f"Игра закончена. Победил {self.winner}")
+                self._reject(FINISHED, row, col, symbol, winner=self.winner)
                 return False, False
             
             # Проверка чередования ходов
             if self.move_count > 0 and symbol == self.last_symbol:
-                other_symbol = 'O' if symbol == 'X' else 'X'
-                print(f"Сейчас не Ваш ход, ходить должен '{other_symbol}'")
+                self._reject(WRONG_TURN, row, col, symbol, expected='O' if symbol == 'X' else 'X')
                 return False, False
             
             # Выполняем ход
-            self.grid[row][col] = symbol
-            self.last_symbol = symbol
-            self.move_count += 1
-
-            # Обновляем счетчик
-            self.update_counters(row, col, symbol)
-
-            # Проверяем не привел ли ход к победе
-            is_winning = self.check_winner_after_move(row, col, symbol)
-
-            print(f"{symbol} установлен на ({row}x{col})")
+            is_winning = self.place(row, col, symbol)
+            if self.events.enabled:
+                self.events.emit(MOVE_MADE, symbol=symbol, row=row, col=col, winning=is_winning)
             return True, is_winning
         
         except ValueError as e:
-            print(f"Ошибка: {e}")
+            self._reject(INVALID, row, col, symbol, detail=str(e))
             return False, False
         except Exception as e:
-            print(f"Неизвестная ошибка {e}")
+            self._reject(ERROR, row, col, symbol, detail=str(e))
             return False, False
         
-    def update_counters(self, row, col, symbol):
+    def place(self, row, col, symbol):
         """
-        Обновляет счетчики для быстрой проверки победителя
+        Ставит символ без проверок и вывода.
+        Сохраняет состояние, чтобы ход можно было отменить через pop.
+        Return: True, если ход выигрышный.
         """
-        self.row_counts[row][symbol] += 1
-        self.col_counts[col][symbol] += 1
+        cell = row * self.size + col
+        self.moves.append(self.cell_tuples[cell])
+        if self.winner is None:
+            self._saved_states.append(self.last_symbol)
+        else:
+            self._saved_states.append((self.winner, self.winning_cells, self.last_symbol))
+
+        self.cells[cell] = ord(symbol)
+        self.last_symbol = symbol
+        self.move_count += 1
+        self.hash ^= self.zobrist_keys[symbol][cell]
+        self._take_cell(cell)
+
+        # Обновляем счетчик
+        self.update_counters(row, col, symbol)
+        if self.threat_map is not None:
+            self.threat_map.place(cell, symbol)
+        if self.live_lines is not None:
+            self.live_lines.place(cell, symbol)
+
+        # Проверяем не привел ли ход к победе
+        return self.check_winner_after_move(row, col, symbol)
+
+    def push(self, row, col):
+        """
+        Быстрый ход для поиска: без проверок, нормализации и вывода.
+        Символ определяется очередностью ходов, первым ходит X.
+        Return: True, если ход выигрышный.
+        """
+        return self.place(row, col, 'O' if self.last_symbol == 'X' else 'X')
+
+    def pop(self):
+        """
+        Отменяет последний ход без проверок и вывода.
+        Точно восстанавливает счетчики, победителя и очередность.
+        Return: координаты отмененного хода.
+        """
+        row, col = self.moves.pop()
+        state = self._saved_states.pop()
+        if type(state) is tuple:
+            self.winner, self.winning_cells, self.last_symbol = state
+        else:
+            self.last_symbol = state
+            if self.winner is not None:
+                self.winner = None
+                self.winning_cells = []
+
+        cell = row * self.size + col
+        symbol = chr(self.cells[cell])
+        self.cells[cell] = EMPTY_CODE
+        self.move_count -= 1
+        self.hash ^= self.zobrist_keys[symbol][cell]
+        self.free_index[cell] = len(self.free_cells)
+        self.free_cells.append(cell)
+        self.update_counters(row, col, symbol, -1)
+        if self.threat_map is not None:
+            self.threat_map.remove(cell, symbol)
+        if self.live_lines is not None:
+            self.live_lines.remove(cell, symbol)
+        return row, col
+
+    def _take_cell(self, cell):
+        """
+        Убирает клетку из списка свободных: на ее место встает последняя.
+        """
+        free_cells = self.free_cells
+        position = self.free_index[cell]
+        last = free_cells.pop()
+        if last != cell:
+            free_cells[position] = last
+            self.free_index[last] = position
+        self.free_index[cell] = -1
+
+    def update_counters(self, row, col, symbol, delta=1):
+        """
+        Обновляет счетчики для быстрой проверки победителя.
+        delta = -1 при отмене хода.
+        """
+        counts = self.counts
+        index = SYMBOL_INDEX[symbol]
+        counts[row * 2 + index] += delta
+        counts[(self.size + col) * 2 + index] += delta
 
         if row == col:
-            self.diag_counts[0][symbol] += 1
+            counts[self.size * 4 + index] += delta
         
         if row + col == self.size - 1:
-            self.diag_counts[1][symbol] += 1
+            counts[self.size * 4 + 2 + index] += delta
 
-    def check_winner_after_move(self, row, col, symbol):
+    def _count_dicts(self, start, lines):
         """
-        Быстрая проверка, стал ли ход выигршным.
+        Счетчики линий start..start+lines в виде [{'X': n, 'O': m}, ...].
         """
-        if self.check_line('row', row, symbol):
-            return True
-        
-        if self.check_line('col', col, symbol):
-            return True
-        
-        if row == col and self.check_line('diag', 0, symbol):
-            return True
-        
-        if row + col == self.size - 1 and self.check_line ('diag', 1, symbol):
-            return True
-        return False
-    
-    def check_line(self, line_type, index, symbol):
+        counts = self.counts
+        return [{'X': counts[line * 2], 'O': counts[line * 2 + 1]}
+                for line in range(start, start + lines)]
+
+    @property
+    def row_counts(self):
         """
-        Проверяет, заполнена ли линия.
+        Камни X и O по строкам.
         """
-        if line_type == 'row':
-            count = self.row_counts[index][symbol]
-            if count == self.win_length:
-                self.winning_cells = [(index, col) for col in range(self.size)]
-                self.winner = symbol
-                return True
-            
-        elif line_type == 'col':
-            count = self.col_counts[index][symbol]
-            if count == self.win_length:
-                self.winning_cells = [(row, index) for row in range(self.size)]
-                self.winner = symbol
-                return True
-            
-        elif line_type == 'diag':
-            count = self.diag_counts[index][symbol]
-            if count == self.win_length:
-                if index == 0:
-                    self.winning_cells = [(i, i) for i in range(self.size)]
-                else:
-                    self.winning_cells = [(i, self.size - 1 - i) for i in range(self.size)]
+        return self._count_dicts(0, self.size)
+
+    @property
+    def col_counts(self):
+        """
+        Камни X и O по столбцам.
+        """
+        return self._count_dicts(self.size, self.size)
+
+    @property
+    def diag_counts(self):
+        """
+        Камни X и O на главной и побочной диагоналях.
+        """
+        return self._count_dicts(2 * self.size, 2)
+
+    @property
+    def grid(self):
+        """
+        Поле в виде списка строк (копия, изменения не попадают на поле).
+        """
+        size = self.size
+        cells = list(self.cells.decode())
+        return [cells[start:start + size] for start in range(0, size * size, size)]
+
+    def undo_move(self):
+        """
+        Отменяет последний ход.
+        Return: True, если ход отменен.
+        """
+        if not self.moves:
+            self._reject(NOTHING_TO_UNDO)
+            return False
+
+        row, col = self.moves[-1]
+        symbol = self.get_cell(row, col)
+        self.pop()
+
+        if self.events.enabled:
+            self.events.emit(MOVE_UNDONE, symbol=symbol, row=row, col=col)
+        return True
+
+    def check_winner_after_move(self, row, col, symbol):
+        """
+        Быстрая проверка, стал ли ход выигршным.
+        Смотрит только четыре направления через сделанный ход
+        и не дальше win_length - 1 клеток в каждую сторону.
+        """
+        code = ord(symbol)
+        cells = self.cells
+        win_length = self.win_length
+        for (dr, dc), (back_ray, forward_ray) in zip(DIRECTIONS, self.rays[row * self.size + col]):
+            back = 0
+            for index in back_ray:
+                if cells[index] != code:
+                    break
+                back += 1
+            forward = 0
+            for index in forward_ray:
+                if cells[index] != code:
+                    break
+                forward += 1
+            if back + forward + 1 >= win_length:
+                # Первый отрезок длины win_length, содержащий ход
+                start = min(back, win_length - 1)
+                self.winning_cells = [
+                    (row + dr * (i - start), col + dc * (i - start))
+                    for i in range(win_length)
+                ]
                 self.winner = symbol
                 return True
         return False
 
+    def count_in_direction(self, row, col, dr, dc, symbol):
+        """
+        Считает подряд идущие символы от клетки в заданном направлении.
+        Не считает дальше win_length - 1 клеток.
+        """
+        count = 0
+        code = ord(symbol)
+        size = self.size
+        cells = self.cells
+        row += dr
+        col += dc
+        while (count < self.win_length - 1 and 0 <= row < size and 0 <= col < size
+               and cells[row * size + col] == code):
+            count += 1
+            row += dr
+            col += dc
+        return count
+
+    def get_available_moves(self):
+        """
+        Возвращает список свободных клеток.
+        Порядок не построчный: он зависит от истории ходов.
+        """
+        cell_tuples = self.cell_tuples
+        return [cell_tuples[cell] for cell in self.free_cells]
+
+    def random_move(self, rng):
+        """
+        Случайная свободная клетка за O(1).
+        Return: (row, col) или None, если поле заполнено.
+        """
+        if not self.free_cells:
+            return None
+        return self.cell_tuples[rng.choice(self.free_cells)]
+
+    def get_threat_map(self):
+        """
+        Возвращает карту угроз позиции (src/threats.py).
+        Строится при первом вызове, затем обновляется каждым ходом и отменой.
+        """
+        if self.threat_map is None:
+            self.threat_map = ThreatMap.from_board(self)
+        return self.threat_map
+
     def is_full(self):
         """
         Проверяет заполнено ли поле
         """
-        for row in self.grid:
-            if ' ' in row:
-                return False
-        return True
+        return not self.free_cells
+
+    def is_draw(self):
+        """
+        Ничья: победителя нет и ни один символ уже не соберет линию.
+        Линия с камнями обоих символов мертва; если живых линий не осталось
+        или оставшихся ходов не хватает, чтобы собрать ни одну из них, -
+        ничья еще до заполнения поля.
+        Счетчики линий строятся при первом вызове, затем обновляются ходами.
+        """
+        if self.winner:
+            return False
+        free = self.size * self.size - self.move_count
+        if free == 0:
+            return True
+        if self.live_lines is None:
+            self.live_lines = LiveLines.from_board(self)
+        live_lines = self.live_lines
+        if live_lines.live == 0:
+            return True
+        # У каждого символа хватает ходов на любую живую линию
+        if free // 2 >= self.win_length:
+            return False
+        next_symbol = 'O' if self.last_symbol == 'X' else 'X'
+        other_symbol = 'O' if next_symbol == 'X' else 'X'
+        return not (live_lines.can_complete(next_symbol, (free + 1) // 2)
+                    or live_lines.can_complete(other_symbol, free // 2))
     
     def get_cell(self, row, col):
         """
         Возвращает символ в указанной ячейке
         """
         if 0 <= row < self.size and 0 <= col < self.size:
-            return self.grid[row][col]
+            return chr(self.cells[row * self.size + col])
         return None
     
     def reset(self):
         """
         Сбрасывает поле
         """
-        self.grid = [[' ' for _ in range(self.size)] for _ in range(self.size)]
-        self.row_counts = [{'X':0, 'O': 0} for _ in range(self.size)]
-        self.col_counts = [{'X':0, 'O': 0} for _ in range(self.size)]
-        self.diag_counts = [{'X':0, 'O': 0} for _ in range(2)]
+        self.cells = bytearray(b' ' * (self.size * self.size))
+        self.counts = array('B', bytes(2 * (2 * self.size + 2)))
+        self.hash = 0
+        self.moves = []
+        self._saved_states = []
+        self.free_cells = array('B', range(self.size * self.size))
+        self.free_index = array('b', range(self.size * self.size))
+        self.threat_map = None
+        self.live_lines = None
         self.winner = None
         self.winning_cells = []
         self.last_symbol = None
@@ -227,7 +478,7 @@ class Board:
         return {
             'size' : self.size,
             'win_length' : self.win_length,
-            'grid' : [row.copy() for row in self.grid],
+            'grid' : self.grid,
             'winner' : self.winner,
             'winning_cells' : self.winning_cells.copy(),
             'last_symbol' : self.last_symbol,
@@ -0,0 +1,224 @@
+"""
+События игры и приемники для них.
+Поле, игра и компьютерный игрок не печатают сами, а отправляют события
+в приемник. Перед отправкой проверяется sink.enabled, поэтому
+с NullSink (режим без вывода) не форматируется ни одна строка.
+
+Приемники:
+    NullSink - ничего не делает;
+    ConsoleSink - текст для человека, копится в буфере и пишется порциями;
+    JsonLinesSink - одно событие JSON на строку, для разбора программами.
+Свой приемник - наследник EventSink с методом emit.
+"""
+
+import sys
+import time
+from typing import Any, Dict, List, Optional, TextIO
+
+# Виды событий
+GAME_STARTED = 'game_started'
+TURN_STARTED = 'turn_started'
+MOVE_MADE = 'move_made'
+MOVE_REJECTED = 'move_rejected'
+MOVE_UNDONE = 'move_undone'
+AI_MOVE = 'ai_move'
+GAME_OVER = 'game_over'
+GAME_SUMMARY = 'game_summary'
+BOARD_RENDERED = 'board_rendered'
+
+# Причины отказа в ходе (поле reason события MOVE_REJECTED)
+OUT_OF_BOUNDS = 'out_of_bounds'
+OCCUPIED = 'occupied'
+FINISHED = 'finished'
+WRONG_TURN = 'wrong_turn'
+INVALID = 'invalid'
+NOTHING_TO_UNDO = 'nothing_to_undo'
+ERROR = 'error'
+
+
+class EventSink:
+    """
+    Приемник событий.
+    enabled - False, если события не нужны: источники тогда
+    не собирают поля события и не вызывают emit.
+    Поля события нужно обработать в emit: объекты (например, поле)
+    после возврата из emit продолжают меняться.
+    """
+    enabled = True
+
+    def emit(self, kind: str, **fields):
+        """
+        Принимает событие kind с полями fields.
+        """
+        raise NotImplementedError
+
+    def flush(self):
+        """
+        Записывает накопленное.
+        """
+
+    def close(self):
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class NullSink(EventSink):
+    """
+    Приемник для работы без вывода.
+    """
+    enabled = False
+
+    def emit(self, kind: str, **fields):
+        pass
+
+
+# Общий приемник без вывода
+NULL_SINK = NullSink()
+
+
+class ConsoleSink(EventSink):
+    """
+    Вывод для человека. Строки копятся в буфере и пишутся
+    одной операцией: при заполнении буфера, в конце партии и по flush.
+    Arg:
+        stream - куда писать, по умолчанию sys.stdout.
+        buffer_lines - сколько строк копить до записи.
+    """
+
+    def __init__(self, stream: Optional[TextIO] = None, buffer_lines: int = 64):
+        self.stream = stream
+        self.buffer_lines = buffer_lines
+        self._lines: List[str] = []
+
+    def emit(self, kind: str, **fields):
+        formatter = getattr(self, '_format_' + kind, None)
+        if formatter is None:
+            return
+        self._lines.extend(formatter(**fields))
+        if len(self._lines) >= self.buffer_lines or kind in (GAME_OVER, GAME_SUMMARY):
+            self.flush()
+
+    def flush(self):
+        if not self._lines:
+            return
+        stream = self.stream or sys.stdout
+        stream.write('\n'.join(self._lines) + '\n')
+        stream.flush()
+        self._lines = []
+
+    def _format_game_started(self, players, size, reset=False, **fields):
+        if reset:
+            return ["\nИгра сброшена, для нового раунда"]
+        return ["\nНачалась новая игра!",
+                f"Игрок 1: {players[0]}",
+                f"Игрок 2: {players[1]}",
+                f"Размер поля: {size}x{size}"]
+
+    def _format_turn_started(self, player, symbol, **fields):
+        return [f"\nХод игрока {player} ({symbol}):"]
+
+    def _format_move_made(self, symbol, row, col, **fields):
+        return [f"{symbol} установлен на ({row}x{col})"]
+
+    def _format_move_rejected(self, reason, row=None, col=None, symbol=None, **fields):
+        if reason == OUT_OF_BOUNDS:
+            size = fields['size']
+            return [f"Введенные координаты находятся вне поля. Доступное поле: {size}x{size}"]
+        if reason == OCCUPIED:
+            return [f"Ячейка ({row}x{col}) уже занята символом '{fields['occupant']}'"]
+        if reason == FINISHED:
+            return [f"Игра закончена. Победил {fields['winner']}"]
+        if reason == WRONG_TURN:
+            return [f"Сейчас не Ваш ход, ходить должен '{fields['expected']}'"]
+        if reason == NOTHING_TO_UNDO:
+            return ["Нет ходов для отмены"]
+        if reason == INVALID:
+            return [f"Ошибка: {fields['detail']}"]
+        return [f"Неизвестная ошибка {fields.get('detail')}"]
+
+    def _format_move_undone(self, symbol, row, col, **fields):
+        return [f"Ход {symbol} на ({row}x{col}) отменен"]
+
+    def _format_game_over(self, result, winner=None, symbol=None, winning_cells=None,
+                          full=True, **fields):
+        if result == 'interrupted':
+            return ["\n\n Игра прервана пользователем."]
+        lines = [f"\n{'=' * 50}"]
+        if result == 'draw':
+            lines.append("Ничья. Ходов больше не осталось" if full
+                         else "Ничья. Ни одну линию уже не собрать")
+        else:
+            lines.append(f"Победил: {winner} ({symbol}!)")
+            lines.append(f"Выигрышная комбинация: {winning_cells}")
+        lines.append('=' * 50)
+        return lines
+
+    def _format_game_summary(self, history, winner, stats, **fields):
+        lines = [f"\n{'=' * 50}", "Итоги игры", '=' * 50,
+                 f"Всего ходов: {len(history)}",
+                 f"Победитель: {winner or 'Ничья'}",
+                 "\nИстория ходов"]
+        for move in history:
+            lines.append(f"Ход {move['turn_number']}: {move['player']} ({move['symbol']}) -> {move['position']}")
+        lines.append("\nСтатистика игроков")
+        for player in stats:
+            lines.append(f"{player['name']}: {player['wins']} побед, {player['win_rate']:.1f}%")
+        return lines
+
+    def _format_board_rendered(self, board, **fields):
+        return [board.render()]
+
+
+class JsonLinesSink(EventSink):
+    """
+    Событие - строка JSON: {"event": вид, "time": время, ...поля}.
+    Поле board события BOARD_RENDERED записывается как размер,
+    список ходов и победитель.
+    Arg:
+        target - путь к файлу (дописывается) или открытый текстовый поток.
+    """
+
+    def __init__(self, target):
+        # json нужен только этому приемнику: не грузим его при каждом запуске
+        import json
+        self._dumps = json.dumps
+        if isinstance(target, str):
+            self._file: TextIO = open(target, 'a', encoding='utf-8')
+            self._owns_file = True
+        else:
+            self._file = target
+            self._owns_file = False
+        self.events_written = 0
+
+    def emit(self, kind: str, **fields):
+        board = fields.pop('board', None)
+        record: Dict[str, Any] = {'event': kind, 'time': time.time()}
+        record.update(fields)
+        if board is not None:
+            record['size'] = board.size
+            record['win_length'] = board.win_length
+            record['moves'] = list(board.moves)
+            record['winner'] = board.winner
+        self._file.write(self._dumps(record, ensure_ascii=False, default=str) + '\n')
+        self.events_written += 1
+
+    def flush(self):
+        self._file.flush()
+
+    def close(self):
+        if self._owns_file:
+            self._file.close()
+        else:
+            self._file.flush()
+
+
+def default_sink(verbose: bool, buffer_lines: int = 64) -> EventSink:
+    """
+    Приемник по старому флагу verbose: консоль или без вывода.
+    """
+    return ConsoleSink(buffer_lines=buffer_lines) if verbose else NULL_SINK
@@ -1,10 +1,27 @@
 """
 Класс управяющий игровым процессом
+Запуск партии в консоли: python main.py play [--opponent medium] [--size 3]
 """
 
-from typing import List, Optional, Dict, Any
+import sys
+from typing import TYPE_CHECKING, List, Optional, Dict, Any
 from .board import Board
-from .players import Player
+from .events import (EventSink, default_sink, GAME_STARTED, TURN_STARTED, MOVE_REJECTED,
+                     GAME_OVER, GAME_SUMMARY, BOARD_RENDERED, FINISHED, ERROR)
+from .bitboard import BitBoard
+from .sparse_board import SparseBoard
+
+if TYPE_CHECKING:
+    # Только для аннотаций: игроки и запись партий не грузятся вместе с модулем
+    from .players import Player
+    from .records import GameRecordWriter
+
+# Доступные представления игрового поля
+BOARD_BACKENDS = {
+    'list': Board,
+    'bitboard': BitBoard,
+    'sparse': SparseBoard,
+}
 
 class Game:
     """
@@ -17,27 +34,53 @@ class Game:
         - История ходов
     """
 
-    def __init__(self, player1: Player, player2: Player, board_size: int = 3):
+    def __init__(self, player1: 'Player', player2: 'Player', board_size: int = 3,
+                 board_backend: str = 'list', win_length: Optional[int] = None,
+                 verbose: bool = True, record_writer: Optional['GameRecordWriter'] = None,
+                 early_draw: bool = True, events: Optional[EventSink] = None):
         """
         Инициализирует новую игру
+        board_backend: 'list', 'bitboard' или 'sparse' (большие поля и поле без границ)
+        win_length: длина линии для победы, по умолчанию размер поля
+        verbose: выводить ход игры в консоль
+        record_writer: запись партии в бинарный архив (src/records.py)
+        early_draw: объявлять ничью, как только ни одна линия не может быть собрана,
+                    иначе - только на заполненном поле
+        events: приемник событий игры и поля (src/events.py). По умолчанию по verbose:
+                ConsoleSink или NullSink, который ничего не форматирует
+        Raises:
+            ValueError: если игрок не может играть на таком поле (Player.check_board),
+                например 'hard' на поле без границ, или поле не помещается
+                в формат записи партий (records.RecordError).
         """
         if player1.symbol == player2.symbol:
             raise ValueError("У игроков должны быть разные символы")
+        if board_backend not in BOARD_BACKENDS:
+            raise ValueError(f"Неизвестное представление поля: {board_backend}")
         
-        self.board = Board(size=board_size)
+        self.verbose = verbose
+        self.events = events or default_sink(verbose)
+        self.board = BOARD_BACKENDS[board_backend](size=board_size, win_length=win_length,
+                                                   verbose=verbose, events=self.events)
+        player1.check_board(self.board)
+        player2.check_board(self.board)
+        if record_writer is not None:
+            # Иначе ошибка формата всплыла бы только на первом ходе и остановила партию
+            from .records import check_size
+            check_size(self.board.size)
         self.players = [player1, player2]
         self.current_player_index = 0
         self.game_over = False
-        self.winner: Optional[Player] = None
+        self.winner: Optional['Player'] = None
         self.history: List[Dict[str, Any]] = []
+        self.record_writer = record_writer
+        self.early_draw = early_draw
 
-        print(f"\nНачалась новая игра!")
-        print(f"Игрок 1: {player1}")
-        print(f"Игрок 2: {player2}")
-        print(f"Размер поля: {board_size}x{board_size}")
+        if self.events.enabled:
+            self.events.emit(GAME_STARTED, players=(str(player1), str(player2)), size=board_size)
 
     @property
-    def current_player(self) -> Player:
+    def current_player(self) -> 'Player':
         """
         Возвращает текущего игрока
         """
@@ -47,25 +90,42 @@ class Game:
         """
         Выполняет ход игрока и делает проверку
         True, если игра продалжается
-        False, если игра закончена
+        False, если игра закончена или ход завершился ошибкой
+        (тогда game_over остается False, причина - в событии MOVE_REJECTED)
         """
+        events = self.events
         if self.game_over:
-            print("Игра закончена")
+            if events.enabled:
+                events.emit(MOVE_REJECTED, reason=FINISHED,
+                            winner=self.winner.symbol if self.winner else None)
             return False
         
         player = self.current_player
-        print(f"\nХод игрока {player.name} ({player.symbol}):")
+        if events.enabled:
+            events.emit(TURN_STARTED, player=player.name, symbol=player.symbol)
+            # Человек должен видеть поле и сообщения до ввода хода
+            events.flush()
 
+        other = self._get_other_player()
         try:
-            # Получаем ход от игрока
-            row, col = player.get_move(self.board)
-
-            # Выполняем ход на поле
-            success, is_winning = self.board.make_move(row, col, player.symbol)
+            # Соперник может думать, пока ходит player
+            other.start_pondering(self.board)
+            try:
+                while True:
+                    # Получаем ход от игрока
+                    row, col = player.get_move(self.board)
 
-            if not success:
-                print(f"Ход не удался, попробуйсте снова")
-                return self.play_turn() # Рекурсивно пробуем снова
+                    # Выполняем ход на поле
+                    success, is_winning = self.board.make_move(row, col, player.symbol)
+                    if success:
+                        break
+                    # Компьютер в той же позиции вернет тот же ход - повторяем только для человека
+                    if not player.interactive:
+                        raise ValueError(f"Игрок {player.name} сделал недопустимый ход ({row}, {col})")
+                    if events.enabled:
+                        events.flush()
+            finally:
+                other.stop_pondering()
 
             # Записываем ход в историю
             self.history.append({
@@ -75,7 +135,8 @@ class Game:
                 'turn_number': len(self.history) +1
             })
 
-            print(f"{player.symbol} поставлен на ({row}, {col})")
+            if self.record_writer is not None:
+                self._record_move(row, col)
 
             # Проверям победу
             if is_winning:
@@ -83,26 +144,27 @@ class Game:
                 self.winner = player
                 player.record_win()
                 self._get_other_player().record_loss()
+                if self.record_writer is not None:
+                    self.record_writer.end_game(player.symbol)
 
-                print(f"\n{'='*50}")
-                print(f"Победил: {player.name} ({player.symbol}!)")
-                print(f"Выигрышная комбинация: {self.board.winning_cells}")
-                print(f"{'='*50}")
-
-                self.board.display()
+                if events.enabled:
+                    events.emit(BOARD_RENDERED, board=self.board)
+                    events.emit(GAME_OVER, result=player.symbol, winner=player.name,
+                                symbol=player.symbol, winning_cells=self.board.winning_cells)
                 return False
             
             # Проверяем ничью
-            if self.board.is_full():
+            is_draw = self.board.is_draw() if self.early_draw else self.board.is_full()
+            if is_draw:
                 self.game_over = True
                 for p in self.players:
                     p.record_draw()
+                if self.record_writer is not None:
+                    self.record_writer.end_game('draw')
 
-                print(f"\n{'='*50}")
-                print(f"Ничья. Ходов больше не осталось")
-                print(f"{'='*50}")
-
-                self.board.display()
+                if events.enabled:
+                    events.emit(BOARD_RENDERED, board=self.board)
+                    events.emit(GAME_OVER, result='draw', full=self.board.is_full())
                 return False
             # Переход хода
             self.current_player_index = (self.current_player_index + 1) % 2
@@ -110,14 +172,27 @@ class Game:
             return True
         
         except KeyboardInterrupt:
-            print("\n\n Игра прервана пользователем.")
             self.game_over = True
+            if events.enabled:
+                events.emit(GAME_OVER, result='interrupted')
             return False
         except Exception as e:
-            print(f"Ошибка во вреся хода:{e}")
+            if events.enabled:
+                events.emit(MOVE_REJECTED, reason=ERROR, symbol=player.symbol, detail=str(e))
+                events.flush()
             return False
         
-    def _get_other_player(self) -> Player:
+    def _record_move(self, row: int, col: int):
+        """
+        Дописывает ход в архив. Первый ход партии открывает запись.
+        """
+        if len(self.history) == 1:
+            self.record_writer.begin_game(
+                self.board.size, self.board.win_length,
+                (self.players[0].name, self.players[1].name), self.players[0].symbol)
+        self.record_writer.write_move(row, col)
+
+    def _get_other_player(self) -> 'Player':
         """
         Возвращает игорока, который сечас не ходит
         """
@@ -127,11 +202,8 @@ class Game:
         """
         Играет полную игру до завершения.
         """
-        print(f"\n{'='*50}")
-        print(f"Начало игры")
-        print(f"{'='*50}")
-
-        self.board.display()
+        if self.events.enabled:
+            self.events.emit(BOARD_RENDERED, board=self.board)
 
         while not self.game_over:
             should_continue = self.play_turn()
@@ -140,8 +212,8 @@ class Game:
                 break
 
             # Показываем поле, после успешного хода
-            if not self.game_over:
-                self.board.display()
+            if not self.game_over and self.events.enabled:
+                self.events.emit(BOARD_RENDERED, board=self.board)
 
         self._show_game_summary()
 
@@ -149,21 +221,10 @@ class Game:
         """
         Показываем игоги игры.
         """
-        print(f"\n{'='*50}")
-        print(f"Итоги игры")
-        print(f"{'='*50}")
-
-        print(f"Всего ходов: {len(self.history)}")
-        print(f"Победитель: {self.winner.name if self.winner else 'Ничья'}")
-
-        print(f"\nИстория ходов")
-        for move in self.history:
-            print(f"Ход {move['turn_number']}: {move['player']} ({move['symbol']}) -> {move['position']}")
-
-        print(f"\nСтатистика игроков")
-        for player in self.players:
-            stats = player.get_stats()
-            print(f"{player.name}: {stats['wins']} побед, {stats['win_rate']:.1f}%")
+        if self.events.enabled:
+            self.events.emit(GAME_SUMMARY, history=self.history,
+                             winner=self.winner.name if self.winner else None,
+                             stats=[player.get_stats() for player in self.players])
 
     def reset(self):
         """
@@ -174,7 +235,9 @@ class Game:
         self.game_over = False
         self.winner = None
         self.history.clear()
-        print("\nИгра сброшена, для нового раунда")
+        if self.events.enabled:
+            self.events.emit(GAME_STARTED, players=tuple(str(p) for p in self.players),
+                             size=self.board.size, reset=True)
 
 def create_game_from_config(config: Dict[str, Any]) -> Game:
     """
@@ -186,18 +249,36 @@ def create_game_from_config(config: Dict[str, Any]) -> Game:
         'player2_name': str,
         'player2_symbol': 'X' or 'O',
         'board_size': int,
-        'ai_difficulty': str ('easy', 'medium', 'hard')
+        'ai_difficulty': str ('easy', 'medium', 'hard', 'mcts'),
+        'board_backend': str ('list', 'bitboard', 'sparse')
         }
+    Дополнительно для компьютерных игроков и пакетных запусков:
+        'player1_difficulty', 'player2_difficulty': уровень каждого игрока
+            (по умолчанию ai_difficulty),
+        'player1_time_limit', 'player2_time_limit': время на ход для 'hard' и 'mcts',
+        'player1_seed', 'player2_seed': зерно случайных ходов,
+        'player1_ponder', 'player2_ponder': 'hard' думает во время хода соперника,
+        'player1_use_cache', 'player2_use_cache': общий кэш позиций (по умолчанию True),
+        'think_time': пауза перед случайным ходом,
+        'win_length': длина линии для победы,
+        'verbose': выводить ход игры в консоль
     """
-    from .players import HumanPlayer, AIPlayer
+    # Модули игроков грузятся, только если такой игрок нужен
     # Создаем первого игрока
     if config.get('player1_type', 'human') == 'ai':
+        from .players import AIPlayer
         player1 = AIPlayer(
             symbol=config['player1_symbol'],
             name=config.get('player1_name'),
-            difficulty=config.get('ai_difficulty', 'easy')
+            difficulty=config.get('player1_difficulty', config.get('ai_difficulty', 'easy')),
+            time_limit=config.get('player1_time_limit', 1.0),
+            think_time=config.get('think_time', 0.5),
+            seed=config.get('player1_seed'),
+            use_cache=config.get('player1_use_cache', True),
+            ponder=config.get('player1_ponder', False)
         )
     else:
+        from .players import HumanPlayer
         player1 = HumanPlayer(
             symbol=config['player1_symbol'],
             name=config.get('player1_name', 'Игрок 1')
@@ -205,12 +286,19 @@ def create_game_from_config(config: Dict[str, Any]) -> Game:
 
     # Создаем второго игрока
     if config.get('player2_type', 'human') == 'ai':
+        from .players import AIPlayer
         player2 = AIPlayer(
             symbol=config['player2_symbol'],
             name=config.get('player2_name'),
-            difficulty=config.get('ai_difficulty', 'easy')
+            difficulty=config.get('player2_difficulty', config.get('ai_difficulty', 'easy')),
+            time_limit=config.get('player2_time_limit', 1.0),
+            think_time=config.get('think_time', 0.5),
+            seed=config.get('player2_seed'),
+            use_cache=config.get('player2_use_cache', True),
+            ponder=config.get('player2_ponder', False)
         )
     else:
+        from .players import HumanPlayer
         player2 = HumanPlayer(
             symbol=config['player2_symbol'],
             name=config.get('player2_name', 'Игрок 2')
@@ -219,6 +307,59 @@ def create_game_from_config(config: Dict[str, Any]) -> Game:
     return Game(
         player1=player1,
         player2=player2,
-        board_size=config.get('board_size', 3)
+        board_size=config.get('board_size', 3),
+        board_backend=config.get('board_backend', 'list'),
+        win_length=config.get('win_length'),
+        verbose=config.get('verbose', True)
     )
-    
\ No newline at end of file
+    
+
+
+def main(argv=None):
+    # argparse нужен только консольной партии, а не каждому импорту Game
+    import argparse
+    parser = argparse.ArgumentParser(description="Партия в крестики-нолики в консоли")
+    parser.add_argument('--opponent', default='medium', choices=('human', 'easy', 'medium', 'hard', 'mcts'),
+                        help="соперник: второй человек или уровень компьютера")
+    parser.add_argument('--symbol', default='X', choices=('X', 'O'), help="символ игрока, X ходит первым")
+    parser.add_argument('--size', type=int, default=3, help="размер поля")
+    parser.add_argument('--win-length', type=int, help="длина линии для победы")
+    parser.add_argument('--backend', default='list', choices=tuple(BOARD_BACKENDS), help="представление поля")
+    parser.add_argument('--time-limit', type=float, default=1.0, help="время на ход компьютера, с")
+    parser.add_argument('--ponder', action='store_true',
+                        help="компьютер 'hard' думает, пока думает игрок")
+    args = parser.parse_args(argv)
+
+    print("=" * 40)
+    print("   Добро пожаловать в Крестики-нолики!")
+    print("=" * 40)
+
+    # Первым в партии ходит X
+    human, other = ('player1', 'player2') if args.symbol == 'X' else ('player2', 'player1')
+    config = {
+        f'{human}_type': 'human',
+        f'{human}_symbol': args.symbol,
+        f'{other}_type': 'human' if args.opponent == 'human' else 'ai',
+        f'{other}_symbol': 'O' if args.symbol == 'X' else 'X',
+        f'{other}_difficulty': args.opponent,
+        f'{other}_time_limit': args.time_limit,
+        f'{other}_ponder': args.ponder,
+        'board_size': args.size,
+        'win_length': args.win_length,
+        'board_backend': args.backend,
+    }
+    game = create_game_from_config(config)
+    game.play_full_game()
+
+    for player in game.players:
+        stats = getattr(player, 'ponder_stats', None)
+        if stats:
+            latency = stats['avg_latency']
+            print(f"\n{player.name}: ходов готово заранее {stats['hits']} "
+                  f"из {stats['hits'] + stats['partial'] + stats['misses']} ({stats['hit_rate']:.0f}%), "
+                  f"ответ {latency['hit'] * 1000:.1f} мс при попадании, "
+                  f"{latency['miss'] * 1000:.0f} мс без него")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,455 @@
+"""
+Точная статистика дерева игры для заданных size и win_length:
+достижимые позиции, конечные позиции по результатам, число партий
+и теоретическое значение игры.
+
+Дерево обходится как граф канонических позиций (с учетом симметрий)
+по уровням - числу сделанных ходов. В памяти одновременно только
+два соседних уровня, каждый готовый уровень записывается на диск,
+поэтому прерванный расчет продолжается с последнего уровня.
+
+Проход вперед собирает позиции и число путей к ним,
+проход назад решает позиции от последнего уровня к первому.
+Решенные позиции пишутся в формате таблицы идеальной игры
+(src/tablebase.py), ее открывает get_tablebase.
+
+Запуск: python -m src.game_tree --size 4 --win-length 3 --output-dir analysis
+"""
+
+import argparse
+import json
+import os
+import struct
+import sys
+import time
+from array import array
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from .lines import get_cell_masks
+from .symmetry import get_transforms
+from .tablebase import _power_weights, get_table_path, write_tablebase_entries
+
+# Формат файла уровня:
+#   заголовок: сигнатура, версия, размер поля, длина линии, вид файла, число позиций;
+#   вперед (LEVEL_FORWARD): коды позиций 'Q', число путей 'Q', результат 'B';
+#   назад (LEVEL_VALUES): коды позиций 'Q', оценка 'b', лучший ход 'B'.
+# Коды отсортированы, ход - индекс клетки в канонической позиции.
+LEVEL_MAGIC = b'TTTL'
+LEVEL_VERSION = 1
+LEVEL_HEADER = struct.Struct('<4sBBBBQ')
+LEVEL_FORWARD = 0
+LEVEL_VALUES = 1
+
+STATE_FILE = 'state.json'
+REPORT_FILE = 'report.json'
+
+# Результат позиции: партия идет, победа X, победа O, ничья
+ONGOING, X_WIN, O_WIN, DRAW = 0, 1, 2, 3
+RESULT_NAMES = {X_WIN: 'x_wins', O_WIN: 'o_wins', DRAW: 'draws'}
+
+# Ключ таблицы идеальной игры - 32 бита
+TABLEBASE_MAX_KEY = 0xFFFFFFFF
+
+# Как часто сообщать о ходе расчета, с
+PROGRESS_INTERVAL = 1.0
+
+
+class GameTreeError(ValueError):
+    """
+    Файлы расчета повреждены или относятся к другому полю.
+    """
+
+
+def write_level(path: str, size: int, win_length: int, kind: int, columns: List[array]):
+    """
+    Записывает уровень через временный файл и os.replace.
+    """
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as file:
+        file.write(LEVEL_HEADER.pack(LEVEL_MAGIC, LEVEL_VERSION, size, win_length, kind,
+                                     len(columns[0])))
+        for column in columns:
+            column.tofile(file)
+    os.replace(tmp_path, path)
+
+
+def read_level(path: str, size: int, win_length: int, kind: int) -> Tuple[array, array, array]:
+    """
+    Читает уровень, записанный write_level.
+    Raises:
+        GameTreeError: если файл другого формата или поля.
+    """
+    with open(path, 'rb') as file:
+        header = file.read(LEVEL_HEADER.size)
+        if len(header) < LEVEL_HEADER.size:
+            raise GameTreeError(f"Файл {path} слишком короткий")
+        magic, version, file_size, file_win, file_kind, count = LEVEL_HEADER.unpack(header)
+        if magic != LEVEL_MAGIC or version != LEVEL_VERSION:
+            raise GameTreeError(f"Файл {path} не является уровнем дерева версии {LEVEL_VERSION}")
+        if (file_size, file_win, file_kind) != (size, win_length, kind):
+            raise GameTreeError(f"Файл {path} записан для другого поля")
+        types = ('Q', 'Q', 'B') if kind == LEVEL_FORWARD else ('Q', 'b', 'B')
+        columns = []
+        for typecode in types:
+            column = array(typecode)
+            try:
+                column.fromfile(file, count)
+            except EOFError:
+                raise GameTreeError(f"Файл {path} обрезан")
+            columns.append(column)
+    return tuple(columns)
+
+
+class GameTreeAnalyzer:
+    """
+    Перебор всех позиций поля по уровням с запоминанием канонических позиций.
+    Первым ходит X. Оценки - как в TablebaseSolver, с точки зрения ходящего:
+    > 0 - победа (чем больше, тем быстрее), 0 - ничья, < 0 - поражение.
+    Arg:
+        directory - каталог для уровней, состояния и отчета.
+        report - функция для сообщений о ходе расчета.
+    """
+
+    def __init__(self, size: int, win_length: Optional[int] = None, directory: str = 'analysis',
+                 report: Callable[[str], None] = print):
+        self.size = size
+        self.win_length = win_length or size
+        self.cells = size * size
+        self.directory = directory
+        self.report = report
+        self.cell_masks = get_cell_masks(size, self.win_length)
+        self.transforms = get_transforms(size)
+        self.weights = _power_weights(size)
+        self.powers = tuple(3 ** index for index in range(self.cells))
+        self.state = self._load_state()
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    def _level_path(self, depth: int, kind: int) -> str:
+        suffix = 'fwd' if kind == LEVEL_FORWARD else 'val'
+        return self._path(f"level-{depth:02d}.{suffix}")
+
+    def _load_state(self) -> Dict[str, Any]:
+        """
+        Читает состояние прерванного расчета или создает новое.
+        """
+        path = self._path(STATE_FILE)
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as file:
+                state = json.load(file)
+            if (state['size'], state['win_length']) != (self.size, self.win_length):
+                raise GameTreeError(f"В каталоге {self.directory} расчет для другого поля")
+            return state
+        return {'size': self.size, 'win_length': self.win_length,
+                'levels': [], 'forward_done': False, 'solved_down_to': None,
+                'root_moves': None}
+
+    def _save_state(self):
+        """
+        Записывает состояние. Вызывается только после записи файла уровня.
+        """
+        tmp_path = self._path(STATE_FILE + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as file:
+            json.dump(self.state, file, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self._path(STATE_FILE))
+
+    def _decode(self, code: int, depth: int):
+        """
+        Раскладывает каноническую позицию.
+        Return: (камни ходящего, камни соперника, коды позиции во всех симметриях).
+        """
+        mover = 1 if depth % 2 == 0 else 2
+        own = opp = 0
+        codes = [0] * len(self.weights)
+        index = 0
+        while code:
+            code, value = divmod(code, 3)
+            if value:
+                if value == mover:
+                    own |= 1 << index
+                else:
+                    opp |= 1 << index
+                for number, weight in enumerate(self.weights):
+                    codes[number] += value * weight[index]
+            index += 1
+        return own, opp, codes
+
+    def _children(self, code: int, depth: int) -> Iterator[Tuple[int, int, Optional[Tuple[int, ...]]]]:
+        """
+        Ходы из позиции уровня depth.
+        Return: поток (клетка, результат хода, коды новой позиции во всех симметриях).
+        """
+        value = 1 if depth % 2 == 0 else 2
+        own, opp, codes = self._decode(code, depth)
+        empty = ((1 << self.cells) - 1) & ~(own | opp)
+        free = self.cells - depth
+        bits = empty
+        while bits:
+            low = bits & -bits
+            bits ^= low
+            index = low.bit_length() - 1
+            new_own = own | low
+            child = tuple(code + value * weight[index] for code, weight in zip(codes, self.weights))
+            if any(new_own & mask == mask for mask in self.cell_masks[index]):
+                yield index, value, child
+            elif free == 1:
+                yield index, DRAW, child
+            else:
+                yield index, ONGOING, child
+
+    def _progress(self, stage: str, depth: int, done: int, total: int, start: float):
+        elapsed = time.perf_counter() - start
+        rate = done / elapsed if elapsed > 0 else 0.0
+        self.report(f"  {stage} уровень {depth}: {done}/{total} позиций, {rate:,.0f} поз/с")
+
+    def forward(self):
+        """
+        Проход вперед: канонические позиции каждого уровня, число путей к ним
+        и конечные позиции. Продолжается с последнего записанного уровня.
+        """
+        levels = self.state['levels']
+        if not levels:
+            write_level(self._level_path(0, LEVEL_FORWARD), self.size, self.win_length, LEVEL_FORWARD,
+                        [array('Q', [0]), array('Q', [1]), array('B', [ONGOING])])
+            levels.append(self._level_stats(0, {0: [1, ONGOING, 1]}))
+            self._save_state()
+
+        while not self.state['forward_done']:
+            depth = len(levels) - 1
+            codes, paths, results = read_level(self._level_path(depth, LEVEL_FORWARD),
+                                               self.size, self.win_length, LEVEL_FORWARD)
+            # Каноническая позиция -> [число путей, результат, число симметричных позиций]
+            children: Dict[int, List[int]] = {}
+            start = last_report = time.perf_counter()
+            for number, (code, count, result) in enumerate(zip(codes, paths, results)):
+                if result != ONGOING:
+                    continue
+                for _, child_result, child_codes in self._children(code, depth):
+                    key = min(child_codes)
+                    entry = children.get(key)
+                    if entry is None:
+                        children[key] = [count, child_result, len(set(child_codes))]
+                    else:
+                        entry[0] += count
+                now = time.perf_counter()
+                if now - last_report >= PROGRESS_INTERVAL:
+                    last_report = now
+                    self._progress('вперед', depth, number + 1, len(codes), start)
+
+            del codes, paths, results
+            if not children:
+                self.state['forward_done'] = True
+                self._save_state()
+                break
+
+            keys = sorted(children)
+            write_level(self._level_path(depth + 1, LEVEL_FORWARD), self.size, self.win_length,
+                        LEVEL_FORWARD, [array('Q', keys),
+                                        array('Q', (children[key][0] for key in keys)),
+                                        array('B', (children[key][1] for key in keys))])
+            levels.append(self._level_stats(depth + 1, children))
+            self._save_state()
+            self.report(f"Уровень {depth + 1}: {len(keys)} канонических позиций "
+                        f"за {time.perf_counter() - start:.1f} с")
+
+    def _level_stats(self, depth: int, entries: Dict[int, List[int]]) -> Dict[str, Any]:
+        """
+        Счетчики уровня по записям [число путей, результат, число симметричных позиций].
+        """
+        stats = {'depth': depth, 'canonical': len(entries), 'positions': 0,
+                 'terminal_canonical': {name: 0 for name in RESULT_NAMES.values()},
+                 'terminal_positions': {name: 0 for name in RESULT_NAMES.values()},
+                 'games': {name: 0 for name in RESULT_NAMES.values()}}
+        for count, result, orbit in entries.values():
+            stats['positions'] += orbit
+            if result != ONGOING:
+                name = RESULT_NAMES[result]
+                stats['terminal_canonical'][name] += 1
+                stats['terminal_positions'][name] += orbit
+                stats['games'][name] += count
+        return stats
+
+    def backward(self):
+        """
+        Проход назад: оценка и лучший ход каждой незаконченной позиции.
+        Для уровня depth в памяти только оценки уровня depth + 1.
+        """
+        levels = self.state['levels']
+        solved_down_to = self.state['solved_down_to']
+        depth = (len(levels) if solved_down_to is None else solved_down_to) - 1
+        next_values: Dict[int, int] = {}
+        if depth + 1 < len(levels) and os.path.exists(self._level_path(depth + 1, LEVEL_VALUES)):
+            keys, scores, _ = read_level(self._level_path(depth + 1, LEVEL_VALUES),
+                                         self.size, self.win_length, LEVEL_VALUES)
+            next_values = dict(zip(keys, scores))
+
+        while depth >= 0:
+            codes, _, results = read_level(self._level_path(depth, LEVEL_FORWARD),
+                                           self.size, self.win_length, LEVEL_FORWARD)
+            free = self.cells - depth
+            keys, scores, moves = array('Q'), array('b'), array('B')
+            root_moves = {}
+            start = last_report = time.perf_counter()
+            for number, (code, result) in enumerate(zip(codes, results)):
+                if result != ONGOING:
+                    continue
+                best, best_move = None, 0
+                for index, child_result, child_codes in self._children(code, depth):
+                    if child_result == DRAW:
+                        score = 0
+                    elif child_result != ONGOING:
+                        score = free
+                    else:
+                        score = -next_values[min(child_codes)]
+                    if depth == 0:
+                        root_moves[index] = score
+                    if best is None or score > best:
+                        best, best_move = score, index
+                keys.append(code)
+                scores.append(best)
+                moves.append(best_move)
+                now = time.perf_counter()
+                if now - last_report >= PROGRESS_INTERVAL:
+                    last_report = now
+                    self._progress('назад', depth, number + 1, len(codes), start)
+
+            write_level(self._level_path(depth, LEVEL_VALUES), self.size, self.win_length,
+                        LEVEL_VALUES, [keys, scores, moves])
+            if depth == 0:
+                self.state['root_moves'] = {f"{index // self.size},{index % self.size}": score
+                                            for index, score in sorted(root_moves.items())}
+            self.state['solved_down_to'] = depth
+            self._save_state()
+            self.report(f"Решен уровень {depth}: {len(keys)} позиций "
+                        f"за {time.perf_counter() - start:.1f} с")
+            next_values = dict(zip(keys, scores))
+            depth -= 1
+
+    def iter_solved(self) -> Iterator[Tuple[int, Tuple[int, int]]]:
+        """
+        Решенные позиции всех уровней: поток (ключ, (оценка, лучший ход)).
+        """
+        for depth in range(len(self.state['levels'])):
+            path = self._level_path(depth, LEVEL_VALUES)
+            if not os.path.exists(path):
+                continue
+            keys, scores, moves = read_level(path, self.size, self.win_length, LEVEL_VALUES)
+            for key, score, move in zip(keys, scores, moves):
+                yield key, (score, move)
+
+    def solved_count(self) -> int:
+        """
+        Число решенных позиций: незаконченные позиции всех уровней.
+        """
+        return sum(level['canonical'] - sum(level['terminal_canonical'].values())
+                   for level in self.state['levels'])
+
+    def run(self) -> Dict[str, Any]:
+        """
+        Выполняет оба прохода (или их оставшуюся часть) и пишет отчет.
+        Return: отчет.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        start = time.perf_counter()
+        self.forward()
+        if self.state['solved_down_to'] != 0:
+            self.backward()
+        report = self.build_report()
+        report['elapsed'] = time.perf_counter() - start
+        tmp_path = self._path(REPORT_FILE + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as file:
+            json.dump(report, file, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self._path(REPORT_FILE))
+        return report
+
+    def build_report(self) -> Dict[str, Any]:
+        """
+        Итоги по всем уровням.
+        """
+        levels = self.state['levels']
+        totals = {
+            'canonical': sum(level['canonical'] for level in levels),
+            'positions': sum(level['positions'] for level in levels),
+        }
+        for field in ('terminal_canonical', 'terminal_positions', 'games'):
+            totals[field] = {name: sum(level[field][name] for level in levels)
+                             for name in RESULT_NAMES.values()}
+        totals['games']['total'] = sum(totals['games'].values())
+
+        root_moves = self.state['root_moves'] or {}
+        value = max(root_moves.values()) if root_moves else None
+        if value is None:
+            result = None
+        elif value > 0:
+            result = 'X'
+        elif value < 0:
+            result = 'O'
+        else:
+            result = 'draw'
+        return {
+            'size': self.size,
+            'win_length': self.win_length,
+            'totals': totals,
+            'value': value,
+            'result': result,
+            'root_moves': root_moves,
+            'levels': levels,
+        }
+
+    def write_tablebase(self, path: str):
+        """
+        Записывает решенные позиции в файл таблицы идеальной игры.
+        Raises:
+            GameTreeError: если коды позиций не помещаются в ключ таблицы.
+        """
+        if 3 ** self.cells - 1 > TABLEBASE_MAX_KEY:
+            raise GameTreeError(f"Поле {self.size}x{self.size} не помещается в таблицу: ключ 32 бита")
+        write_tablebase_entries(path, self.size, self.win_length, self.iter_solved(),
+                                self.solved_count())
+
+
+def print_report(report: Dict[str, Any]):
+    """
+    Выводит отчет в консоль.
+    """
+    totals = report['totals']
+    print(f"\nПоле {report['size']}x{report['size']}, линия {report['win_length']}")
+    print(f"{'ход':>4} {'канонических':>13} {'позиций':>12} {'конечных':>10} {'партий':>14}")
+    for level in report['levels']:
+        terminal = sum(level['terminal_positions'].values())
+        games = sum(level['games'].values())
+        print(f"{level['depth']:>4} {level['canonical']:>13,} {level['positions']:>12,} "
+              f"{terminal:>10,} {games:>14,}")
+    print(f"Всего: {totals['canonical']:,} канонических, {totals['positions']:,} позиций")
+    for name, title in (('x_wins', 'победа X'), ('o_wins', 'победа O'), ('draws', 'ничья')):
+        print(f"  {title:<9} позиций {totals['terminal_positions'][name]:>12,}  "
+              f"партий {totals['games'][name]:>14,}")
+    titles = {'X': 'победа X', 'O': 'победа O', 'draw': 'ничья'}
+    print(f"Значение игры: {titles.get(report['result'], '-')} (оценка {report['value']})")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Точная статистика дерева игры")
+    parser.add_argument('--size', type=int, default=3)
+    parser.add_argument('--win-length', type=int)
+    parser.add_argument('--output-dir', help="каталог расчета, по умолчанию analysis/SIZExSIZE_K")
+    parser.add_argument('--tablebase', nargs='?', const='', metavar='PATH',
+                        help="записать решенные позиции как таблицу идеальной игры")
+    args = parser.parse_args(argv)
+
+    win_length = args.win_length or args.size
+    directory = args.output_dir or os.path.join('analysis', f"{args.size}x{args.size}_{win_length}")
+    analyzer = GameTreeAnalyzer(args.size, win_length, directory)
+    report = analyzer.run()
+    print_report(report)
+    print(f"Отчет: {os.path.join(directory, REPORT_FILE)}, за {report['elapsed']:.1f} с")
+
+    if args.tablebase is not None:
+        path = args.tablebase or get_table_path(args.size, win_length, directory)
+        analyzer.write_tablebase(path)
+        print(f"Таблица: {path}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
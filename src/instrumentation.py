@@ -0,0 +1,328 @@
+"""
+Замеры горячих вызовов: счетчики и гистограммы задержек.
+Включается явно: enable() подменяет методы классов обертками,
+disable() возвращает исходные, поэтому в выключенном состоянии
+накладных расходов нет совсем.
+
+Снимок выгружается в JSON или в текстовом формате Prometheus.
+profile_game() дополнительно снимает профиль cProfile и tracemalloc.
+
+Запуск: python -m src.instrumentation --size 8 --x medium --o easy --profile report.txt
+"""
+
+import argparse
+import bisect
+import cProfile
+import functools
+import io
+import json
+import pstats
+import sys
+import time
+import tracemalloc
+from typing import Dict, Any, List, Optional, Tuple
+
+# Границы корзин гистограммы в секундах (как принято в Prometheus)
+BUCKETS = (1e-6, 2.5e-6, 5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4,
+           1e-3, 2.5e-3, 5e-3, 1e-2, 2.5e-2, 5e-2, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+METRIC_NAME = 'tictactoe_call_duration_seconds'
+ERRORS_NAME = 'tictactoe_call_errors_total'
+
+
+def _default_targets() -> List[Tuple[type, str]]:
+    """
+    Замеряемые методы: (класс, имя метода).
+    """
+    from .board import Board
+    from .bitboard import BitBoard
+    from .sparse_board import SparseBoard
+    from .game import Game
+    from .players import AIPlayer
+
+    targets = []
+    for board_class in (Board, BitBoard, SparseBoard):
+        targets.append((board_class, 'make_move'))
+        targets.append((board_class, 'check_winner_after_move'))
+    targets.append((AIPlayer, 'get_move'))
+    targets.append((Game, 'play_turn'))
+    return targets
+
+
+class Histogram:
+    """
+    Гистограмма задержек с фиксированными корзинами.
+    """
+
+    def __init__(self, buckets=BUCKETS):
+        self.bounds = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.errors = 0
+
+    def observe(self, seconds: float):
+        self.counts[bisect.bisect_left(self.bounds, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+
+    def quantile(self, fraction: float) -> Optional[float]:
+        """
+        Оценка квантиля по верхней границе корзины.
+        Return: None, если квантиль выше последней границы: у корзины +Inf
+        нет числовой оценки, а float('inf') не записать в JSON.
+        """
+        if not self.count:
+            return 0.0
+        target = fraction * self.count
+        seen = 0
+        for bound, count in zip(self.bounds, self.counts):
+            seen += count
+            if seen >= target:
+                return bound
+        return None
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Накопленные значения корзин, как в Prometheus.
+        """
+        cumulative = []
+        seen = 0
+        for bound, count in zip(self.bounds, self.counts):
+            seen += count
+            cumulative.append([bound, seen])
+        return {
+            'count': self.count,
+            'sum': self.total,
+            'errors': self.errors,
+            'mean': self.total / self.count if self.count else 0.0,
+            'p50': self.quantile(0.5),
+            'p99': self.quantile(0.99),
+            'buckets': cumulative,
+        }
+
+
+def describe_p99(data: Dict[str, Any]) -> str:
+    """
+    p99 из снимка гистограммы для отчета, в микросекундах.
+    """
+    if data['p99'] is None:
+        return f"p99 > {data['buckets'][-1][0] * 1e6:.0f} мкс"
+    return f"p99 <= {data['p99'] * 1e6:.0f} мкс"
+
+
+class Instrumentation:
+    """
+    Набор гистограмм по замеряемым методам.
+    Arg:
+        targets - список (класс, имя метода), по умолчанию горячие методы
+                  полей, AIPlayer.get_move и Game.play_turn.
+    """
+
+    def __init__(self, targets: Optional[List[Tuple[type, str]]] = None):
+        self._targets = targets
+        self._originals: Dict[Tuple[type, str], Any] = {}
+        self.histograms: Dict[str, Histogram] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self._originals)
+
+    def enable(self):
+        """
+        Подменяет методы обертками с замером времени.
+        """
+        if self.enabled:
+            return
+        targets = self._targets if self._targets is not None else _default_targets()
+        for cls, method_name in targets:
+            original = cls.__dict__[method_name]
+            name = f"{cls.__name__}.{method_name}"
+            histogram = self.histograms.setdefault(name, Histogram())
+            self._originals[(cls, method_name)] = original
+            setattr(cls, method_name, self._wrap(original, histogram))
+
+    def disable(self):
+        """
+        Возвращает исходные методы. Накопленные данные сохраняются.
+        """
+        for (cls, method_name), original in self._originals.items():
+            setattr(cls, method_name, original)
+        self._originals = {}
+
+    def reset(self):
+        """
+        Обнуляет гистограммы.
+        """
+        for name in self.histograms:
+            self.histograms[name] = Histogram()
+        if self.enabled:
+            # Обертки держат ссылки на старые гистограммы
+            self.disable()
+            self.enable()
+
+    def __enter__(self):
+        self.enable()
+        return self
+
+    def __exit__(self, *exc):
+        self.disable()
+
+    @staticmethod
+    def _wrap(function, histogram: Histogram):
+        """
+        Обертка, которая замеряет время вызова.
+        """
+        perf_counter = time.perf_counter
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            start = perf_counter()
+            try:
+                return function(*args, **kwargs)
+            except BaseException:
+                histogram.errors += 1
+                raise
+            finally:
+                histogram.observe(perf_counter() - start)
+        return wrapper
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Снимок всех гистограмм: {имя метода: {count, sum, errors, mean, p50, p99, buckets}}.
+        """
+        return {name: histogram.snapshot() for name, histogram in sorted(self.histograms.items())}
+
+    def to_json(self) -> str:
+        return json.dumps(self.snapshot(), ensure_ascii=False, indent=2)
+
+    def to_prometheus(self) -> str:
+        """
+        Снимок в текстовом формате Prometheus.
+        """
+        lines = [
+            f"# HELP {METRIC_NAME} Время вызова замеряемых методов.",
+            f"# TYPE {METRIC_NAME} histogram",
+        ]
+        for name, data in self.snapshot().items():
+            label = f'function="{name}"'
+            for bound, count in data['buckets']:
+                lines.append(f'{METRIC_NAME}_bucket{{{label},le="{bound:g}"}} {count}')
+            lines.append(f'{METRIC_NAME}_bucket{{{label},le="+Inf"}} {data["count"]}')
+            lines.append(f'{METRIC_NAME}_sum{{{label}}} {data["sum"]:.9f}')
+            lines.append(f'{METRIC_NAME}_count{{{label}}} {data["count"]}')
+        lines.append(f"# HELP {ERRORS_NAME} Вызовы, завершившиеся исключением.")
+        lines.append(f"# TYPE {ERRORS_NAME} counter")
+        for name, data in self.snapshot().items():
+            lines.append(f'{ERRORS_NAME}{{function="{name}"}} {data["errors"]}')
+        return '\n'.join(lines) + '\n'
+
+    def write(self, path: str):
+        """
+        Записывает снимок: .prom - в формате Prometheus, иначе JSON.
+        """
+        text = self.to_prometheus() if path.endswith('.prom') else self.to_json()
+        with open(path, 'w', encoding='utf-8') as file:
+            file.write(text)
+
+
+# Общий набор замеров процесса
+metrics = Instrumentation()
+
+
+def enable():
+    metrics.enable()
+
+
+def disable():
+    metrics.disable()
+
+
+def profile_game(game, report_path: str, memory: bool = True, sort: str = 'cumulative',
+                 limit: int = 30) -> Dict[str, Any]:
+    """
+    Играет партию под cProfile (и tracemalloc) и пишет отчет в файл.
+    Return: {'time', 'peak_memory', 'moves'}.
+    """
+    profiler = cProfile.Profile()
+    if memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    profiler.enable()
+    try:
+        game.play_full_game()
+    finally:
+        profiler.disable()
+        elapsed = time.perf_counter() - start
+        snapshot = tracemalloc.take_snapshot() if memory else None
+        peak = tracemalloc.get_traced_memory()[1] if memory else 0
+        if memory:
+            tracemalloc.stop()
+
+    report = io.StringIO()
+    report.write(f"Партия: {len(game.history)} ходов за {elapsed:.3f} с\n")
+    report.write(f"Победитель: {game.winner.name if game.winner else 'Ничья'}\n\n")
+    report.write("Профиль cProfile\n")
+    pstats.Stats(profiler, stream=report).sort_stats(sort).print_stats(limit)
+    if snapshot is not None:
+        report.write(f"\nПамять: пик {peak / 1024:.1f} КБ\n")
+        for stat in snapshot.statistics('lineno')[:limit]:
+            report.write(f"{stat}\n")
+    if metrics.histograms:
+        report.write("\nЗамеры вызовов\n")
+        for name, data in metrics.snapshot().items():
+            report.write(f"{name}: {data['count']} вызовов, среднее {data['mean'] * 1e6:.1f} мкс, "
+                         f"{describe_p99(data)}\n")
+
+    with open(report_path, 'w', encoding='utf-8') as file:
+        file.write(report.getvalue())
+    return {'time': elapsed, 'peak_memory': peak, 'moves': len(game.history)}
+
+
+def main(argv=None):
+    from .game import Game
+    from .players import AIPlayer
+
+    parser = argparse.ArgumentParser(description="Партия с замерами горячих вызовов")
+    parser.add_argument('--size', type=int, default=3)
+    parser.add_argument('--win-length', type=int)
+    parser.add_argument('--backend', default='list')
+    parser.add_argument('--x', default='easy', choices=AIPlayer.DIFFICULTIES)
+    parser.add_argument('--o', default='easy', choices=AIPlayer.DIFFICULTIES)
+    parser.add_argument('--time-limit', type=float, default=0.2)
+    parser.add_argument('--games', type=int, default=1)
+    parser.add_argument('--json', help="файл для снимка в JSON")
+    parser.add_argument('--prom', help="файл для снимка в формате Prometheus")
+    parser.add_argument('--profile', help="отчет cProfile/tracemalloc по последней партии")
+    args = parser.parse_args(argv)
+
+    def new_game(number):
+        players = [AIPlayer(symbol, difficulty=difficulty, time_limit=args.time_limit,
+                            think_time=0, use_cache=False, seed=number)
+                   for symbol, difficulty in (('X', args.x), ('O', args.o))]
+        return Game(*players, board_size=args.size, board_backend=args.backend,
+                    win_length=args.win_length, verbose=False)
+
+    with metrics:
+        for number in range(args.games):
+            game = new_game(number)
+            if args.profile and number == args.games - 1:
+                profile_game(game, args.profile)
+            else:
+                game.play_full_game()
+
+    for name, data in metrics.snapshot().items():
+        if data['count']:
+            print(f"{name:<40} {data['count']:>8} вызовов, среднее {data['mean'] * 1e6:>9.1f} мкс, "
+                  f"{describe_p99(data)}")
+    if args.json:
+        metrics.write(args.json)
+    if args.prom:
+        with open(args.prom, 'w', encoding='utf-8') as file:
+            file.write(metrics.to_prometheus())
+    if args.profile:
+        print(f"Отчет профиля: {args.profile}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,92 @@
+"""
+Выигрышные линии поля.
+Общие определения для всех представлений поля.
+"""
+
+from functools import lru_cache
+from typing import Tuple
+
+# Направления линий: строка, столбец, главная и побочная диагонали
+DIRECTIONS = ((0, 1), (1, 0), (1, 1), (1, -1))
+
+
+@lru_cache(maxsize=None)
+def get_win_lines(size: int, win_length: int) -> Tuple[Tuple[Tuple[int, int], ...], ...]:
+    """
+    Возвращает все отрезки длины win_length на поле size x size.
+    Отрезки сгруппированы по направлениям в порядке DIRECTIONS,
+    клетки внутри отрезка идут по возрастанию строки.
+    """
+    lines = []
+    for dr, dc in DIRECTIONS:
+        for row in range(size):
+            for col in range(size):
+                end_row = row + dr * (win_length - 1)
+                end_col = col + dc * (win_length - 1)
+                if 0 <= end_row < size and 0 <= end_col < size:
+                    lines.append(tuple((row + dr * i, col + dc * i) for i in range(win_length)))
+    return tuple(lines)
+
+
+@lru_cache(maxsize=None)
+def get_win_masks(size: int, win_length: int) -> Tuple[int, ...]:
+    """
+    Возвращает битовые маски выигрышных отрезков.
+    Клетка (row, col) соответствует биту row * size + col.
+    """
+    return tuple(
+        sum(1 << (row * size + col) for row, col in line)
+        for line in get_win_lines(size, win_length)
+    )
+
+
+@lru_cache(maxsize=None)
+def get_cell_masks(size: int, win_length: int) -> Tuple[Tuple[int, ...], ...]:
+    """
+    Для каждой клетки возвращает маски отрезков, проходящих через нее.
+    Порядок масок совпадает с порядком get_win_lines.
+    """
+    cell_masks = [[] for _ in range(size * size)]
+    for mask in get_win_masks(size, win_length):
+        bits = mask
+        while bits:
+            low = bits & -bits
+            cell_masks[low.bit_length() - 1].append(mask)
+            bits ^= low
+    return tuple(tuple(masks) for masks in cell_masks)
+
+
+def mask_to_cells(mask: int, size: int):
+    """
+    Переводит битовую маску в список клеток (row, col).
+    """
+    cells = []
+    while mask:
+        low = mask & -mask
+        index = low.bit_length() - 1
+        cells.append(divmod(index, size))
+        mask ^= low
+    return cells
+
+
+@lru_cache(maxsize=None)
+def get_cell_rays(size: int, win_length: int):
+    """
+    Для каждой клетки и каждого направления DIRECTIONS - индексы клеток
+    (row * size + col) назад и вперед от нее, не больше win_length - 1 в каждую сторону.
+    Return: rays[cell] = ((back, forward), ...) в порядке DIRECTIONS.
+    """
+    def ray(row, col, dr, dc):
+        cells = []
+        for _ in range(win_length - 1):
+            row += dr
+            col += dc
+            if not (0 <= row < size and 0 <= col < size):
+                break
+            cells.append(row * size + col)
+        return tuple(cells)
+
+    return tuple(
+        tuple((ray(row, col, -dr, -dc), ray(row, col, dr, dc)) for dr, dc in DIRECTIONS)
+        for row in range(size) for col in range(size)
+    )
@@ -0,0 +1,339 @@
+"""
+Поиск по дереву методом Монте-Карло (UCT) для больших полей.
+Розыгрыши идут на битовых масках без Board: без проверок и вывода.
+Дерево сохраняется между ходами одной партии, а несколько процессов
+могут строить независимые деревья от корня (root parallelization).
+"""
+
+import math
+import random
+import time
+from typing import TYPE_CHECKING, Dict, Any, List, Optional, Tuple
+
+from .lines import get_cell_masks
+
+if TYPE_CHECKING:
+    from concurrent.futures import ProcessPoolExecutor
+
+# Исход розыгрыша для ходящего
+WIN = 1.0
+DRAW = 0.5
+LOSS = 0.0
+
+
+class Node:
+    """
+    Узел дерева.
+    wins и visits считаются с точки зрения игрока, сделавшего ход move.
+    """
+
+    __slots__ = ('move', 'parent', 'children', 'untried', 'visits', 'wins', 'terminal')
+
+    def __init__(self, move: int = -1, parent: Optional['Node'] = None,
+                 untried: Optional[List[int]] = None, terminal: Optional[float] = None):
+        self.move = move
+        self.parent = parent
+        self.children: List['Node'] = []
+        self.untried = untried if untried is not None else []
+        self.visits = 0
+        self.wins = 0.0
+        # Результат для сделавшего ход, если партия на этом ходе закончилась
+        self.terminal = terminal
+
+
+def mcts_worker(size: int, win_length: int, own: int, opp: int, time_limit: float,
+                iterations: Optional[int], exploration: float,
+                seed: int) -> Tuple[Dict[int, Tuple[int, float]], int]:
+    """
+    Строит дерево в рабочем процессе.
+    Return: ({ход: (посещения, победы)}, число розыгрышей).
+    """
+    engine = MCTSEngine(time_limit, iterations, exploration, seed=seed)
+    engine._prepare(size, win_length)
+    root = engine._new_node(-1, None, own, opp, None)
+    playouts = engine._run(root, own, opp)
+    return {child.move: (child.visits, child.wins) for child in root.children}, playouts
+
+
+class MCTSEngine:
+    """
+    UCT с ограничением по времени и/или числу итераций.
+    Arg:
+        time_limit - время на ход в секундах.
+        iterations - число итераций на ход, None - только время.
+        exploration - константа исследования в формуле UCT.
+        workers - процессы для параллельного поиска от корня, 1 - в этом процессе.
+        reuse_tree - сохранять дерево между ходами (только при workers=1).
+        seed - зерно генератора.
+    """
+
+    def __init__(self, time_limit: float = 1.0, iterations: Optional[int] = None,
+                 exploration: float = 1.4, workers: int = 1, reuse_tree: bool = True,
+                 seed: Optional[int] = None):
+        """
+        Инициализирует движок.
+        """
+        if time_limit <= 0 and not iterations:
+            raise ValueError("Нужно ограничение по времени или по числу итераций")
+        self.time_limit = time_limit
+        self.iterations = iterations
+        self.exploration = exploration
+        self.workers = workers
+        self.reuse_tree = reuse_tree
+        self.rng = random.Random(seed)
+
+        self.size = None
+        self.win_length = None
+        self._executor: Optional['ProcessPoolExecutor'] = None
+
+        # Дерево прошлого хода: корень, позиция (свои, чужие) и символ
+        self._root: Optional[Node] = None
+        self._root_position: Tuple[int, int] = (0, 0)
+        self._root_symbol: Optional[str] = None
+
+        self.last_stats: Dict[str, Any] = {}
+        self.total_moves = 0
+        self.total_playouts = 0
+        self.total_time = 0.0
+
+    def _prepare(self, size: int, win_length: int):
+        """
+        Готовит таблицы для поля заданного размера.
+        """
+        if (size, win_length) == (self.size, self.win_length):
+            return
+        self.size = size
+        self.win_length = win_length
+        self.cells = size * size
+        self.full_mask = (1 << self.cells) - 1
+        self.cell_masks = get_cell_masks(size, win_length)
+        self._root = None
+
+        # На больших полях в дерево добавляются только клетки рядом с камнями
+        self.neighbor_masks = None
+        if size > 5:
+            self.neighbor_masks = []
+            for index in range(self.cells):
+                row, col = divmod(index, size)
+                mask = 0
+                for dr in (-1, 0, 1):
+                    for dc in (-1, 0, 1):
+                        if 0 <= row + dr < size and 0 <= col + dc < size:
+                            mask |= 1 << ((row + dr) * size + col + dc)
+                self.neighbor_masks.append(mask)
+
+    def close(self):
+        """
+        Останавливает пул процессов.
+        """
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def search(self, board, symbol: str) -> Tuple[int, int]:
+        """
+        Возвращает ход (row, col) для symbol - самый посещаемый ход корня.
+        Статистика хода сохраняется в last_stats.
+        """
+        self._prepare(board.size, board.win_length)
+        own, opp = 0, 0
+        for row in range(board.size):
+            for col in range(board.size):
+                cell = board.get_cell(row, col)
+                if cell == symbol:
+                    own |= 1 << (row * board.size + col)
+                elif cell != ' ':
+                    opp |= 1 << (row * board.size + col)
+        if not self.full_mask & ~(own | opp):
+            raise ValueError("Ходов не осталось")
+
+        start = time.perf_counter()
+        if self.workers > 1:
+            visits, playouts = self._search_parallel(own, opp)
+            reused = 0
+        else:
+            root = self._find_root(own, opp, symbol)
+            reused = root.visits
+            playouts = self._run(root, own, opp)
+            visits = {child.move: (child.visits, child.wins) for child in root.children}
+            if self.reuse_tree:
+                self._root, self._root_position, self._root_symbol = root, (own, opp), symbol
+
+        best_move = max(visits, key=lambda move: visits[move][0])
+        best_visits, best_wins = visits[best_move]
+        elapsed = time.perf_counter() - start
+        self.last_stats = {
+            'playouts': playouts,
+            'reused': reused,
+            'time': elapsed,
+            'pps': playouts / elapsed if elapsed > 0 else 0.0,
+            'visits': best_visits,
+            'win_rate': best_wins / best_visits * 100 if best_visits else 0.0,
+        }
+        self.total_moves += 1
+        self.total_playouts += playouts
+        self.total_time += elapsed
+        return divmod(best_move, self.size)
+
+    def _find_root(self, own: int, opp: int, symbol: str) -> Node:
+        """
+        Ищет текущую позицию в дереве прошлого хода:
+        это сам корень или внук (наш ход и ответ соперника).
+        """
+        root = self._root
+        if root is not None and symbol == self._root_symbol:
+            old_own, old_opp = self._root_position
+            if (old_own, old_opp) == (own, opp):
+                return root
+            for child in root.children:
+                if old_own | 1 << child.move != own:
+                    continue
+                for grandchild in child.children:
+                    if old_opp | 1 << grandchild.move == opp:
+                        grandchild.parent = None
+                        return grandchild
+        return self._new_node(-1, None, own, opp, None)
+
+    def _search_parallel(self, own: int, opp: int):
+        """
+        Независимые деревья в процессах, посещения ходов корня складываются.
+        """
+        if self._executor is None:
+            # Процессы нужны только параллельному поиску: модуль
+            # concurrent.futures (и multiprocessing) грузится при первом таком ходе
+            from concurrent.futures import ProcessPoolExecutor
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        iterations = -(-self.iterations // self.workers) if self.iterations else None
+        futures = [
+            self._executor.submit(mcts_worker, self.size, self.win_length, own, opp,
+                                  self.time_limit, iterations, self.exploration,
+                                  self.rng.getrandbits(32))
+            for _ in range(self.workers)
+        ]
+        visits: Dict[int, Tuple[int, float]] = {}
+        playouts = 0
+        for future in futures:
+            worker_visits, worker_playouts = future.result()
+            playouts += worker_playouts
+            for move, (count, wins) in worker_visits.items():
+                total_count, total_wins = visits.get(move, (0, 0.0))
+                visits[move] = (total_count + count, total_wins + wins)
+        return visits, playouts
+
+    def _new_node(self, move: int, parent: Optional[Node], own: int, opp: int,
+                  terminal: Optional[float]) -> Node:
+        """
+        Создает узел. own - камни игрока, который ходит в этой позиции.
+        """
+        untried = []
+        if terminal is None:
+            stones = own | opp
+            candidates = self.full_mask & ~stones
+            if self.neighbor_masks is not None and stones:
+                near = 0
+                while stones:
+                    low = stones & -stones
+                    near |= self.neighbor_masks[low.bit_length() - 1]
+                    stones ^= low
+                candidates = candidates & near or candidates
+            untried = [index for index in range(self.cells) if candidates >> index & 1]
+            self.rng.shuffle(untried)
+        return Node(move, parent, untried, terminal)
+
+    def _run(self, root: Node, own: int, opp: int) -> int:
+        """
+        Итерации UCT от корня до исчерпания бюджета.
+        Return: число розыгрышей.
+        """
+        deadline = time.perf_counter() + self.time_limit if self.time_limit > 0 else None
+        cell_masks = self.cell_masks
+        exploration = self.exploration
+        playouts = 0
+
+        while True:
+            if self.iterations is not None and playouts >= self.iterations:
+                break
+            if deadline is not None and time.perf_counter() > deadline:
+                break
+
+            node, side, other = root, own, opp
+            # Выбор: спускаемся по полностью раскрытым узлам
+            while not node.untried and node.children:
+                log_visits = math.log(node.visits)
+                best, best_value = None, -1.0
+                for child in node.children:
+                    value = child.wins / child.visits + exploration * math.sqrt(log_visits / child.visits)
+                    if value > best_value:
+                        best, best_value = child, value
+                node = best
+                side, other = other, side | 1 << node.move
+                if node.terminal is not None:
+                    break
+
+            # Раскрытие: добавляем один новый ход
+            if node.terminal is None and node.untried:
+                index = node.untried.pop()
+                placed = side | 1 << index
+                terminal = None
+                for mask in cell_masks[index]:
+                    if placed & mask == mask:
+                        terminal = WIN
+                        break
+                else:
+                    if placed | other == self.full_mask:
+                        terminal = DRAW
+                child = self._new_node(index, node, other, placed, terminal)
+                node.children.append(child)
+                node = child
+                side, other = other, placed
+
+            # Розыгрыш: результат для сделавшего ход node
+            if node.terminal is not None:
+                reward = node.terminal
+            elif node is root:
+                # Корень без ходов - ничья
+                reward = DRAW
+            else:
+                reward = 1.0 - self._rollout(side, other)
+
+            # Обратное распространение
+            while node is not None:
+                node.visits += 1
+                node.wins += reward
+                reward = 1.0 - reward
+                node = node.parent
+            playouts += 1
+
+        return playouts
+
+    def _rollout(self, own: int, opp: int) -> float:
+        """
+        Случайная партия до конца.
+        Return: результат для игрока own, который ходит первым.
+        """
+        stones = own | opp
+        empty = [index for index in range(self.cells) if not stones >> index & 1]
+        self.rng.shuffle(empty)
+        cell_masks = self.cell_masks
+        sides = [own, opp]
+        turn = 0
+        for index in empty:
+            placed = sides[turn] | 1 << index
+            sides[turn] = placed
+            for mask in cell_masks[index]:
+                if placed & mask == mask:
+                    return WIN if turn == 0 else LOSS
+            turn ^= 1
+        return DRAW
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Возвращает общую статистику поиска
+        """
+        return {
+            'moves': self.total_moves,
+            'playouts': self.total_playouts,
+            'time': self.total_time,
+            'avg_time_per_move': self.total_time / self.total_moves if self.total_moves else 0.0,
+            'pps': self.total_playouts / self.total_time if self.total_time > 0 else 0.0,
+        }
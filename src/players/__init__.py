@@ -2,8 +2,27 @@
 Пакет players - содержит классы игроков
 """
 
+from importlib import import_module
+
 from .base_player import Player
-from .human_player import HumanPlayer
-from .ai_player import AIPlayer
 
 __all__ = ['Player', 'HumanPlayer', 'AIPlayer']
+
+# Игроки загружаются при первом обращении (PEP 562): партии человека
+# против человека не грузят поиск, MCTS и таблицы компьютерного игрока
+_LAZY = {
+    'HumanPlayer': '.human_player',
+    'AIPlayer': '.ai_player',
+}
+
+
+def __getattr__(name):
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(_LAZY[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
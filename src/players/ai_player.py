@@ -3,32 +3,146 @@
 """
 
 import random
-from typing import Tuple, List, Optional
+import time
+from typing import Tuple, List, Optional, Dict, Any
 from .base_player import Player
 from ..board import Board
+from ..events import EventSink, NULL_SINK, AI_MOVE
+
+# Движки уровней ('hard' - поиск, таблицы, кэш и размышления, 'mcts' - MCTS)
+# импортируются только при создании игрока такого уровня: 'easy' и 'medium' их не грузят
+
+
+class _SharedPositionCache:
+    """
+    Общий кэш позиций AIPlayer.position_cache: создается при первом обращении
+    и заменяет собой этот дескриптор.
+    """
+
+    def __get__(self, instance, owner):
+        from ..position_cache import PositionCache
+        AIPlayer.position_cache = PositionCache()
+        return AIPlayer.position_cache
+
 
 class AIPlayer(Player):
     """
     Базовый класс игрока - компьютера.
     """
+    # Уровни сложности
+    DIFFICULTIES = ('easy', 'medium', 'hard', 'mcts')
+    # Уровни, которым нужна сетка поля: на поле без границ (SparseBoard(None)) не играют
+    BOUNDED_DIFFICULTIES = ('hard', 'mcts')
+
+    __slots__ = ('difficulty', 'use_cache', 'think_time', 'rng', 'engine', 'mcts', 'events', 'ponderer')
 
-    def __init__(self, symbol: str, name: Optional[str] = None, difficulty: str = 'easy'):
+    # Кэш ходов по канонической позиции, общий для всех экземпляров
+    position_cache = _SharedPositionCache()
+
+    def __init__(self, symbol: str, name: Optional[str] = None, difficulty: str = 'easy',
+                 time_limit: float = 1.0, max_depth: Optional[int] = None,
+                 tt_memory_mb: float = 16, use_cache: bool = True,
+                 think_time: float = 0.5, seed: Optional[int] = None,
+                 mcts_iterations: Optional[int] = None, mcts_workers: int = 1,
+                 events: EventSink = NULL_SINK, ponder: bool = False):
         """
         Инициализирует игрока - компьютера. 
+        time_limit и max_depth - ограничения поиска для уровня 'hard'.
+        time_limit и mcts_iterations - бюджет хода для уровня 'mcts',
+        mcts_workers - процессы для параллельного поиска.
+        tt_memory_mb - размер таблицы транспозиций.
+        use_cache - использовать общий кэш позиций. Ходы в нем разделены
+            по (difficulty, max_depth, time_limit), поэтому игрок получает только
+            ходы, найденные с его настройками. Пакетным запускам, где важна
+            повторяемость, нужно use_cache=False.
+        think_time - пауза перед случайным ходом, 0 - без паузы.
+        seed - зерно генератора случайных ходов.
+        events - приемник событий AI_MOVE (ход, время, статистика поиска).
+        ponder - для уровня 'hard' думать во время хода соперника (src/ponder.py).
         """
         super().__init__(symbol, name or f"AI - {difficulty}")
         self.difficulty = difficulty
+        self.use_cache = use_cache
+        self.think_time = think_time
+        self.rng = random.Random(seed)
+        self.engine = None
+        self.mcts = None
+        self.ponderer = None
+        if difficulty == 'hard':
+            from ..search import SearchEngine
+            self.engine = SearchEngine(time_limit=time_limit, max_depth=max_depth,
+                                       tt_memory_mb=tt_memory_mb)
+            if ponder:
+                from ..ponder import Ponderer
+                self.ponderer = Ponderer(self.engine, self.symbol)
+        elif difficulty == 'mcts':
+            from ..mcts import MCTSEngine
+            self.mcts = MCTSEngine(time_limit=time_limit, iterations=mcts_iterations,
+                                   workers=mcts_workers, seed=seed)
+        self.events = events
+
+    @property
+    def search_stats(self) -> Dict[str, Any]:
+        """
+        Статистика поиска последнего хода: узлы, глубина, время.
+        """
+        if self.mcts is not None:
+            return self.mcts.last_stats
+        if self.engine is not None:
+            return self.engine.last_stats
+        return {}
 
     def get_move(self, board: Board) -> Tuple[int, int]:
         """
         Выбирает ход в зависимости от уровня сложности.
+        Время и статистика хода собираются, только если приемник событий включен.
+        """
+        if not self.events.enabled:
+            return self._choose_move(board)
+        start = time.perf_counter()
+        row, col = self._choose_move(board)
+        self.events.emit(AI_MOVE, player=self.name, symbol=self.symbol, difficulty=self.difficulty,
+                         row=row, col=col, elapsed=time.perf_counter() - start,
+                         stats=dict(self.search_stats))
+        return row, col
+
+    def check_board(self, board: Board):
+        """
+        Raises:
+            ValueError: уровень 'hard' или 'mcts' на поле без границ.
+        """
+        if board.size is None and self.difficulty in self.BOUNDED_DIFFICULTIES:
+            raise ValueError(f"Уровень '{self.difficulty}' играет только на поле с границами, "
+                             f"на поле без границ доступны 'easy' и 'medium'")
+
+    def start_pondering(self, board: Board):
+        if self.ponderer is not None:
+            self.ponderer.start(board)
+
+    def stop_pondering(self):
+        if self.ponderer is not None:
+            self.ponderer.stop()
+
+    @property
+    def ponder_stats(self) -> Dict[str, Any]:
         """
+        Статистика размышлений: попадания, время ответа. {} - если выключены.
+        """
+        return self.ponderer.get_stats() if self.ponderer is not None else {}
+
+    def _choose_move(self, board: Board) -> Tuple[int, int]:
+        """
+        Ход по уровню сложности.
+        """
+        self.check_board(board)
         if self.difficulty == 'easy':
             return self._get_random_move(board)
         elif self.difficulty == 'medium':
             return self._get_medium_move(board)
         elif self.difficulty == 'hard':
             return self._get_hard_move(board)
+        elif self.difficulty == 'mcts':
+            return self._get_mcts_move(board)
         else:
             raise ValueError(f"Неизвестный уровень сложности: {self.difficulty}")
         
@@ -37,26 +151,21 @@ class AIPlayer(Player):
         Выбирает случайный ход.
         AI - легкий.
         """
-        available_moves = self._get_available_moves(board)
-        if not available_moves:
+        move = board.random_move(self.rng)
+        if move is None:
             raise ValueError("Ходов не осталось")
         
         # Пауза на размышления)
-        import time
-        time.sleep(0.5)
+        if self.think_time > 0:
+            time.sleep(self.think_time)
 
-        return random.choice(available_moves)
+        return move
     
     def _get_available_moves(self, board: Board) -> List[Tuple[int, int]]:
         """
         Возвращает список доступных ходов
         """
-        moves = []
-        for row in range(board.size):
-            for col in range(board.size):
-                if board.get_cell(row, col) == ' ':
-                    moves.append((row, col))
-        return moves
+        return board.get_available_moves()
     
     def _get_medium_move(self, board: Board) -> Tuple[int, int]:
         """
@@ -64,17 +173,69 @@ class AIPlayer(Player):
         Уровень средний.
         1 Проверяет есть ли победный ход.
         2 Блокирует победный ход противника, если он есть.
-        3 Случайный ход.
+        3 Ставит вилку (две угрозы сразу) или мешает вилке противника.
+        4 Случайный ход.
+        Все проверки читаются из карты угроз поля (board.get_threat_map()).
         """
-        # TODO
+        threat_map = board.get_threat_map()
+        other = 'O' if self.symbol == 'X' else 'X'
+        available_moves = self._get_available_moves(board)
+
+        for check, symbol in ((threat_map.is_win, self.symbol), (threat_map.is_win, other),
+                              (threat_map.is_fork, self.symbol), (threat_map.is_fork, other)):
+            for row, col in available_moves:
+                if check(row, col, symbol):
+                    return row, col
+
         return self._get_random_move(board)
     
     def _get_hard_move(self, board: Board) -> Tuple[int, int]:
         """
         Игрок компьютер.
         Уровень сложный.
-        ...
+        Для малых полей ход берется из таблицы идеальной игры,
+        иначе - негамакс с альфа-бета отсечением и ограничением времени.
+        Найденные ходы сохраняются в общем кэше позиций.
+        """
+        from ..tablebase import get_tablebase
+
+        table = get_tablebase(board.size, board.win_length)
+        if table is not None:
+            result = table.lookup(board, self.symbol)
+            if result is not None:
+                return result[0]
+
+        if self.use_cache:
+            settings = self._cache_settings()
+            move = self.position_cache.get(board, self.symbol, settings)
+            if move is not None:
+                return move
+
+        if self.ponderer is None:
+            move = self.engine.search(board, self.symbol)
+        else:
+            # Фоновый поиск делит с движком таблицу транспозиций
+            from ..ponder import HIT
+            start = time.perf_counter()
+            self.ponderer.stop()
+            outcome, move = self.ponderer.take(board)
+            if outcome != HIT:
+                move = self.engine.search(board, self.symbol)
+            self.ponderer.record(outcome, time.perf_counter() - start)
+        if self.use_cache:
+            self.position_cache.put(board, self.symbol, move, settings)
+        return move
+
+    def _cache_settings(self) -> Tuple[str, Optional[int], float]:
+        """
+        Настройки поиска для ключа общего кэша позиций.
+        """
+        return self.difficulty, self.engine.max_depth, self.engine.time_limit
+
+    def _get_mcts_move(self, board: Board) -> Tuple[int, int]:
+        """
+        Игрок компьютер.
+        Поиск Монте-Карло (UCT) для больших полей,
+        дерево сохраняется между ходами партии.
         """
-        # TODO
-        return self._get_medium_move(board)
-    
\ No newline at end of file
+        return self.mcts.search(board, self.symbol)
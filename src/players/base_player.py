@@ -14,7 +14,14 @@ class Player(ABC):
     symbol: "X" или "O".
     name: Имя игрока.
     wins: Счетчик побед
+    Атрибуты объявлены в __slots__: у игроков нет __dict__.
+    Наследники перечисляют свои атрибуты в собственных __slots__.
+    interactive - ходы вводит человек: после недопустимого хода
+    игра спрашивает ход снова. Остальным игрокам недопустимый ход
+    завершает ход с ошибкой, иначе партия зациклится.
     """
+    __slots__ = ('symbol', 'name', 'wins', 'total_games')
+    interactive = False
 
     def __init__(self, symbol: str, name: Optional[str] = None):
         """
@@ -36,6 +43,25 @@ class Player(ABC):
         """
         pass
 
+    def check_board(self, board: Board):
+        """
+        Проверяет, что игрок может играть на поле board.
+        Вызывается при создании игры.
+        Raises:
+            ValueError: если не может.
+        """
+
+    def start_pondering(self, board: Board):
+        """
+        Соперник начал думать над ходом в позиции board.
+        Игрок может использовать это время (см. AIPlayer, ponder).
+        """
+
+    def stop_pondering(self):
+        """
+        Соперник сделал ход или партия прервана.
+        """
+
     def record_win(self):
         """
         Записывает победу игрока
@@ -10,6 +10,9 @@ class HumanPlayer(Player):
     """
     Игрок - человек, который вводит ходы через коноль.
     """
+    __slots__ = ()
+    interactive = True
+
     def get_move(self, board: Board) -> Tuple[int, int]:
         """
         Запрашивает ход у игрока
@@ -43,6 +46,10 @@ class HumanPlayer(Player):
 
             except ValueError:
                 print(f"Ошибка. Введите целые числа")
+            except EOFError:
+                # Ввод закончился (Ctrl+D или конец файла) - как выход
+                print(f"\nИгра остановлена игроком")
+                raise KeyboardInterrupt("Ввод закончился")
             except KeyboardInterrupt:
                 print(f"\nИгра остановлена игроком")
                 raise
@@ -0,0 +1,162 @@
+"""
+Размышление компьютера во время хода соперника (pondering).
+Пока соперник думает, фоновый поток перебирает его возможные ответы:
+сначала предсказанный поиском, затем остальные, ближе к центру раньше.
+Для каждого ответа ищется свой ход с полным временем на ход.
+Готовые ходы хранятся по хешу позиции, а таблица транспозиций общая
+с движком игрока, поэтому даже прерванный поиск ускоряет ответ.
+"""
+
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from .board import Board
+from .search import SearchEngine
+from .transposition import TranspositionTable
+
+# Исходы запроса хода
+HIT = 'hit'          # ход готов, ответ без поиска
+PARTIAL = 'partial'  # эту позицию перебирали, когда соперник сходил
+MISS = 'miss'        # позицию не перебирали
+
+
+class Ponderer:
+    """
+    Фоновый поиск для одного компьютерного игрока.
+    Arg:
+        engine - движок игрока: от него берутся время, глубина и таблица транспозиций.
+        symbol - символ игрока.
+        predict_fraction - доля времени на ход для предсказания ответа соперника.
+    """
+
+    def __init__(self, engine: SearchEngine, symbol: str, predict_fraction: float = 0.25):
+        self.engine = engine
+        self.symbol = symbol
+        self.opponent = 'O' if symbol == 'X' else 'X'
+        self.predict_fraction = predict_fraction
+        # Свой движок: статистика игрока не смешивается с фоновыми поисками
+        self.search_engine = SearchEngine(time_limit=engine.time_limit, max_depth=engine.max_depth,
+                                          tt_memory_mb=engine.tt_memory_mb)
+        self._thread: Optional[threading.Thread] = None
+        # Хеш позиции после ответа соперника -> наш ход
+        self._results: Dict[int, Tuple[int, int]] = {}
+        # Позиция, которую перебирали в момент остановки
+        self._current: Optional[int] = None
+        self.reset_stats()
+
+    def reset_stats(self):
+        """
+        Сбрасывает счетчики
+        """
+        self.pondered = 0
+        self.counts = {HIT: 0, PARTIAL: 0, MISS: 0}
+        self.latency = {HIT: 0.0, PARTIAL: 0.0, MISS: 0.0}
+
+    def start(self, board):
+        """
+        Соперник начал думать над ходом в позиции board.
+        Позиция копируется, поэтому board можно менять.
+        """
+        self.stop()
+        self._results = {}
+        self._current = None
+        if board.size is None or board.size > Board.MAX_SIZE or board.winner:
+            return
+        copy = Board(board.size, board.win_length, verbose=False)
+        for row, col in board.moves:
+            copy.place(row, col, board.get_cell(row, col))
+        if copy.is_full():
+            return
+
+        # Таблица транспозиций общая с движком игрока
+        if self.engine.tt is None:
+            self.engine.tt = TranspositionTable(self.engine.tt_memory_mb)
+        self.search_engine.tt = self.engine.tt
+        self.search_engine.stopped = False
+        self._thread = threading.Thread(target=self._run, args=(copy,), daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """
+        Соперник сходил: фоновый поиск прерывается, поток завершается.
+        """
+        if self._thread is None:
+            return
+        self.search_engine.stop()
+        self._thread.join()
+        self._thread = None
+
+    def _replies(self, board: Board):
+        """
+        Ответы соперника: предсказанный первым, остальные - от центра к краям.
+        """
+        center = (board.size - 1) / 2
+        replies = sorted(board.get_available_moves(),
+                         key=lambda move: abs(move[0] - center) + abs(move[1] - center))
+        engine = self.search_engine
+        engine.time_limit = self.engine.time_limit * self.predict_fraction
+        try:
+            predicted = engine.search(board, self.opponent)
+        finally:
+            engine.time_limit = self.engine.time_limit
+        if engine.stopped:
+            return replies
+        replies.remove(predicted)
+        return [predicted] + replies
+
+    def _run(self, board: Board):
+        """
+        Поток: ход на каждый ответ соперника, пока не остановят.
+        """
+        engine = self.search_engine
+        for row, col in self._replies(board):
+            if engine.stopped:
+                return
+            if board.place(row, col, self.opponent) or board.is_full():
+                board.pop()
+                continue
+            self._current = board.hash
+            move = engine.search(board, self.symbol)
+            if not engine.stopped:
+                self._results[board.hash] = move
+                self.pondered += 1
+            board.pop()
+
+    def take(self, board) -> Tuple[str, Optional[Tuple[int, int]]]:
+        """
+        Ход для позиции board из результатов размышления.
+        Вызывать после stop.
+        Return: (HIT, ход), (PARTIAL, None) или (MISS, None).
+        """
+        key = board.hash
+        move = self._results.get(key)
+        if move is not None and board.get_cell(*move) == ' ':
+            return HIT, move
+        if key == self._current:
+            return PARTIAL, None
+        return MISS, None
+
+    def record(self, outcome: str, elapsed: float):
+        """
+        Учитывает время ответа игрока для исхода outcome.
+        """
+        self.counts[outcome] += 1
+        self.latency[outcome] += elapsed
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Возвращает статистику размышлений.
+        hit_rate - доля ходов, готовых к приходу хода соперника;
+        avg_latency - среднее время ответа по исходам, с.
+        """
+        total = sum(self.counts.values())
+        return {
+            'pondered': self.pondered,
+            'hits': self.counts[HIT],
+            'partial': self.counts[PARTIAL],
+            'misses': self.counts[MISS],
+            'hit_rate': self.counts[HIT] / total * 100 if total else 0.0,
+            'avg_latency': {outcome: self.latency[outcome] / count if count else 0.0
+                            for outcome, count in self.counts.items()},
+        }
@@ -0,0 +1,98 @@
+"""
+Кэш лучших ходов по канонической позиции.
+Общий для всех компьютерных игроков процесса.
+"""
+
+from collections import OrderedDict
+from typing import Dict, Any, Hashable, Optional, Tuple
+from .symmetry import canonical_key, board_to_string, transform_move, restore_move
+
+
+class PositionCache:
+    """
+    LRU-кэш ходов. Симметричные позиции делят одну запись.
+    Ходы игроков с разными настройками поиска хранятся отдельно:
+    настройки (settings) входят в ключ.
+    Arg:
+        capacity - максимальное число позиций.
+    """
+
+    def __init__(self, capacity: int = 100_000):
+        """
+        Создает пустой кэш.
+        """
+        if capacity <= 0:
+            raise ValueError(f"Размер кэша должен быть положительным, введено {capacity}")
+        self.capacity = capacity
+        # Ключ - каноническая позиция, значение - (ход, исходная запись поля)
+        self._entries = OrderedDict()
+        self.reset_stats()
+
+    def reset_stats(self):
+        """
+        Сбрасывает счетчики
+        """
+        self.hits = 0
+        self.misses = 0
+        self.symmetry_hits = 0
+        self.evictions = 0
+
+    def clear(self):
+        """
+        Очищает кэш
+        """
+        self._entries.clear()
+        self.reset_stats()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, board, symbol: str, settings: Hashable = None) -> Optional[Tuple[int, int]]:
+        """
+        Возвращает сохраненный ход для позиции или None.
+        settings - настройки поиска, с которыми ход был найден.
+        """
+        key, transform = canonical_key(board, symbol)
+        key = (settings, key)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        move, stored_cells = entry
+        # Без симметрий это было бы промахом
+        if stored_cells != board_to_string(board):
+            self.symmetry_hits += 1
+        return restore_move(move, transform, board.size)
+
+    def put(self, board, symbol: str, move: Tuple[int, int], settings: Hashable = None):
+        """
+        Сохраняет лучший ход для позиции.
+        settings - настройки поиска, с которыми ход найден.
+        """
+        key, transform = canonical_key(board, symbol)
+        key = (settings, key)
+        self._entries[key] = (transform_move(move, transform, board.size), board_to_string(board))
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Возвращает статистику кэша.
+        plain_hit_rate - доля попаданий, если бы симметрии не учитывались.
+        """
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self._entries),
+            'capacity': self.capacity,
+            'hits': self.hits,
+            'misses': self.misses,
+            'symmetry_hits': self.symmetry_hits,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups * 100 if lookups else 0.0,
+            'plain_hit_rate': (self.hits - self.symmetry_hits) / lookups * 100 if lookups else 0.0,
+        }
@@ -0,0 +1,323 @@
+"""
+Компактный бинарный формат записи партий.
+Ход занимает один байт (индекс клетки row * size + col),
+поэтому архив из миллионов партий читается потоком.
+
+Формат файла:
+    заголовок: сигнатура и версия;
+    партии одна за другой:
+        размер поля, длина линии, символ первого игрока (0 - X, 1 - O),
+        длина и имя первого игрока, длина и имя второго игрока (UTF-8),
+        ходы по байту, байт END_OF_MOVES, код результата.
+Партия пишется по мере игры, поэтому заголовок не знает числа ходов:
+конец ходов отмечает байт END_OF_MOVES.
+"""
+
+import struct
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Tuple
+
+from .board import Board
+
+MAGIC = b'TTTG'
+FORMAT_VERSION = 1
+FILE_HEADER = struct.Struct('<4sB')
+GAME_HEADER = struct.Struct('<BBB')
+
+# Байт конца ходов. Индекс клетки всегда меньше, поэтому поле не больше 15x15
+END_OF_MOVES = 0xFF
+END_MARKER = bytes((END_OF_MOVES,))
+MAX_SIZE = 15
+
+# Коды результата
+RESULT_NONE = 0   # партия прервана
+RESULT_X = 1
+RESULT_O = 2
+RESULT_DRAW = 3
+
+RESULT_CODES = {None: RESULT_NONE, 'X': RESULT_X, 'O': RESULT_O, 'draw': RESULT_DRAW}
+RESULT_NAMES = {code: name for name, code in RESULT_CODES.items()}
+
+SYMBOL_CODES = {'X': 0, 'O': 1}
+SYMBOLS = ('X', 'O')
+
+# Размер блока при чтении файла
+READ_CHUNK = 1 << 20
+
+
+class RecordError(ValueError):
+    """
+    Файл записей поврежден или имеет другой формат.
+    """
+
+
+class GameRecord:
+    """
+    Одна записанная партия.
+    Arg:
+        size, win_length - параметры поля
+        players - имена первого и второго игрока
+        first_symbol - символ игрока, который ходит первым
+        moves - ходы (row, col) по порядку
+        result - 'X', 'O', 'draw' или None, если партия прервана
+    """
+
+    __slots__ = ('size', 'win_length', 'players', 'first_symbol', 'moves', 'result')
+
+    def __init__(self, size: int, win_length: int, players: Tuple[str, str],
+                 first_symbol: str = 'X', moves: Optional[List[Tuple[int, int]]] = None,
+                 result: Optional[str] = None):
+        self.size = size
+        self.win_length = win_length
+        self.players = players
+        self.first_symbol = first_symbol
+        self.moves = moves if moves is not None else []
+        self.result = result
+
+    def symbol_of(self, turn: int) -> str:
+        """
+        Символ игрока, сделавшего ход с номером turn (с нуля).
+        """
+        first = SYMBOL_CODES[self.first_symbol]
+        return SYMBOLS[(first + turn) % 2]
+
+    def to_history(self) -> List[Dict[str, Any]]:
+        """
+        Переводит запись в формат Game.history.
+        """
+        return [
+            {
+                'player': self.players[turn % 2],
+                'symbol': self.symbol_of(turn),
+                'position': move,
+                'turn_number': turn + 1
+            }
+            for turn, move in enumerate(self.moves)
+        ]
+
+    def to_bytes(self) -> bytes:
+        """
+        Кодирует партию целиком.
+        """
+        return (_encode_header(self.size, self.win_length, self.players, self.first_symbol)
+                + bytes(row * self.size + col for row, col in self.moves)
+                + bytes((END_OF_MOVES, RESULT_CODES[self.result])))
+
+    def __repr__(self):
+        return (f"GameRecord({self.size}x{self.size}, k={self.win_length}, "
+                f"{self.players[0]} vs {self.players[1]}, {len(self.moves)} ходов, {self.result})")
+
+
+def _encode_name(name: str) -> bytes:
+    """
+    Имя игрока: байт длины и UTF-8, не длиннее 255 байт.
+    """
+    data = name.encode('utf-8')[:255]
+    return bytes((len(data),)) + data
+
+
+def check_size(size: Optional[int]):
+    """
+    Проверяет, что поле помещается в формат: ход - один байт.
+    Raises:
+        RecordError: поле без границ (size=None) или больше MAX_SIZE.
+    """
+    if size is None:
+        raise RecordError("Поле без границ не поддерживается форматом записи")
+    if not 1 <= size <= MAX_SIZE:
+        raise RecordError(f"Размер поля {size} не поддерживается форматом (1..{MAX_SIZE})")
+
+
+def _encode_header(size: int, win_length: int, players: Tuple[str, str], first_symbol: str) -> bytes:
+    """
+    Заголовок партии.
+    """
+    check_size(size)
+    return (GAME_HEADER.pack(size, win_length, SYMBOL_CODES[first_symbol])
+            + _encode_name(players[0]) + _encode_name(players[1]))
+
+
+class GameRecordWriter:
+    """
+    Потоковая запись партий в файл только на дозапись.
+    Каждый ход сразу уходит в буфер файла, поэтому прерванная
+    партия не теряется целиком.
+    """
+
+    def __init__(self, path: str):
+        """
+        Открывает файл на дозапись и пишет заголовок, если файл новый.
+        """
+        self.path = path
+        self._file: BinaryIO = open(path, 'ab')
+        if self._file.tell() == 0:
+            self._file.write(FILE_HEADER.pack(MAGIC, FORMAT_VERSION))
+        self._size = 0
+        self._in_game = False
+        self.games_written = 0
+
+    def begin_game(self, size: int, win_length: int, players: Tuple[str, str],
+                   first_symbol: str = 'X'):
+        """
+        Начинает новую партию. Незаконченная партия закрывается без результата.
+        """
+        if self._in_game:
+            self.end_game(None)
+        self._file.write(_encode_header(size, win_length, players, first_symbol))
+        self._size = size
+        self._in_game = True
+
+    def write_move(self, row: int, col: int):
+        """
+        Дописывает ход текущей партии.
+        """
+        if not self._in_game:
+            raise RecordError("Партия не начата")
+        self._file.write(bytes((row * self._size + col,)))
+
+    def end_game(self, result: Optional[str]):
+        """
+        Закрывает партию с результатом 'X', 'O', 'draw' или None.
+        """
+        if not self._in_game:
+            raise RecordError("Партия не начата")
+        self._file.write(bytes((END_OF_MOVES, RESULT_CODES[result])))
+        self._in_game = False
+        self.games_written += 1
+
+    def write_record(self, record: GameRecord):
+        """
+        Записывает готовую партию целиком.
+        """
+        if self._in_game:
+            self.end_game(None)
+        self._file.write(record.to_bytes())
+        self.games_written += 1
+
+    def flush(self):
+        self._file.flush()
+
+    def close(self):
+        """
+        Закрывает файл. Незаконченная партия закрывается без результата.
+        """
+        if self._file.closed:
+            return
+        if self._in_game:
+            self.end_game(None)
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def read_games(path: str) -> Iterator[GameRecord]:
+    """
+    Читает партии по одной, не загружая файл целиком.
+    Оборванная в конце файла партия (например, при аварийном
+    завершении записи) пропускается.
+    """
+    with open(path, 'rb') as file:
+        check_header(file.read(FILE_HEADER.size), path)
+
+        buffer = b''
+        pos = 0
+        eof = False
+        while True:
+            record = None
+            if pos < len(buffer):
+                record, end = decode_game(buffer, pos)
+            if record is not None:
+                pos = end
+                yield record
+                continue
+            if eof:
+                return
+            # Партия не поместилась в буфер - дочитываем следующий блок
+            chunk = file.read(READ_CHUNK)
+            eof = not chunk
+            buffer = buffer[pos:] + chunk
+            pos = 0
+
+
+def check_header(header: bytes, path: str):
+    """
+    Проверяет заголовок файла записей.
+    """
+    if len(header) < FILE_HEADER.size:
+        raise RecordError(f"{path}: файл слишком короткий")
+    magic, version = FILE_HEADER.unpack_from(header)
+    if magic != MAGIC:
+        raise RecordError(f"{path}: не файл записей партий")
+    if version != FORMAT_VERSION:
+        raise RecordError(f"{path}: версия формата {version}, ожидается {FORMAT_VERSION}")
+
+
+def decode_game(buffer, pos: int):
+    """
+    Разбирает партию, начиная с pos.
+    buffer - bytes или mmap открытого файла записей.
+    Return: (GameRecord, позиция после партии) или (None, pos), если данных не хватает.
+    """
+    start = pos
+    if pos + GAME_HEADER.size > len(buffer):
+        return None, start
+    size, win_length, first = GAME_HEADER.unpack_from(buffer, pos)
+    if not 1 <= size <= MAX_SIZE or first > 1:
+        raise RecordError(f"Поврежденный заголовок партии на смещении {start}")
+    pos += GAME_HEADER.size
+
+    players = []
+    for _ in range(2):
+        if pos >= len(buffer):
+            return None, start
+        length = buffer[pos]
+        if pos + 1 + length > len(buffer):
+            return None, start
+        players.append(buffer[pos + 1:pos + 1 + length].decode('utf-8', errors='replace'))
+        pos += 1 + length
+
+    end = buffer.find(END_MARKER, pos)
+    if end < 0 or end + 1 >= len(buffer):
+        return None, start
+    moves = [divmod(cell, size) for cell in buffer[pos:end]]
+    result = RESULT_NAMES.get(buffer[end + 1])
+    return GameRecord(size, win_length, (players[0], players[1]), SYMBOLS[first], moves, result), end + 2
+
+
+def history_to_record(history: List[Dict[str, Any]], size: int,
+                      win_length: Optional[int] = None) -> GameRecord:
+    """
+    Переводит Game.history в запись партии.
+    Результат определяется повторным проигрыванием ходов.
+    """
+    win_length = win_length or size
+    if not history:
+        return GameRecord(size, win_length, ('', ''))
+
+    first_symbol = history[0]['symbol']
+    second = history[1]['player'] if len(history) > 1 else ''
+    board = Board(size, win_length, verbose=False)
+    result = None
+    moves = []
+    for entry in history:
+        row, col = entry['position']
+        moves.append((row, col))
+        if board.place(row, col, entry['symbol']):
+            result = entry['symbol']
+    if result is None and board.is_draw():
+        result = 'draw'
+    return GameRecord(size, win_length, (history[0]['player'], second), first_symbol, moves, result)
+
+
+def convert_histories(histories, path: str, size: int, win_length: Optional[int] = None) -> int:
+    """
+    Дописывает список историй партий в файл записей.
+    Return: число записанных партий.
+    """
+    with GameRecordWriter(path) as writer:
+        for history in histories:
+            writer.write_record(history_to_record(history, size, win_length))
+        return writer.games_written
@@ -0,0 +1,364 @@
+"""
+Поисковый движок для компьютера.
+Негамакс с альфа-бета отсечением, итеративным углублением
+и ограничением времени на ход.
+"""
+
+import time
+from typing import Dict, Any, List, Optional, Tuple
+from .lines import get_win_masks, get_cell_masks
+from .transposition import TranspositionTable, EXACT, LOWER, UPPER
+from .zobrist import get_zobrist_keys
+
+# Оценка выигранной позиции. Победа на меньшей глубине оценивается выше.
+WIN_SCORE = 10 ** 9
+INFINITY = 10 ** 12
+
+
+class SearchTimeout(Exception):
+    """
+    Время на ход истекло.
+    """
+
+
+class SearchEngine:
+    """
+    Поиск лучшего хода на битовом представлении позиции.
+    Позиция задается парой масок: свои камни и камни соперника.
+    Arg:
+        time_limit - время на ход в секундах.
+        max_depth - максимальная глубина. По умолчанию до конца игры.
+        tt_memory_mb - размер таблицы транспозиций в мегабайтах.
+    """
+    # Как часто (в узлах) проверять время
+    TIME_CHECK_INTERVAL = 1024
+    # Количество killer-ходов на каждом уровне
+    KILLER_SLOTS = 2
+
+    def __init__(self, time_limit: float = 1.0, max_depth: Optional[int] = None,
+                 tt_memory_mb: float = 16):
+        """
+        Инициализирует движок.
+        """
+        if time_limit <= 0:
+            raise ValueError(f"Время на ход должно быть положительным, введено {time_limit}")
+        self.time_limit = time_limit
+        self.max_depth = max_depth
+        # Таблица выделяется при первом поиске: движок есть у каждого
+        # компьютерного игрока, а ищут только 'hard'
+        if tt_memory_mb <= 0:
+            raise ValueError(f"Размер таблицы должен быть положительным, введено {tt_memory_mb}")
+        self.tt_memory_mb = tt_memory_mb
+        self.tt: Optional[TranspositionTable] = None
+
+        self.size = None
+        self.win_length = None
+
+        # Статистика последнего хода и общая
+        self.last_stats: Dict[str, Any] = {}
+        self.total_moves = 0
+        self.total_nodes = 0
+        self.total_time = 0.0
+        self.max_depth_reached = 0
+
+        self._nodes = 0
+        self._deadline = 0.0
+        self._killers: List[List[int]] = []
+        # Поиск остановлен из другого потока (stop), сбрасывается вызывающим
+        self.stopped = False
+
+    def _prepare(self, size: int, win_length: int):
+        """
+        Готовит таблицы для поля заданного размера.
+        Ключи Зобриста зависят только от размера, а оценки - и от длины линии,
+        поэтому при смене поля таблица транспозиций очищается.
+        """
+        if (size, win_length) == (self.size, self.win_length):
+            return
+        if self.tt is not None:
+            self.tt.clear()
+        self.size = size
+        self.win_length = win_length
+        self.full_mask = (1 << (size * size)) - 1
+        self.zobrist_keys = get_zobrist_keys(size)
+        self.masks = get_win_masks(size, win_length)
+        self.cell_masks = get_cell_masks(size, win_length)
+
+        # Вес открытой линии растет с числом камней на ней
+        self.weights = [8 ** count for count in range(win_length + 1)]
+
+        # Сначала центральные клетки
+        center = (size - 1) / 2
+        self.center_order = sorted(
+            range(size * size),
+            key=lambda index: abs(index // size - center) + abs(index % size - center)
+        )
+
+        # На больших полях рассматриваем только клетки рядом с камнями
+        self.neighbor_masks = None
+        if size > 5:
+            self.neighbor_masks = []
+            for index in range(size * size):
+                row, col = divmod(index, size)
+                mask = 0
+                for dr in (-1, 0, 1):
+                    for dc in (-1, 0, 1):
+                        if 0 <= row + dr < size and 0 <= col + dc < size:
+                            mask |= 1 << ((row + dr) * size + col + dc)
+                self.neighbor_masks.append(mask)
+
+    def search(self, board, symbol: str) -> Tuple[int, int]:
+        """
+        Возвращает лучший ход (row, col) для symbol.
+        Статистика хода сохраняется в last_stats.
+        """
+        self._prepare(board.size, board.win_length)
+        if self.tt is None:
+            self.tt = TranspositionTable(self.tt_memory_mb)
+        other = 'O' if symbol == 'X' else 'X'
+
+        # Ключи Зобриста ходящего на четных и нечетных уровнях
+        self._keys = (self.zobrist_keys[symbol], self.zobrist_keys[other])
+
+        # Ключ корня считается теми же ключами, что и у потомков:
+        # board.hash у SparseBoard устроен иначе, и записи бы не совпадали
+        own, opp, key = 0, 0, 0
+        for row in range(board.size):
+            for col in range(board.size):
+                cell = board.get_cell(row, col)
+                if cell == ' ':
+                    continue
+                index = row * board.size + col
+                key ^= self.zobrist_keys[cell][index]
+                if cell == symbol:
+                    own |= 1 << index
+                else:
+                    opp |= 1 << index
+
+        empty = self.full_mask & ~(own | opp)
+        if not empty:
+            raise ValueError("Ходов не осталось")
+
+        start = time.perf_counter()
+        self._deadline = start + self.time_limit
+        # stop пишет stopped до _deadline, поэтому остановка не теряется,
+        # даже если пришла в момент старта поиска
+        if self.stopped:
+            self._deadline = 0.0
+        self._nodes = 0
+        self._killers = [[] for _ in range(self.size * self.size + 1)]
+
+        max_depth = bin(empty).count('1')
+        if self.max_depth is not None:
+            max_depth = min(max_depth, self.max_depth)
+
+        root_moves = self._order_moves(own, opp, empty, 0, -1)
+        best_move, best_score, depth_reached = root_moves[0], 0, 0
+
+        for depth in range(1, max_depth + 1):
+            try:
+                move, score = self._search_root(own, opp, root_moves, depth, key)
+            except SearchTimeout as timeout:
+                # Ход из незавершенной итерации лучше предыдущего,
+                # так как предыдущий лучший ход проверен первым
+                if timeout.args and timeout.args[0] is not None:
+                    best_move, best_score = timeout.args[0]
+                break
+            best_move, best_score, depth_reached = move, score, depth
+
+            # Лучший ход проверяем первым на следующей итерации
+            root_moves.remove(move)
+            root_moves.insert(0, move)
+
+            # Результат игры уже известен
+            if abs(score) >= WIN_SCORE - self.size * self.size:
+                break
+
+        elapsed = time.perf_counter() - start
+        self.last_stats = {
+            'nodes': self._nodes,
+            'depth': depth_reached,
+            'time': elapsed,
+            'score': best_score,
+            'nps': self._nodes / elapsed if elapsed > 0 else 0.0,
+        }
+        self.total_moves += 1
+        self.total_nodes += self._nodes
+        self.total_time += elapsed
+        self.max_depth_reached = max(self.max_depth_reached, depth_reached)
+
+        return divmod(best_move, self.size)
+
+    def stop(self):
+        """
+        Прерывает текущий и следующие поиски (вызывается из другого потока).
+        Поиск закончится при ближайшей проверке времени и вернет лучший
+        найденный ход. Снова искать в полную силу - после stopped = False.
+        """
+        self.stopped = True
+        self._deadline = 0.0
+
+    def _search_root(self, own, opp, moves, depth, key):
+        """
+        Одна итерация поиска на заданную глубину.
+        """
+        alpha, beta = -INFINITY, INFINITY
+        best_move, best_score = None, -INFINITY
+        try:
+            for index in moves:
+                score = self._score_move(own, opp, index, depth, alpha, beta, 0, key)
+                if score > best_score:
+                    best_move, best_score = index, score
+                if score > alpha:
+                    alpha = score
+        except SearchTimeout:
+            raise SearchTimeout((best_move, best_score) if best_move is not None else None)
+        self.tt.store(key, depth, self._score_to_tt(best_score, 0), EXACT, best_move)
+        return best_move, best_score
+
+    def _score_move(self, own, opp, index, depth, alpha, beta, ply, key):
+        """
+        Оценивает ход index с точки зрения ходящего.
+        """
+        new_own = own | (1 << index)
+        for mask in self.cell_masks[index]:
+            if new_own & mask == mask:
+                return WIN_SCORE - ply
+        key ^= self._keys[ply & 1][index]
+        return -self._negamax(opp, new_own, depth - 1, -beta, -alpha, ply + 1, key)
+
+    def _negamax(self, own, opp, depth, alpha, beta, ply, key):
+        """
+        Негамакс с альфа-бета отсечением.
+        own - камни ходящего, opp - камни соперника, key - хеш позиции.
+        """
+        self._nodes += 1
+        if self._nodes % self.TIME_CHECK_INTERVAL == 0 and time.perf_counter() > self._deadline:
+            raise SearchTimeout()
+
+        empty = self.full_mask & ~(own | opp)
+        if not empty:
+            return 0
+        if depth == 0:
+            return self._evaluate(own, opp)
+
+        # Результат из таблицы транспозиций
+        original_alpha = alpha
+        tt_move = -1
+        entry = self.tt.probe(key)
+        if entry is not None:
+            tt_depth, tt_score, tt_flag, tt_move = entry
+            if tt_depth >= depth:
+                tt_score = self._score_from_tt(tt_score, ply)
+                if tt_flag == EXACT:
+                    return tt_score
+                if tt_flag == LOWER:
+                    alpha = max(alpha, tt_score)
+                elif tt_flag == UPPER:
+                    beta = min(beta, tt_score)
+                if alpha >= beta:
+                    return tt_score
+
+        best, best_move = -INFINITY, -1
+        for index in self._order_moves(own, opp, empty, ply, tt_move):
+            score = self._score_move(own, opp, index, depth, alpha, beta, ply, key)
+            if score > best:
+                best, best_move = score, index
+            if score > alpha:
+                alpha = score
+            if alpha >= beta:
+                self._store_killer(index, ply)
+                break
+
+        if best <= original_alpha:
+            flag = UPPER
+        elif best >= beta:
+            flag = LOWER
+        else:
+            flag = EXACT
+        self.tt.store(key, depth, self._score_to_tt(best, ply), flag, best_move)
+        return best
+
+    @staticmethod
+    def _score_to_tt(score, ply):
+        """
+        Оценка победы хранится относительно текущей позиции, а не корня.
+        """
+        if score >= WIN_SCORE - 100:
+            return score + ply
+        if score <= -WIN_SCORE + 100:
+            return score - ply
+        return score
+
+    @staticmethod
+    def _score_from_tt(score, ply):
+        """
+        Обратное преобразование к _score_to_tt.
+        """
+        if score >= WIN_SCORE - 100:
+            return score - ply
+        if score <= -WIN_SCORE + 100:
+            return score + ply
+        return score
+
+    def _order_moves(self, own, opp, empty, ply, tt_move):
+        """
+        Упорядочивает ходы: ход из таблицы транспозиций, killer-ходы,
+        затем ближе к центру.
+        """
+        candidates = empty
+        if self.neighbor_masks is not None and (own | opp):
+            near = 0
+            stones = own | opp
+            while stones:
+                low = stones & -stones
+                near |= self.neighbor_masks[low.bit_length() - 1]
+                stones ^= low
+            candidates = empty & near or empty
+
+        moves = [tt_move] if tt_move >= 0 and empty >> tt_move & 1 else []
+        moves.extend(index for index in self._killers[ply]
+                     if candidates >> index & 1 and index not in moves)
+        moves.extend(index for index in self.center_order
+                     if candidates >> index & 1 and index not in moves)
+        return moves
+
+    def _store_killer(self, index, ply):
+        """
+        Запоминает ход, вызвавший отсечение.
+        """
+        killers = self._killers[ply]
+        if index in killers:
+            return
+        killers.insert(0, index)
+        del killers[self.KILLER_SLOTS:]
+
+    def _evaluate(self, own, opp):
+        """
+        Эвристическая оценка: открытые линии своих минус открытые линии соперника.
+        """
+        score = 0
+        weights = self.weights
+        for mask in self.masks:
+            mine = own & mask
+            theirs = opp & mask
+            if mine:
+                if not theirs:
+                    score += weights[bin(mine).count('1')]
+            elif theirs:
+                score -= weights[bin(theirs).count('1')]
+        return score
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Возвращает общую статистику поиска
+        """
+        return {
+            'moves': self.total_moves,
+            'nodes': self.total_nodes,
+            'time': self.total_time,
+            'max_depth': self.max_depth_reached,
+            'avg_time_per_move': self.total_time / self.total_moves if self.total_moves else 0.0,
+            'nps': self.total_nodes / self.total_time if self.total_time > 0 else 0.0,
+            'tt': self.tt.get_stats() if self.tt is not None else {},
+        }
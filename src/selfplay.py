@@ -0,0 +1,456 @@
+"""
+Данные для обучения оценщика из партий компьютера против компьютера.
+Конвейер из четырех стадий, соединенных очередями ограниченной длины,
+поэтому память не растет с числом партий:
+
+    партии (процессы) -> позиции и симметрии -> отсев повторов -> шарды .npz
+
+Шард - файл shard_00000.npz с массивами одинаковой длины (не больше shard_size):
+    boards - (N, size, size) int8: 0 - пусто, 1 - X, 2 - O (как в src/batch_eval.py);
+    side - (N,) int8: кто ходит, 1 - X, 2 - O;
+    outcome - (N,) int8: итог партии для ходящего, 1 - победа, 0 - ничья, -1 - поражение;
+    value - (N,) float32: оценка поиска для ходящего от -1 до 1, NaN - оценки нет.
+Каждая позиция пишется во всех различных симметриях, повтор позиции
+(с точностью до симметрии) из другой партии отбрасывается.
+
+Запуск: python -m src.selfplay --games 1000 --size 3 --output-dir datasets/3x3
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import multiprocessing
+import os
+import queue
+import random
+import sys
+import threading
+import time
+from array import array
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from .board import Board
+from .players import AIPlayer
+from .search import WIN_SCORE
+from .symmetry import get_inverse_transforms
+from .tablebase import get_tablebase
+from .tournament import game_seed
+
+# Код результата партии в сообщениях между стадиями
+DRAW = 0
+X_WINS = 1
+O_WINS = 2
+
+SIDE_CODES = {'X': X_WINS, 'O': O_WINS}
+
+# Конец потока в очередях между стадиями
+_DONE = None
+
+
+def search_value(player: AIPlayer, board: Board, table_score: Optional[int]) -> float:
+    """
+    Оценка только что выбранного хода для ходящего, от -1 до 1.
+    table_score - оценка из таблицы идеальной игры до хода, если позиция в ней есть.
+    Эвристическая оценка поиска сжимается через tanh: линия без одного камня ~ 0.76.
+    Return: NaN, если уровень игрока не оценивает позицию.
+    """
+    if table_score is not None:
+        return float((table_score > 0) - (table_score < 0))
+    stats = player.search_stats
+    if player.difficulty == 'mcts' and stats:
+        return stats['win_rate'] / 50 - 1
+    if player.difficulty == 'hard' and stats:
+        score = stats['score']
+        if abs(score) >= WIN_SCORE - 100:
+            return 1.0 if score > 0 else -1.0
+        return math.tanh(score / 8 ** (board.win_length - 1))
+    return math.nan
+
+
+def play_selfplay_game(players: Dict[str, AIPlayer], size: int, win_length: int,
+                       rng: random.Random, random_plies: int):
+    """
+    Играет одну партию. Первые random_plies ходов случайные,
+    чтобы партии детерминированных игроков различались.
+    Return: (клетки ходов bytes, оценки ходов array('f'), код результата).
+    """
+    board = Board(size, win_length, verbose=False)
+    table = get_tablebase(size, win_length)
+    cells = bytearray()
+    values = array('f')
+    symbol = 'X'
+    while True:
+        if board.move_count < random_plies:
+            row, col = board.random_move(rng)
+            value = math.nan
+        else:
+            player = players[symbol]
+            table_score = None
+            if table is not None and player.difficulty == 'hard':
+                entry = table.lookup(board, symbol)
+                table_score = entry[1] if entry is not None else None
+            row, col = player.get_move(board)
+            value = search_value(player, board, table_score)
+
+        _, is_winning = board.make_move(row, col, symbol)
+        cells.append(row * size + col)
+        values.append(value)
+        if is_winning:
+            return bytes(cells), values, SIDE_CODES[symbol]
+        if board.is_draw():
+            return bytes(cells), values, DRAW
+        symbol = 'O' if symbol == 'X' else 'X'
+
+
+def generation_worker(worker_id: int, config: Dict[str, Any], games: multiprocessing.Queue):
+    """
+    Рабочий процесс стадии партий: играет партии worker_id, worker_id + workers, ...
+    и кладет их в очередь. Последнее сообщение - ('done', партий, секунд работы).
+    """
+    players = {
+        symbol: AIPlayer(symbol, difficulty=config[symbol.lower()], time_limit=config['time_limit'],
+                         think_time=0, use_cache=False,
+                         seed=game_seed(config['seed'], worker_id) + index)
+        for index, symbol in enumerate(('X', 'O'))
+    }
+    played = 0
+    busy = 0.0
+    for game_id in range(worker_id, config['games'], config['workers']):
+        start = time.perf_counter()
+        rng = random.Random(game_seed(config['seed'], game_id))
+        record = play_selfplay_game(players, config['size'], config['win_length'],
+                                    rng, config['random_plies'])
+        busy += time.perf_counter() - start
+        # put ждет, пока стадия позиций освободит место
+        games.put(record)
+        played += 1
+    games.put(('done', played, busy))
+
+
+class SeenHashes:
+    """
+    Множество 64-битных хешей на открытой адресации в array('Q'):
+    8-16 байт на хеш вместо ~90 у set из int, поэтому отсев повторов
+    почти не добавляет памяти. 0 - пустая ячейка, хеш 0 хранится как 1.
+    """
+
+    def __init__(self, capacity_bits: int = 16):
+        self._bits = capacity_bits
+        self._slots = array('Q', bytes(8 << capacity_bits))
+        self.count = 0
+
+    def add(self, key: int) -> bool:
+        """
+        Return: True, если хеша еще не было.
+        """
+        key = key or 1
+        slots = self._slots
+        mask = len(slots) - 1
+        index = (key * 0x9E3779B97F4A7C15 & 0xFFFFFFFFFFFFFFFF) >> (64 - self._bits)
+        while True:
+            stored = slots[index]
+            if stored == 0:
+                break
+            if stored == key:
+                return False
+            index = (index + 1) & mask
+        slots[index] = key
+        self.count += 1
+        # Заполнение не больше 3/4
+        if self.count * 4 > len(slots) * 3:
+            self._grow()
+        return True
+
+    def _grow(self):
+        old = self._slots
+        self._bits += 1
+        self._slots = array('Q', bytes(8 << self._bits))
+        self.count = 0
+        for key in old:
+            if key:
+                self.add(key)
+
+    @property
+    def nbytes(self) -> int:
+        return self._slots.itemsize * len(self._slots)
+
+
+class StageStats:
+    """
+    Счетчики стадии: принято, отдано и время работы без ожидания очередей.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.items_in = 0
+        self.items_out = 0
+        self.busy = 0.0
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            'stage': self.name,
+            'in': self.items_in,
+            'out': self.items_out,
+            'busy_seconds': self.busy,
+            'per_second': self.items_out / self.busy if self.busy > 0 else 0.0,
+        }
+
+
+class SelfPlayPipeline:
+    """
+    Конвейер данных самоигры.
+    Arg:
+        games - число партий.
+        size, win_length - поле.
+        x, o - уровни игроков.
+        time_limit - время на ход для 'hard' и 'mcts'.
+        random_plies - число случайных ходов в начале партии.
+        workers - процессов для партий, по умолчанию по числу ядер.
+        shard_size - позиций в шарде.
+        queue_size - длина каждой очереди между стадиями.
+        compress - сжимать шарды (np.savez_compressed).
+        seed - базовое зерно.
+    """
+
+    def __init__(self, output_dir: str, games: int = 1000, size: int = 3,
+                 win_length: Optional[int] = None, x: str = 'hard', o: str = 'hard',
+                 time_limit: float = 0.1, random_plies: int = 2, workers: Optional[int] = None,
+                 shard_size: int = 65536, queue_size: int = 256, compress: bool = False,
+                 seed: int = 0):
+        if not 3 <= size <= Board.MAX_SIZE:
+            raise ValueError(f"Допустимый размер поля от 3 до {Board.MAX_SIZE}, ваше значение - {size}")
+        for difficulty in (x, o):
+            if difficulty not in AIPlayer.DIFFICULTIES:
+                raise ValueError(f"Неизвестный уровень сложности: {difficulty}")
+        if shard_size <= 0 or queue_size <= 0:
+            raise ValueError("Размер шарда и очереди должны быть положительными")
+        self.output_dir = output_dir
+        self.config = {
+            'games': games,
+            'size': size,
+            'win_length': win_length or size,
+            'x': x,
+            'o': o,
+            'time_limit': time_limit,
+            'random_plies': random_plies,
+            'workers': max(1, min(workers or os.cpu_count() or 1, games)),
+            'seed': seed,
+        }
+        self.shard_size = shard_size
+        self.queue_size = queue_size
+        self.compress = compress
+
+        self.stages = [StageStats(name) for name in ('games', 'positions', 'dedup', 'shards')]
+        self.shards: List[str] = []
+        # Канонические хеши записанных позиций
+        self._seen = SeenHashes()
+        self._errors: List[BaseException] = []
+
+        cells = size * size
+        self._inverse = np.array(get_inverse_transforms(size), dtype=np.intp)
+        self._buffers = {
+            'boards': np.zeros((shard_size, size, size), dtype=np.int8),
+            'side': np.zeros(shard_size, dtype=np.int8),
+            'outcome': np.zeros(shard_size, dtype=np.int8),
+            'value': np.zeros(shard_size, dtype=np.float32),
+        }
+        self._flat_boards = self._buffers['boards'].reshape(shard_size, cells)
+        self._filled = 0
+
+    def extract(self, record):
+        """
+        Позиции партии перед каждым ходом со всеми различными симметриями.
+        Return: список (канонический хеш, варианты (M, size*size), side, outcome, value).
+        """
+        moves, values, result = record
+        cells = np.zeros(self.config['size'] ** 2, dtype=np.int8)
+        positions = []
+        for ply, cell in enumerate(moves):
+            side = X_WINS if ply % 2 == 0 else O_WINS
+            outcome = 0 if result == DRAW else (1 if result == side else -1)
+            # Различные симметрии по возрастанию, первая - каноническая
+            rows = sorted({row.tobytes() for row in cells[self._inverse]})
+            variants = np.frombuffer(b''.join(rows), dtype=np.int8).reshape(len(rows), -1)
+            key = int.from_bytes(hashlib.blake2b(rows[0], digest_size=8).digest(), 'little')
+            positions.append((key, variants, side, outcome, values[ply]))
+            cells[cell] = side
+        return positions
+
+    def write(self, variants, side, outcome, value):
+        """
+        Добавляет варианты позиции в текущий шард, полный шард пишется на диск.
+        """
+        for variant in variants:
+            self._flat_boards[self._filled] = variant
+            self._buffers['side'][self._filled] = side
+            self._buffers['outcome'][self._filled] = outcome
+            self._buffers['value'][self._filled] = value
+            self._filled += 1
+            if self._filled == self.shard_size:
+                self.flush()
+
+    def flush(self):
+        """
+        Записывает заполненную часть шарда.
+        """
+        if not self._filled:
+            return
+        path = os.path.join(self.output_dir, f"shard_{len(self.shards):05d}.npz")
+        save = np.savez_compressed if self.compress else np.savez
+        save(path, **{name: buffer[:self._filled] for name, buffer in self._buffers.items()})
+        self.shards.append(os.path.basename(path))
+        self._filled = 0
+
+    def _stage(self, stats: StageStats, source: queue.Queue, target: Optional[queue.Queue], handle):
+        """
+        Поток стадии: берет элементы из source, handle возвращает список
+        элементов для target. В конце передает _DONE дальше.
+        """
+        try:
+            while True:
+                item = source.get()
+                if item is _DONE:
+                    break
+                start = time.perf_counter()
+                results = handle(item)
+                stats.busy += time.perf_counter() - start
+                stats.items_in += 1
+                stats.items_out += len(results)
+                if target is not None:
+                    for result in results:
+                        target.put(result)
+        except BaseException as error:
+            self._errors.append(error)
+            # Освобождаем предыдущую стадию, чтобы конвейер не завис
+            while source.get() is not _DONE:
+                pass
+        finally:
+            if target is not None:
+                target.put(_DONE)
+
+    def _dedup(self, position):
+        return [position] if self._seen.add(position[0]) else []
+
+    def _write(self, position):
+        _, variants, side, outcome, value = position
+        self.write(variants, side, outcome, value)
+        return variants
+
+    def run(self) -> Dict[str, Any]:
+        """
+        Запускает конвейер и ждет окончания.
+        Return: отчет (также записывается в manifest.json).
+        """
+        os.makedirs(self.output_dir, exist_ok=True)
+        config = self.config
+        context = multiprocessing.get_context()
+        games_queue = context.Queue(maxsize=self.queue_size)
+        records: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        positions: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        unique: queue.Queue = queue.Queue(maxsize=self.queue_size)
+
+        games_stats, positions_stats, dedup_stats, shards_stats = self.stages
+        threads = [
+            threading.Thread(target=self._stage, args=(positions_stats, records, positions,
+                                                       self.extract), daemon=True),
+            threading.Thread(target=self._stage, args=(dedup_stats, positions, unique,
+                                                       self._dedup), daemon=True),
+            threading.Thread(target=self._stage, args=(shards_stats, unique, None,
+                                                       self._write), daemon=True),
+        ]
+        workers = [context.Process(target=generation_worker, args=(worker_id, config, games_queue),
+                                   daemon=True)
+                   for worker_id in range(config['workers'])]
+
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for worker in workers:
+            worker.start()
+        try:
+            # Сообщения процессов пересылаются в стадию позиций
+            running = len(workers)
+            while running:
+                try:
+                    message = games_queue.get(timeout=1)
+                except queue.Empty:
+                    if any(worker.exitcode not in (None, 0) for worker in workers):
+                        raise RuntimeError("Процесс партий завершился с ошибкой")
+                    continue
+                if message[0] == 'done':
+                    running -= 1
+                    games_stats.items_out += message[1]
+                    games_stats.busy += message[2]
+                    continue
+                games_stats.items_in += 1
+                records.put(message)
+        finally:
+            records.put(_DONE)
+            for thread in threads:
+                thread.join()
+            for worker in workers:
+                worker.join(timeout=1)
+                if worker.is_alive():
+                    worker.terminate()
+        if self._errors:
+            raise self._errors[0]
+        self.flush()
+        elapsed = time.perf_counter() - start
+
+        report = {
+            'config': config,
+            'shard_size': self.shard_size,
+            'shards': self.shards,
+            'positions_written': shards_stats.items_out,
+            'unique_positions': dedup_stats.items_out,
+            'duplicates': dedup_stats.items_in - dedup_stats.items_out,
+            'dedup_bytes': self._seen.nbytes,
+            'elapsed_seconds': elapsed,
+            'stages': [stats.snapshot() for stats in self.stages],
+        }
+        with open(os.path.join(self.output_dir, 'manifest.json'), 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        return report
+
+
+def print_report(report: Dict[str, Any]):
+    """
+    Выводит производительность стадий и итог.
+    """
+    print(f"{'стадия':>10} {'принято':>10} {'отдано':>10} {'работа, с':>10} {'в секунду':>12}")
+    for stage in report['stages']:
+        print(f"{stage['stage']:>10} {stage['in']:>10,} {stage['out']:>10,} "
+              f"{stage['busy_seconds']:>10.2f} {stage['per_second']:>12,.0f}")
+    print(f"Уникальных позиций: {report['unique_positions']:,}, повторов: {report['duplicates']:,}")
+    print(f"Записано позиций с симметриями: {report['positions_written']:,} "
+          f"в {len(report['shards'])} шардов за {report['elapsed_seconds']:.1f} с")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Данные самоигры для обучения оценщика")
+    parser.add_argument('--output-dir', required=True, help="каталог для шардов")
+    parser.add_argument('--games', type=int, default=1000)
+    parser.add_argument('--size', type=int, default=3)
+    parser.add_argument('--win-length', type=int)
+    parser.add_argument('--x', default='hard', choices=AIPlayer.DIFFICULTIES)
+    parser.add_argument('--o', default='hard', choices=AIPlayer.DIFFICULTIES)
+    parser.add_argument('--time-limit', type=float, default=0.1, help="время на ход, с")
+    parser.add_argument('--random-plies', type=int, default=2, help="случайных ходов в начале")
+    parser.add_argument('--workers', type=int)
+    parser.add_argument('--shard-size', type=int, default=65536)
+    parser.add_argument('--queue-size', type=int, default=256)
+    parser.add_argument('--compress', action='store_true')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    pipeline = SelfPlayPipeline(args.output_dir, args.games, args.size, args.win_length,
+                                args.x, args.o, args.time_limit, args.random_plies, args.workers,
+                                args.shard_size, args.queue_size, args.compress, args.seed)
+    print_report(pipeline.run())
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,9 @@
+"""
+Пакет server - асинхронный сервер игровых сессий.
+"""
+
+from .players import AsyncPlayer, AsyncAIPlayer, RemotePlayer
+from .session import GameSession
+from .server import GameServer
+
+__all__ = ['AsyncPlayer', 'AsyncAIPlayer', 'RemotePlayer', 'GameSession', 'GameServer']
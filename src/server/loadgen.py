@@ -0,0 +1,142 @@
+"""
+Генератор нагрузки для сервера сессий.
+Открывает заданное число одновременных партий со случайными
+ходами и измеряет задержку ответа на ход (p50/p99).
+
+Запуск: python -m src.server.loadgen --sessions 1000 5000 10000
+Без --port поднимает сервер в этом же процессе.
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+import time
+from typing import Dict, Any, List, Optional
+
+from ..board import Board
+from ..players import AIPlayer
+from .server import GameServer
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """
+    Перцентиль по отсортированному списку.
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(fraction * len(ordered)))
+    return ordered[index]
+
+
+async def play_client(host: str, port: int, size: int, difficulty: str, rng: random.Random,
+                      latencies: List[float], connect_limiter: asyncio.Semaphore) -> str:
+    """
+    Играет одну партию случайными ходами за X.
+    Return: итог партии или причина ошибки.
+    """
+    async with connect_limiter:
+        reader, writer = await asyncio.open_connection(host, port)
+    try:
+        writer.write(f'NEW {size} {size} {difficulty} X\n'.encode())
+        await writer.drain()
+        line = (await reader.readline()).decode().split()
+        if not line or line[0] != 'START':
+            return ' '.join(line) or 'CLOSED'
+
+        # Клиент ведет свою копию поля, чтобы не ходить после конца партии
+        board = Board(size, verbose=False)
+        free = [(row, col) for row in range(size) for col in range(size)]
+        while True:
+            move = free.pop(rng.randrange(len(free)))
+            board.push(*move)
+            start = time.perf_counter()
+            writer.write(f'MOVE {move[0]} {move[1]}\n'.encode())
+            await writer.drain()
+            reply = (await reader.readline()).decode().split()
+            latencies.append(time.perf_counter() - start)
+
+            if reply and reply[0] == 'MOVE':
+                ai_move = (int(reply[1]), int(reply[2]))
+                free.remove(ai_move)
+                if board.push(*ai_move) or not free:
+                    reply = (await reader.readline()).decode().split()
+            if not reply:
+                return 'CLOSED'
+            if reply[0] == 'END':
+                return reply[1]
+            if reply[0] == 'ERROR':
+                return 'ERROR'
+    finally:
+        writer.close()
+
+
+async def run_level(host: str, port: int, sessions: int, size: int, difficulty: str,
+                    seed: int, max_connects: int) -> Dict[str, Any]:
+    """
+    Запускает sessions одновременных партий.
+    """
+    rng = random.Random(seed)
+    latencies: List[float] = []
+    limiter = asyncio.Semaphore(max_connects)
+    start = time.perf_counter()
+    outcomes = await asyncio.gather(
+        *(play_client(host, port, size, difficulty, random.Random(rng.getrandbits(32)),
+                      latencies, limiter) for _ in range(sessions)),
+        return_exceptions=True)
+    elapsed = time.perf_counter() - start
+
+    results: Dict[str, int] = {}
+    for outcome in outcomes:
+        key = type(outcome).__name__ if isinstance(outcome, BaseException) else outcome
+        results[key] = results.get(key, 0) + 1
+    return {
+        'sessions': sessions,
+        'moves': len(latencies),
+        'elapsed': elapsed,
+        'moves_per_sec': len(latencies) / elapsed if elapsed > 0 else 0.0,
+        'p50_ms': percentile(latencies, 0.50) * 1000,
+        'p99_ms': percentile(latencies, 0.99) * 1000,
+        'results': results,
+    }
+
+
+async def _main(args):
+    server: Optional[GameServer] = None
+    host, port = args.host, args.port
+    if port is None:
+        server = GameServer(host, 0, max_sessions=max(args.sessions), workers=args.workers)
+        await server.start()
+        port = server.port
+        asyncio.ensure_future(server.serve_forever())
+
+    try:
+        for sessions in args.sessions:
+            stats = await run_level(host, port, sessions, args.size, args.difficulty,
+                                    args.seed, args.max_connects)
+            print(f"{stats['sessions']:>6} сессий: {stats['moves']} ходов за {stats['elapsed']:.1f} с, "
+                  f"p50 {stats['p50_ms']:.1f} мс, p99 {stats['p99_ms']:.1f} мс, "
+                  f"итоги {stats['results']}")
+    finally:
+        if server is not None:
+            await server.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Нагрузочный клиент сервера сессий")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, help="порт сервера; без него сервер запускается здесь")
+    parser.add_argument('--sessions', type=int, nargs='+', default=[1000, 5000, 10000])
+    parser.add_argument('--size', type=int, default=3)
+    parser.add_argument('--difficulty', default='easy', choices=AIPlayer.DIFFICULTIES)
+    parser.add_argument('--workers', type=int)
+    parser.add_argument('--max-connects', type=int, default=500,
+                        help="одновременных попыток подключения")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+    asyncio.run(_main(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
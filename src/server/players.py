@@ -0,0 +1,106 @@
+"""
+Асинхронные игроки для сервера.
+Ход запрашивается через await, поэтому ожидание хода
+одного игрока не блокирует другие сессии.
+"""
+
+import asyncio
+from abc import abstractmethod
+from concurrent.futures import Executor
+from typing import Dict, List, Optional, Tuple
+
+from ..board import Board
+from ..players import Player, AIPlayer
+
+# Компьютерные игроки рабочего процесса:
+# (difficulty, symbol, time_limit, size, win_length) -> AIPlayer.
+# Поле входит в ключ: у каждого игрока своя таблица транспозиций
+_worker_players: Dict[Tuple[str, str, float, int, int], AIPlayer] = {}
+
+
+def compute_ai_move(difficulty: str, symbol: str, size: int, win_length: int,
+                    moves: List[Tuple[int, int]], time_limit: float) -> Tuple[int, int]:
+    """
+    Считает ход компьютера в рабочем процессе.
+    Позиция передается списком ходов и восстанавливается через push.
+    """
+    key = (difficulty, symbol, time_limit, size, win_length)
+    player = _worker_players.get(key)
+    if player is None:
+        player = AIPlayer(symbol, difficulty=difficulty, time_limit=time_limit, think_time=0)
+        _worker_players[key] = player
+
+    board = Board(size, win_length, verbose=False)
+    for row, col in moves:
+        board.push(row, col)
+    return player.get_move(board)
+
+
+class AsyncPlayer(Player):
+    """
+    Абстрактный асинхронный игрок.
+    Статистика та же, что у Player, но ход запрашивается через await.
+    """
+    __slots__ = ()
+
+    @abstractmethod
+    async def get_move(self, board: Board) -> Tuple[int, int]:
+        """
+        Получает ход от игрока.
+        """
+
+
+class RemotePlayer(AsyncPlayer):
+    """
+    Игрок по сети. Ходы кладет в очередь обработчик соединения.
+    waiting - сессия ждет ход этого игрока: ход, присланный в другое время,
+    обработчик отклоняет, а не оставляет в очереди до следующего хода.
+    """
+    __slots__ = ('moves', 'waiting')
+
+    def __init__(self, symbol: str, name: Optional[str] = None):
+        super().__init__(symbol, name)
+        # Одного хода в очереди достаточно: следующий ход клиент шлет после ответа
+        self.moves: asyncio.Queue = asyncio.Queue(maxsize=1)
+        self.waiting = False
+
+    async def get_move(self, board: Board) -> Tuple[int, int]:
+        """
+        Ждет ход от клиента.
+        """
+        self.waiting = True
+        try:
+            return await self.moves.get()
+        finally:
+            self.waiting = False
+
+
+class AsyncAIPlayer(AsyncPlayer):
+    """
+    Компьютер, который считает ход в пуле рабочих процессов.
+    Arg:
+        executor - пул для расчета ходов.
+        limiter - семафор, ограничивающий число задач в пуле.
+    """
+    __slots__ = ('executor', 'difficulty', 'time_limit', 'limiter')
+
+    def __init__(self, symbol: str, executor: Executor, difficulty: str = 'easy',
+                 time_limit: float = 0.2, limiter: Optional[asyncio.Semaphore] = None,
+                 name: Optional[str] = None):
+        super().__init__(symbol, name or f"AI - {difficulty}")
+        self.executor = executor
+        self.difficulty = difficulty
+        self.time_limit = time_limit
+        self.limiter = limiter
+
+    async def get_move(self, board: Board) -> Tuple[int, int]:
+        """
+        Отправляет позицию в пул и ждет ход.
+        """
+        loop = asyncio.get_running_loop()
+        args = (self.difficulty, self.symbol, board.size, board.win_length,
+                list(board.moves), self.time_limit)
+        if self.limiter is None:
+            return await loop.run_in_executor(self.executor, compute_ai_move, *args)
+        async with self.limiter:
+            return await loop.run_in_executor(self.executor, compute_ai_move, *args)
@@ -0,0 +1,266 @@
+"""
+Асинхронный сервер игровых сессий по TCP.
+
+Строковый протокол (UTF-8, одна команда на строку):
+    клиент -> сервер:
+        NEW <size> [<win_length>] [<difficulty>] [X|O] - новая партия против компьютера
+        MOVE <row> <col> - ход клиента
+        QUIT - завершить сессию
+    сервер -> клиент:
+        START <session_id> <size> <win_length> <symbol> - партия начата
+        MOVE <row> <col> <symbol> - ход компьютера
+        ERROR <причина> - команда отклонена
+        END <X|O|DRAW|TIMEOUT> - партия окончена
+        BUSY - сервер перегружен, соединение закрывается
+
+Запуск: python -m src.server.server --port 8765
+"""
+
+import argparse
+import asyncio
+import itertools
+import sys
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Dict, Any, Optional
+
+from ..players import AIPlayer
+from .players import AsyncAIPlayer, RemotePlayer
+from .session import GameSession, TIMEOUT
+
+
+class GameServer:
+    """
+    Сервер, который ведет много партий в одном цикле событий.
+    Ходы компьютера считаются в пуле процессов.
+    Arg:
+        max_sessions - максимум одновременных партий, сверх него - BUSY.
+        move_timeout - время на ход клиента и компьютера.
+        idle_timeout - время на первую команду после подключения.
+        workers - процессы для ходов компьютера.
+        max_pending_ai - максимум ходов компьютера в очереди пула.
+        ai_time_limit - время поиска для уровней 'hard' и 'mcts'.
+        executor - готовый пул вместо создания своего.
+    """
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 8765, max_sessions: int = 10_000,
+                 move_timeout: float = 60.0, idle_timeout: float = 30.0,
+                 workers: Optional[int] = None, max_pending_ai: int = 256,
+                 ai_time_limit: float = 0.2, executor: Optional[Executor] = None):
+        """
+        Настраивает сервер. Сокет открывается в start().
+        """
+        self.host = host
+        self.port = port
+        self.max_sessions = max_sessions
+        self.move_timeout = move_timeout
+        self.idle_timeout = idle_timeout
+        self.workers = workers
+        self.max_pending_ai = max_pending_ai
+        self.ai_time_limit = ai_time_limit
+
+        self._executor = executor
+        self._own_executor = executor is None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._ai_limiter: Optional[asyncio.Semaphore] = None
+        self._session_ids = itertools.count(1)
+
+        self.active_sessions = 0
+        self.total_sessions = 0
+        self.rejected_sessions = 0
+        self.results: Dict[str, int] = {}
+
+    async def start(self):
+        """
+        Открывает сокет и пул процессов.
+        """
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        self._ai_limiter = asyncio.Semaphore(self.max_pending_ai)
+        self._server = await asyncio.start_server(
+            self._handle_client, self.host, self.port, backlog=min(self.max_sessions, 4096))
+        # Порт 0 - выбранный системой порт
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self):
+        """
+        Запускает сервер и обслуживает клиентов до остановки.
+        """
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self):
+        """
+        Останавливает прием соединений и пул процессов.
+        """
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        if self._own_executor and self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _send(self, writer: asyncio.StreamWriter, line: str):
+        """
+        Отправляет строку и ждет, пока клиент ее заберет.
+        drain() не дает буферу расти у медленных клиентов.
+        """
+        writer.write(line.encode() + b'\n')
+        await writer.drain()
+
+    def _parse_new(self, parts):
+        """
+        Разбирает команду NEW.
+        Return: (size, win_length, difficulty, symbol).
+        """
+        size = int(parts[1]) if len(parts) > 1 else 3
+        win_length = int(parts[2]) if len(parts) > 2 else None
+        difficulty = parts[3] if len(parts) > 3 else 'easy'
+        symbol = parts[4].upper() if len(parts) > 4 else 'X'
+        if difficulty not in AIPlayer.DIFFICULTIES:
+            raise ValueError(f"unknown difficulty {difficulty}")
+        if symbol not in ('X', 'O'):
+            raise ValueError(f"unknown symbol {symbol}")
+        return size, win_length, difficulty, symbol
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """
+        Обслуживает одно соединение: одна партия на соединение.
+        """
+        if self.active_sessions >= self.max_sessions:
+            self.rejected_sessions += 1
+            try:
+                await self._send(writer, 'BUSY')
+            finally:
+                writer.close()
+            return
+
+        self.active_sessions += 1
+        try:
+            await self._run_session(reader, writer)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self.active_sessions -= 1
+            writer.close()
+
+    async def _run_session(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """
+        Ждет команду NEW и ведет партию.
+        """
+        try:
+            line = await asyncio.wait_for(reader.readline(), self.idle_timeout)
+        except asyncio.TimeoutError:
+            await self._send(writer, f'END {TIMEOUT}')
+            return
+
+        parts = line.decode(errors='replace').split()
+        if not parts or parts[0].upper() != 'NEW':
+            await self._send(writer, 'ERROR expected NEW')
+            return
+        try:
+            size, win_length, difficulty, symbol = self._parse_new(parts)
+            ai_symbol = 'O' if symbol == 'X' else 'X'
+            remote = RemotePlayer(symbol, name='client')
+            ai = AsyncAIPlayer(ai_symbol, self._executor, difficulty, self.ai_time_limit,
+                               self._ai_limiter)
+            players = {symbol: remote, ai_symbol: ai}
+
+            async def on_event(event, mover, row, col):
+                if event == 'move' and mover == ai_symbol:
+                    await self._send(writer, f'MOVE {row} {col} {mover}')
+                elif event == 'rejected' and mover == symbol:
+                    await self._send(writer, 'ERROR illegal move')
+
+            session_id = next(self._session_ids)
+            session = GameSession(session_id, players['X'], players['O'], size, win_length,
+                                  self.move_timeout, on_event)
+        except (ValueError, TypeError) as e:
+            await self._send(writer, f'ERROR {e}')
+            return
+
+        self.total_sessions += 1
+        await self._send(writer, f'START {session_id} {size} {session.board.win_length} {symbol}')
+
+        play_task = asyncio.ensure_future(session.play())
+        read_task = asyncio.ensure_future(self._read_moves(reader, writer, remote))
+        try:
+            done, _ = await asyncio.wait({play_task, read_task}, return_when=asyncio.FIRST_COMPLETED)
+            if play_task in done:
+                result = play_task.result()
+                self.results[result] = self.results.get(result, 0) + 1
+                await self._send(writer, f'END {result}')
+        finally:
+            for task in (play_task, read_task):
+                task.cancel()
+
+    async def _read_moves(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+                          remote: RemotePlayer):
+        """
+        Читает ходы клиента и передает их игроку.
+        Завершается при QUIT или закрытии соединения.
+        """
+        while True:
+            line = await reader.readline()
+            if not line:
+                return
+            parts = line.decode(errors='replace').split()
+            if not parts:
+                continue
+            command = parts[0].upper()
+            if command == 'QUIT':
+                return
+            if command != 'MOVE' or len(parts) != 3:
+                await self._send(writer, 'ERROR expected MOVE <row> <col>')
+                continue
+            try:
+                move = (int(parts[1]), int(parts[2]))
+            except ValueError:
+                await self._send(writer, 'ERROR coordinates must be integers')
+                continue
+            # Ход во время хода компьютера иначе засчитался бы следующим ходом клиента
+            if not remote.waiting or remote.moves.full():
+                await self._send(writer, 'ERROR not your turn')
+                continue
+            remote.moves.put_nowait(move)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Возвращает статистику сервера
+        """
+        return {
+            'active_sessions': self.active_sessions,
+            'total_sessions': self.total_sessions,
+            'rejected_sessions': self.rejected_sessions,
+            'results': dict(self.results),
+        }
+
+
+async def _serve(args):
+    server = GameServer(args.host, args.port, args.max_sessions, args.move_timeout,
+                        workers=args.workers, ai_time_limit=args.ai_time_limit)
+    await server.start()
+    print(f"Сервер запущен на {server.host}:{server.port}")
+    try:
+        await server.serve_forever()
+    finally:
+        await server.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Сервер игровых сессий")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--max-sessions', type=int, default=10_000)
+    parser.add_argument('--move-timeout', type=float, default=60.0)
+    parser.add_argument('--workers', type=int)
+    parser.add_argument('--ai-time-limit', type=float, default=0.2)
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(_serve(args))
+    except KeyboardInterrupt:
+        print("\nСервер остановлен")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
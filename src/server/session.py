@@ -0,0 +1,92 @@
+"""
+Игровая сессия: одна партия между двумя асинхронными игроками.
+"""
+
+import asyncio
+import time
+from typing import Awaitable, Callable, List, Optional
+
+from ..board import Board
+from .players import AsyncPlayer
+
+# Результаты сессии помимо победившего символа
+DRAW = 'DRAW'
+TIMEOUT = 'TIMEOUT'
+
+
+class GameSession:
+    """
+    Ведет партию: запрашивает ходы, проверяет их и определяет итог.
+    Arg:
+        session_id - номер сессии.
+        player_x, player_o - игроки. Первым ходит X.
+        move_timeout - время на ход в секундах.
+        listener - корутина listener(event, symbol, row, col),
+            event - 'move' или 'rejected'.
+    """
+
+    def __init__(self, session_id: int, player_x: AsyncPlayer, player_o: AsyncPlayer,
+                 size: int = 3, win_length: Optional[int] = None, move_timeout: float = 60.0,
+                 listener: Optional[Callable[..., Awaitable[None]]] = None):
+        """
+        Создает сессию с пустым полем.
+        """
+        if player_x.symbol != 'X' or player_o.symbol != 'O':
+            raise ValueError("Первый игрок должен играть X, второй - O")
+        self.session_id = session_id
+        self.board = Board(size, win_length, verbose=False)
+        self.players = {'X': player_x, 'O': player_o}
+        self.move_timeout = move_timeout
+        self.listener = listener
+        self.result: Optional[str] = None
+        self.move_times: List[float] = []
+
+    def is_legal(self, row, col) -> bool:
+        """
+        Проверяет ход без вывода в консоль.
+        """
+        return (isinstance(row, int) and isinstance(col, int)
+                and self.board.get_cell(row, col) == ' ' and self.board.winner is None)
+
+    async def _notify(self, event: str, symbol: str, row: int, col: int):
+        """
+        Сообщает слушателю о событии.
+        """
+        if self.listener is not None:
+            await self.listener(event, symbol, row, col)
+
+    async def play(self) -> str:
+        """
+        Играет партию до конца.
+        Return: 'X', 'O', 'DRAW' или 'TIMEOUT'.
+        """
+        board = self.board
+        cells = board.size * board.size
+        while True:
+            symbol = 'O' if board.last_symbol == 'X' else 'X'
+            player = self.players[symbol]
+            start = time.perf_counter()
+            try:
+                row, col = await asyncio.wait_for(player.get_move(board), self.move_timeout)
+            except asyncio.TimeoutError:
+                self.result = TIMEOUT
+                return self.result
+
+            if not self.is_legal(row, col):
+                await self._notify('rejected', symbol, row, col)
+                continue
+
+            self.move_times.append(time.perf_counter() - start)
+            is_winning = board.push(row, col)
+            await self._notify('move', symbol, row, col)
+
+            if is_winning:
+                self.result = symbol
+                player.record_win()
+                self.players['O' if symbol == 'X' else 'X'].record_loss()
+                return self.result
+            if board.move_count == cells:
+                self.result = DRAW
+                for other in self.players.values():
+                    other.record_draw()
+                return self.result
@@ -0,0 +1,206 @@
+"""
+Пакетная симуляция партий компьютер против компьютера.
+Без вывода в консоль и пауз.
+
+Запуск: python -m src.simulation --games 100000
+"""
+
+import argparse
+import random
+import sys
+import time
+from typing import Dict, Any, List, Optional
+
+from .board import Board
+from .lines import get_win_masks, get_cell_masks
+
+# До какого числа клеток победы проверяются по готовой таблице (2^16 байт)
+WIN_TABLE_MAX_CELLS = 16
+
+
+def _build_win_table(size: int, win_length: int) -> bytearray:
+    """
+    Для каждой маски камней - есть ли на ней выигрышная линия.
+    """
+    masks = get_win_masks(size, win_length)
+    table = bytearray(1 << (size * size))
+    for mask in masks:
+        # Все надмножества маски тоже выигрышные
+        free = ((1 << (size * size)) - 1) & ~mask
+        subset = free
+        while True:
+            table[mask | subset] = 1
+            if subset == 0:
+                break
+            subset = (subset - 1) & free
+    return table
+
+
+def _simulate_random(games: int, size: int, win_length: int, rng: random.Random) -> List[int]:
+    """
+    Случайные партии на битовых масках.
+    Случайная игра - это случайная перестановка клеток, обрезанная
+    в момент победы, поэтому на партию нужен один shuffle.
+    Итог совпадает с Game, но ничья доигрывается до заполнения поля,
+    поэтому длина ничьих здесь - все клетки поля.
+    Return: коды исходов: длина * 3 + результат,
+    где результат 0 - ничья, 1 - победа X, 2 - победа O.
+    """
+    cells = size * size
+    bits = [1 << index for index in range(cells)]
+    shuffle = rng.shuffle
+    outcomes = []
+    append = outcomes.append
+
+    if cells <= WIN_TABLE_MAX_CELLS:
+        win = _build_win_table(size, win_length)
+        for _ in range(games):
+            shuffle(bits)
+            x = o = 0
+            for number, bit in enumerate(bits):
+                if number & 1:
+                    o |= bit
+                    if win[o]:
+                        append((number + 1) * 3 + 2)
+                        break
+                else:
+                    x |= bit
+                    if win[x]:
+                        append((number + 1) * 3 + 1)
+                        break
+            else:
+                append(cells * 3)
+        return outcomes
+
+    cell_masks = get_cell_masks(size, win_length)
+    order = list(range(cells))
+    for _ in range(games):
+        shuffle(order)
+        stones = [0, 0]
+        for number, index in enumerate(order):
+            side = number & 1
+            own = stones[side] | bits[index]
+            stones[side] = own
+            if any(own & mask == mask for mask in cell_masks[index]):
+                append((number + 1) * 3 + 1 + side)
+                break
+        else:
+            append(cells * 3)
+    return outcomes
+
+
+def _simulate_players(games: int, board: Board, players: Dict[str, Any]) -> List[int]:
+    """
+    Партии между компьютерными игроками на одном поле через push/pop.
+    Ничья - как в Game: как только ни одну линию уже не собрать.
+    Raises:
+        ValueError: если игрок вернул недопустимый ход.
+    """
+    outcomes = []
+    for _ in range(games):
+        board.reset()
+        while True:
+            symbol = 'O' if board.last_symbol == 'X' else 'X'
+            row, col = players[symbol].get_move(board)
+            # push не проверяет ход: занятая клетка испортила бы поле
+            if board.get_cell(row, col) != ' ':
+                raise ValueError(f"Игрок {symbol} сделал недопустимый ход ({row}, {col})")
+            if board.push(row, col):
+                outcomes.append(board.move_count * 3 + (1 if symbol == 'X' else 2))
+                break
+            if board.is_draw():
+                outcomes.append(board.move_count * 3)
+                break
+    return outcomes
+
+
+def summarize(outcomes: List[int], elapsed: float) -> Dict[str, Any]:
+    """
+    Собирает статистику по кодам исходов.
+    """
+    games = len(outcomes)
+    results = [0, 0, 0]
+    lengths: Dict[int, int] = {}
+    for code in outcomes:
+        length, result = divmod(code, 3)
+        results[result] += 1
+        lengths[length] = lengths.get(length, 0) + 1
+
+    total_moves = sum(length * count for length, count in lengths.items())
+    return {
+        'games': games,
+        'x_wins': results[1],
+        'o_wins': results[2],
+        'draws': results[0],
+        'x_win_rate': results[1] / games * 100 if games else 0.0,
+        'o_win_rate': results[2] / games * 100 if games else 0.0,
+        'draw_rate': results[0] / games * 100 if games else 0.0,
+        'avg_length': total_moves / games if games else 0.0,
+        'min_length': min(lengths) if lengths else 0,
+        'max_length': max(lengths) if lengths else 0,
+        'length_histogram': dict(sorted(lengths.items())),
+        'elapsed': elapsed,
+        'games_per_sec': games / elapsed if elapsed > 0 else 0.0,
+    }
+
+
+def run_simulation(games: int, size: int = 3, win_length: Optional[int] = None,
+                   x_difficulty: str = 'easy', o_difficulty: str = 'easy',
+                   seed: Optional[int] = None, time_limit: float = 0.05) -> Dict[str, Any]:
+    """
+    Играет games партий без вывода и пауз. Первым ходит X.
+    time_limit - время на ход для уровня 'hard'.
+    Return: статистика побед, ничьих и длины партий.
+    """
+    from .players import AIPlayer
+
+    if games < 0:
+        raise ValueError(f"Число партий не может быть отрицательным: {games}")
+
+    board = Board(size, win_length, verbose=False)
+    rng = random.Random(seed)
+
+    start = time.perf_counter()
+    if x_difficulty == 'easy' and o_difficulty == 'easy':
+        outcomes = _simulate_random(games, size, board.win_length, rng)
+    else:
+        players = {
+            symbol: AIPlayer(symbol, difficulty=difficulty, think_time=0, use_cache=False,
+                             time_limit=time_limit, seed=rng.getrandbits(32))
+            for symbol, difficulty in (('X', x_difficulty), ('O', o_difficulty))
+        }
+        outcomes = _simulate_players(games, board, players)
+    elapsed = time.perf_counter() - start
+
+    stats = summarize(outcomes, elapsed)
+    stats.update({
+        'size': size,
+        'win_length': board.win_length,
+        'x_difficulty': x_difficulty,
+        'o_difficulty': o_difficulty,
+    })
+    return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Симуляция партий компьютер против компьютера")
+    parser.add_argument('--games', type=int, default=100_000, help="число партий")
+    parser.add_argument('--size', type=int, default=3, help="размер поля")
+    parser.add_argument('--win-length', type=int, help="длина линии для победы")
+    parser.add_argument('--x', default='easy', help="уровень игрока X")
+    parser.add_argument('--o', default='easy', help="уровень игрока O")
+    parser.add_argument('--seed', type=int, help="зерно генератора")
+    parser.add_argument('--time-limit', type=float, default=0.05, help="время на ход для 'hard', с")
+    args = parser.parse_args(argv)
+
+    stats = run_simulation(args.games, args.size, args.win_length, args.x, args.o, args.seed,
+                           args.time_limit)
+    print(f"Партий: {stats['games']} ({stats['games_per_sec']:,.0f} в секунду)")
+    print(f"Победы X: {stats['x_wins']} ({stats['x_win_rate']:.1f}%)")
+    print(f"Победы O: {stats['o_wins']} ({stats['o_win_rate']:.1f}%)")
+    print(f"Ничьи: {stats['draws']} ({stats['draw_rate']:.1f}%)")
+    print(f"Средняя длина партии: {stats['avg_length']:.2f} ходов")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,406 @@
+"""
+Разреженное игровое поле для больших досок (15х15, 19х19) и поля без границ.
+Хранит только занятые клетки, поэтому память и стоимость хода
+зависят от числа камней, а не от площади поля.
+"""
+
+from typing import Dict, List, Optional, Tuple
+from .board import Board
+from .events import (default_sink, MOVE_MADE, MOVE_UNDONE, OUT_OF_BOUNDS, OCCUPIED,
+                     FINISHED, WRONG_TURN, INVALID, NOTHING_TO_UNDO, ERROR)
+from .lines import DIRECTIONS
+from .zobrist import get_sparse_key
+
+Cell = Tuple[int, int]
+
+
+class SparseThreats:
+    """
+    Проверки угроз для разреженного поля с интерфейсом ThreatMap.
+    Не хранит счетчики по всем клеткам, а просматривает линии
+    через клетку: O(win_length^2) на клетку независимо от размера поля.
+    """
+
+    def __init__(self, board: 'SparseBoard'):
+        self.board = board
+
+    def _windows(self, row: int, col: int, symbol: str):
+        """
+        Для каждого отрезка длины win_length через клетку - число камней symbol
+        или None, если на отрезке есть камни соперника или он выходит за поле.
+        """
+        board = self.board
+        win_length = board.win_length
+        for dr, dc in DIRECTIONS:
+            for shift in range(win_length):
+                count = 0
+                for i in range(-shift, win_length - shift):
+                    r, c = row + dr * i, col + dc * i
+                    if not board.in_bounds(r, c):
+                        count = None
+                        break
+                    cell = board.stones.get((r, c))
+                    if cell is None:
+                        continue
+                    if cell != symbol:
+                        count = None
+                        break
+                    count += 1
+                yield count
+
+    def open_lines(self, row: int, col: int, symbol: str, stones: int) -> int:
+        """
+        Число открытых для symbol линий через клетку с stones камнями symbol.
+        """
+        return sum(1 for count in self._windows(row, col, symbol) if count == stones)
+
+    def is_win(self, row: int, col: int, symbol: str) -> bool:
+        """
+        Ход symbol в пустую клетку сразу выигрывает.
+        """
+        board = self.board
+        for dr, dc in DIRECTIONS:
+            run = (board.count_in_direction(row, col, dr, dc, symbol)
+                   + board.count_in_direction(row, col, -dr, -dc, symbol))
+            if run + 1 >= board.win_length:
+                return True
+        return False
+
+    def is_fork(self, row: int, col: int, symbol: str) -> bool:
+        """
+        Ход symbol в пустую клетку создает две угрозы победы сразу.
+        """
+        return self.open_lines(row, col, symbol, self.board.win_length - 2) >= 2
+
+
+class SparseBoard:
+    """
+    Игровое поле на словаре занятых клеток.
+    Повторяет интерфейс Board: make_move, place, push, pop, get_cell,
+    is_full, is_draw, get_available_moves, random_move, get_threat_map, get_state.
+    Arg:
+        size - размер поля, None - поле без границ
+            (компьютер на нем играет только на уровнях 'easy' и 'medium').
+        win_length - длина линии для победы. По умолчанию size, для поля без границ 5.
+        candidate_radius - ходы предлагаются не дальше этого расстояния от камней.
+    """
+    MAX_SIZE = None
+    # Длина линии для поля без границ по умолчанию (гомоку)
+    DEFAULT_WIN_LENGTH = 5
+
+    def __init__(self, size: Optional[int] = 15, win_length: Optional[int] = None,
+                 verbose: bool = True, candidate_radius: int = 1, events=None):
+        """
+        Создает игровое поле.
+        events - приемник событий (src.events). По умолчанию по verbose.
+        Raises:
+            TypeError: Если size не целое число.
+            ValueError: Если size или win_length вне допустимого диапазона.
+        """
+        if size is not None:
+            if not isinstance(size, int):
+                raise TypeError(f"Размер поля должен быть целым числом, а не {type(size).__name__}")
+            if size < 3:
+                raise ValueError(f"Размер поля должен быть не меньше 3, ваше значение - {size}")
+        if win_length is not None:
+            if not isinstance(win_length, int):
+                raise TypeError(f"Длина для победы должна быть целым числом")
+            if win_length < 3 or (size is not None and win_length > size):
+                raise ValueError(f"Длина для победы должна быть от 3 до {size}")
+
+        self.size = size
+        self.win_length = win_length or size or self.DEFAULT_WIN_LENGTH
+        self.verbose = verbose
+        self.events = events or default_sink(verbose, buffer_lines=1)
+        self.candidate_radius = candidate_radius
+
+        # Занятые клетки и число камней рядом с каждой клеткой
+        self.stones: Dict[Cell, str] = {}
+        self.neighbors: Dict[Cell, int] = {}
+
+        self.hash = 0
+        self.moves = []
+        self._saved_states = []
+        self.threat_map = None
+
+        # Состояние игры
+        self.winner = None
+        self.winning_cells = []
+        self.last_symbol = None
+        self.move_count = 0
+
+    normalize_symbol = Board.normalize_symbol
+    _reject = Board._reject
+
+    def in_bounds(self, row: int, col: int) -> bool:
+        """
+        Клетка лежит на поле. У поля без границ - всегда.
+        """
+        return self.size is None or (0 <= row < self.size and 0 <= col < self.size)
+
+    @property
+    def grid(self) -> List[List[str]]:
+        """
+        Поле в виде списка строк, как Board.grid. Только для поля с границами.
+        """
+        if self.size is None:
+            raise ValueError("У поля без границ нет сетки")
+        return [[self.stones.get((row, col), ' ') for col in range(self.size)]
+                for row in range(self.size)]
+
+    def _bounds(self):
+        """
+        Отображаемая область: все поле или камни с запасом в одну клетку.
+        """
+        if self.size is not None:
+            return 0, self.size - 1, 0, self.size - 1
+        if not self.stones:
+            return 0, 0, 0, 0
+        rows = [row for row, _ in self.stones]
+        cols = [col for _, col in self.stones]
+        return min(rows) - 1, max(rows) + 1, min(cols) - 1, max(cols) + 1
+
+    def render(self):
+        """
+        Return: видимая область поля в виде текста.
+        """
+        top, bottom, left, right = self._bounds()
+        width = max(len(str(left)), len(str(right)))
+        lines = [' ' * 4 + ' '.join(str(col).rjust(width) for col in range(left, right + 1))]
+        for row in range(top, bottom + 1):
+            cells = ' '.join(self.stones.get((row, col), '.').rjust(width)
+                             for col in range(left, right + 1))
+            lines.append(f"{row:>3} {cells}")
+
+        if self.winner:
+            lines.append(f"Победил - {self.winner}")
+            lines.append(f"Выигрышная комбинация - {self.winning_cells}")
+        elif self.is_full():
+            lines.append("Ничья!")
+        return '\n'.join(lines)
+
+    display = Board.display
+
+    def make_move(self, row, col, symbol):
+        """
+        Выполняет ход на поле
+        """
+        try:
+            symbol = self.normalize_symbol(symbol)
+
+            if not self.in_bounds(row, col):
+                self._reject(OUT_OF_BOUNDS, row, col, symbol, size=self.size)
+                return False, False
+
+            if (row, col) in self.stones:
+                self._reject(OCCUPIED, row, col, symbol, occupant=self.stones[(row, col)])
+                return False, False
+
+            if self.winner:
+                self._reject(FINISHED, row, col, symbol, winner=self.winner)
+                return False, False
+
+            if self.move_count > 0 and symbol == self.last_symbol:
+                self._reject(WRONG_TURN, row, col, symbol, expected='O' if symbol == 'X' else 'X')
+                return False, False
+
+            is_winning = self.place(row, col, symbol)
+            if self.events.enabled:
+                self.events.emit(MOVE_MADE, symbol=symbol, row=row, col=col, winning=is_winning)
+            return True, is_winning
+
+        except ValueError as e:
+            self._reject(INVALID, row, col, symbol, detail=str(e))
+            return False, False
+        except Exception as e:
+            self._reject(ERROR, row, col, symbol, detail=str(e))
+            return False, False
+
+    def place(self, row, col, symbol):
+        """
+        Ставит символ без проверок и вывода.
+        Return: True, если ход выигрышный.
+        """
+        self.moves.append((row, col))
+        self._saved_states.append((self.winner, self.winning_cells, self.last_symbol))
+
+        self.stones[(row, col)] = symbol
+        self.last_symbol = symbol
+        self.move_count += 1
+        self.hash ^= get_sparse_key(row, col, symbol)
+        self._update_neighbors(row, col, 1)
+        return self.check_winner_after_move(row, col, symbol)
+
+    def push(self, row, col):
+        """
+        Быстрый ход для поиска: без проверок и вывода.
+        Return: True, если ход выигрышный.
+        """
+        return self.place(row, col, 'O' if self.last_symbol == 'X' else 'X')
+
+    def pop(self):
+        """
+        Отменяет последний ход без проверок и вывода.
+        Return: координаты отмененного хода.
+        """
+        row, col = self.moves.pop()
+        self.winner, self.winning_cells, self.last_symbol = self._saved_states.pop()
+
+        symbol = self.stones.pop((row, col))
+        self.move_count -= 1
+        self.hash ^= get_sparse_key(row, col, symbol)
+        self._update_neighbors(row, col, -1)
+        return row, col
+
+    def _update_neighbors(self, row, col, delta):
+        """
+        Меняет счетчики камней рядом с клетками вокруг хода.
+        Клетки без камней рядом удаляются, чтобы словарь не рос.
+        """
+        radius = self.candidate_radius
+        neighbors = self.neighbors
+        for dr in range(-radius, radius + 1):
+            for dc in range(-radius, radius + 1):
+                cell = (row + dr, col + dc)
+                if not self.in_bounds(*cell):
+                    continue
+                count = neighbors.get(cell, 0) + delta
+                if count:
+                    neighbors[cell] = count
+                else:
+                    del neighbors[cell]
+
+    def undo_move(self):
+        """
+        Отменяет последний ход.
+        Return: True, если ход отменен.
+        """
+        if not self.moves:
+            self._reject(NOTHING_TO_UNDO)
+            return False
+
+        row, col = self.moves[-1]
+        symbol = self.stones[(row, col)]
+        self.pop()
+
+        if self.events.enabled:
+            self.events.emit(MOVE_UNDONE, symbol=symbol, row=row, col=col)
+        return True
+
+    def check_winner_after_move(self, row, col, symbol):
+        """
+        Проверка победы по четырем направлениям через сделанный ход.
+        """
+        for dr, dc in DIRECTIONS:
+            back = self.count_in_direction(row, col, -dr, -dc, symbol)
+            forward = self.count_in_direction(row, col, dr, dc, symbol)
+            if back + forward + 1 >= self.win_length:
+                start = min(back, self.win_length - 1)
+                self.winning_cells = [
+                    (row + dr * (i - start), col + dc * (i - start))
+                    for i in range(self.win_length)
+                ]
+                self.winner = symbol
+                return True
+        return False
+
+    def count_in_direction(self, row, col, dr, dc, symbol):
+        """
+        Считает подряд идущие символы от клетки в заданном направлении.
+        Не считает дальше win_length - 1 клеток.
+        """
+        count = 0
+        stones = self.stones
+        row += dr
+        col += dc
+        while count < self.win_length - 1 and stones.get((row, col)) == symbol:
+            count += 1
+            row += dr
+            col += dc
+        return count
+
+    def is_full(self):
+        """
+        Проверяет заполнено ли поле. Поле без границ не заполняется.
+        """
+        return self.size is not None and len(self.stones) == self.size * self.size
+
+    def is_draw(self):
+        """
+        Ничья - только заполненное поле: поиск мертвых линий
+        по всему большому полю дороже, чем он экономит.
+        """
+        return not self.winner and self.is_full()
+
+    def get_cell(self, row, col):
+        """
+        Возвращает символ в указанной ячейке
+        """
+        if not self.in_bounds(row, col):
+            return None
+        return self.stones.get((row, col), ' ')
+
+    def get_available_moves(self) -> List[Cell]:
+        """
+        Возвращает ходы рядом с камнями (не дальше candidate_radius).
+        На пустом поле - центр. Если рядом с камнями мест нет - любые свободные клетки.
+        """
+        if not self.stones:
+            center = self.size // 2 if self.size is not None else 0
+            return [(center, center)]
+        stones = self.stones
+        moves = [cell for cell in self.neighbors if cell not in stones]
+        if not moves and self.size is not None and not self.is_full():
+            moves = [(row, col) for row in range(self.size) for col in range(self.size)
+                     if (row, col) not in stones]
+        return moves
+
+    def random_move(self, rng):
+        """
+        Случайный ход из get_available_moves.
+        Return: (row, col) или None, если ходов нет.
+        """
+        moves = self.get_available_moves()
+        return rng.choice(moves) if moves else None
+
+    def get_threat_map(self) -> SparseThreats:
+        """
+        Проверки угроз с интерфейсом карты угроз Board.
+        """
+        if self.threat_map is None:
+            self.threat_map = SparseThreats(self)
+        return self.threat_map
+
+    def reset(self):
+        """
+        Сбрасывает поле
+        """
+        self.stones = {}
+        self.neighbors = {}
+        self.hash = 0
+        self.moves = []
+        self._saved_states = []
+        self.winner = None
+        self.winning_cells = []
+        self.last_symbol = None
+        self.move_count = 0
+
+    def get_state(self):
+        """
+        Возвращает текущее состояние игры.
+        Вместо сетки - словарь занятых клеток.
+        """
+        return {
+            'size': self.size,
+            'win_length': self.win_length,
+            'stones': dict(self.stones),
+            'winner': self.winner,
+            'winning_cells': self.winning_cells.copy(),
+            'last_symbol': self.last_symbol,
+            'move_count': self.move_count,
+            'is_full': self.is_full()
+            }
+
+    def __str__(self):
+        size = f"{self.size}x{self.size}" if self.size is not None else "без границ"
+        return f"SparseBoard({size}, win={self.win_length}, moves={self.move_count})"
@@ -0,0 +1,99 @@
+"""
+Симметрии квадратного поля.
+Повороты и отражения переводят позицию в равноценную,
+поэтому одну из них можно выбрать канонической.
+"""
+
+from functools import lru_cache
+from typing import Tuple
+
+
+@lru_cache(maxsize=None)
+def get_transforms(size: int) -> Tuple[Tuple[int, ...], ...]:
+    """
+    Возвращает 8 преобразований поля (повороты и отражения).
+    Преобразование - кортеж, где transform[index] - новый индекс клетки index.
+    Первое преобразование тождественное.
+    """
+    last = size - 1
+    mappings = (
+        lambda r, c: (r, c),
+        lambda r, c: (c, last - r),
+        lambda r, c: (last - r, last - c),
+        lambda r, c: (last - c, r),
+        lambda r, c: (r, last - c),
+        lambda r, c: (last - r, c),
+        lambda r, c: (c, r),
+        lambda r, c: (last - c, last - r),
+    )
+    transforms = []
+    for mapping in mappings:
+        transform = [0] * (size * size)
+        for index in range(size * size):
+            row, col = mapping(*divmod(index, size))
+            transform[index] = row * size + col
+        transforms.append(tuple(transform))
+    return tuple(transforms)
+
+
+@lru_cache(maxsize=None)
+def get_inverse_transforms(size: int) -> Tuple[Tuple[int, ...], ...]:
+    """
+    Возвращает обратные преобразования в том же порядке.
+    """
+    inverses = []
+    for transform in get_transforms(size):
+        inverse = [0] * (size * size)
+        for index, target in enumerate(transform):
+            inverse[target] = index
+        inverses.append(tuple(inverse))
+    return tuple(inverses)
+
+
+def board_to_string(board) -> str:
+    """
+    Записывает поле одной строкой по строкам сверху вниз.
+    """
+    cells = getattr(board, 'cells', None)
+    if cells is not None:
+        # Board хранит поле плоским bytearray в том же порядке
+        return cells.decode()
+    return ''.join(''.join(row) for row in board.grid)
+
+
+def canonicalize(cells: str, size: int) -> Tuple[str, int]:
+    """
+    Возвращает каноническую запись позиции и номер преобразования,
+    которое к ней приводит.
+    cells - поле одной строкой (см. board_to_string).
+    """
+    best, best_transform = None, 0
+    for number, inverse in enumerate(get_inverse_transforms(size)):
+        # Клетка index новой позиции берется из клетки inverse[index]
+        image = ''.join([cells[source] for source in inverse])
+        if best is None or image < best:
+            best, best_transform = image, number
+    return best, best_transform
+
+
+def canonical_key(board, symbol: str) -> Tuple[Tuple[int, int, str, str], int]:
+    """
+    Канонический ключ позиции для хода symbol.
+    Return: (ключ, номер преобразования).
+    """
+    cells, transform = canonicalize(board_to_string(board), board.size)
+    return (board.size, board.win_length, symbol, cells), transform
+
+
+def transform_move(move: Tuple[int, int], transform: int, size: int) -> Tuple[int, int]:
+    """
+    Переводит ход из исходной позиции в каноническую.
+    """
+    return divmod(get_transforms(size)[transform][move[0] * size + move[1]], size)
+
+
+def restore_move(move: Tuple[int, int], transform: int, size: int) -> Tuple[int, int]:
+    """
+    Переводит ход из канонической позиции обратно в исходную.
+    """
+    return divmod(get_inverse_transforms(size)[transform][move[0] * size + move[1]], size)
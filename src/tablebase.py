@@ -0,0 +1,325 @@
+"""
+Таблица идеальной игры для малых полей.
+Генератор полностью решает игру и записывает компактный
+бинарный файл, который компьютер открывает через mmap.
+
+Генерация: python -m src.tablebase --size 4 --win-length 3
+"""
+
+import mmap
+import os
+import struct
+import sys
+import time
+import warnings
+import zlib
+from typing import Dict, Iterable, Optional, Tuple
+
+from .lines import get_cell_masks
+from .symmetry import get_transforms, get_inverse_transforms
+
+# Каталог с таблицами по умолчанию
+TABLES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'tables')
+
+# Формат файла:
+#   заголовок: сигнатура, версия, размер поля, длина линии,
+#              число позиций, число слотов, CRC32 данных;
+#   данные: хеш-таблица с открытой адресацией, слот - ключ+1 (0 - пусто),
+#           лучший ход в канонической позиции и оценка.
+MAGIC = b'TTTB'
+FORMAT_VERSION = 1
+HEADER = struct.Struct('<4sHBBIII')
+SLOT = struct.Struct('<IBb')
+
+# Поля, для которых строятся таблицы
+DEFAULT_TABLES = ((3, 3), (4, 3), (4, 4))
+
+# Код клетки в троичной записи позиции
+CELL_CODES = {' ': 0, 'X': 1, 'O': 2}
+
+
+class TablebaseError(ValueError):
+    """
+    Файл таблицы поврежден или имеет другой формат.
+    """
+
+
+def get_table_path(size: int, win_length: int, directory: str = TABLES_DIR) -> str:
+    """
+    Возвращает путь к файлу таблицы для поля.
+    """
+    return os.path.join(directory, f"tablebase_{size}x{size}_{win_length}.bin")
+
+
+def _slot_index(key: int, slot_bits: int) -> int:
+    """
+    Мультипликативный хеш ключа позиции.
+    """
+    return ((key * 0x9E3779B1) & 0xFFFFFFFF) >> (32 - slot_bits)
+
+
+def _power_weights(size: int):
+    """
+    Для каждого преобразования - вес клетки в троичной записи.
+    """
+    return tuple(
+        tuple(3 ** target for target in transform)
+        for transform in get_transforms(size)
+    )
+
+
+def position_codes(board) -> Tuple[int, ...]:
+    """
+    Троичные записи позиции во всех 8 симметриях.
+    Минимальная из них - канонический ключ.
+    """
+    weights = _power_weights(board.size)
+    codes = [0] * len(weights)
+    for row in range(board.size):
+        for col in range(board.size):
+            value = CELL_CODES[board.get_cell(row, col)]
+            if value:
+                index = row * board.size + col
+                for number, weight in enumerate(weights):
+                    codes[number] += value * weight[index]
+    return tuple(codes)
+
+
+class TablebaseSolver:
+    """
+    Полный перебор игры с запоминанием канонических позиций.
+    Первым ходит X.
+    Оценка позиции - с точки зрения ходящего:
+        > 0 - победа (чем больше, тем быстрее),
+        0 - ничья,
+        < 0 - поражение.
+    """
+
+    def __init__(self, size: int, win_length: Optional[int] = None):
+        """
+        Готовит таблицы для перебора.
+        """
+        self.size = size
+        self.win_length = win_length or size
+        self.cells = size * size
+        self.full_mask = (1 << self.cells) - 1
+        self.cell_masks = get_cell_masks(size, self.win_length)
+        self.transforms = get_transforms(size)
+        self.weights = _power_weights(size)
+
+        # Каноническая позиция -> (оценка, лучший ход в канонической позиции)
+        self.solved: Dict[int, Tuple[int, int]] = {}
+
+    def solve(self) -> Dict[int, Tuple[int, int]]:
+        """
+        Решает игру с пустого поля.
+        """
+        self._solve(0, 0, (0,) * len(self.transforms), 1)
+        return self.solved
+
+    def _solve(self, own, opp, codes, value):
+        """
+        Возвращает оценку позиции для ходящего.
+        own, opp - камни ходящего и соперника, value - код ходящего (1 или 2).
+        """
+        key = min(codes)
+        known = self.solved.get(key)
+        if known is not None:
+            return known[0]
+
+        empty = self.full_mask & ~(own | opp)
+        free = bin(empty).count('1')
+        best, best_move = None, 0
+        bits = empty
+        while bits:
+            low = bits & -bits
+            bits ^= low
+            index = low.bit_length() - 1
+            new_own = own | low
+
+            if any(new_own & mask == mask for mask in self.cell_masks[index]):
+                # Победа: чем раньше, тем больше оценка
+                score = free
+            elif free == 1:
+                score = 0
+            else:
+                child = tuple(code + value * weight[index] for code, weight in zip(codes, self.weights))
+                score = -self._solve(opp, new_own, child, 3 - value)
+
+            if best is None or score > best:
+                best, best_move = score, index
+
+        transform = codes.index(key)
+        self.solved[key] = (best, self.transforms[transform][best_move])
+        return best
+
+
+def write_tablebase(path: str, size: int, win_length: int, solved: Dict[int, Tuple[int, int]]):
+    """
+    Записывает решенные позиции в файл.
+    """
+    write_tablebase_entries(path, size, win_length, solved.items(), len(solved))
+
+
+def write_tablebase_entries(path: str, size: int, win_length: int,
+                            entries: Iterable[Tuple[int, Tuple[int, int]]], count: int):
+    """
+    Записывает в файл таблицы count позиций (ключ, (оценка, ход)) из потока,
+    не собирая их в словарь.
+    """
+    slot_bits = max(1, (2 * count - 1).bit_length())
+    slot_count = 1 << slot_bits
+    payload = bytearray(slot_count * SLOT.size)
+    for key, (score, move) in entries:
+        index = _slot_index(key, slot_bits)
+        while SLOT.unpack_from(payload, index * SLOT.size)[0]:
+            index = (index + 1) & (slot_count - 1)
+        SLOT.pack_into(payload, index * SLOT.size, key + 1, move, score)
+
+    header = HEADER.pack(MAGIC, FORMAT_VERSION, size, win_length,
+                         count, slot_count, zlib.crc32(payload))
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(header)
+        f.write(payload)
+
+
+class Tablebase:
+    """
+    Открытая таблица идеальной игры.
+    Файл отображается в память, поиск позиции - O(1).
+    """
+
+    def __init__(self, path: str):
+        """
+        Открывает и проверяет файл таблицы.
+        Raises:
+            OSError: если файл нельзя открыть.
+            TablebaseError: если формат или контрольная сумма не совпадают.
+        """
+        self.path = path
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if len(self._mmap) < HEADER.size:
+            raise TablebaseError(f"Файл {path} слишком короткий")
+        magic, version, size, win_length, count, slot_count, checksum = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC:
+            raise TablebaseError(f"Файл {path} не является таблицей")
+        if version != FORMAT_VERSION:
+            raise TablebaseError(f"Версия таблицы {version}, ожидается {FORMAT_VERSION}")
+        if len(self._mmap) != HEADER.size + slot_count * SLOT.size:
+            raise TablebaseError(f"Размер файла {path} не совпадает с заголовком")
+        if zlib.crc32(memoryview(self._mmap)[HEADER.size:]) != checksum:
+            raise TablebaseError(f"Контрольная сумма таблицы {path} не совпадает")
+
+        self.size = size
+        self.win_length = win_length
+        self.count = count
+        self.slot_count = slot_count
+        self._slot_bits = slot_count.bit_length() - 1
+        self.hits = 0
+        self.misses = 0
+
+    def close(self):
+        """
+        Закрывает файл
+        """
+        self._mmap.close()
+
+    def probe(self, key: int) -> Optional[Tuple[int, int]]:
+        """
+        Ищет каноническую позицию.
+        Return: (лучший ход в канонической позиции, оценка) или None.
+        """
+        index = _slot_index(key, self._slot_bits)
+        while True:
+            stored, move, score = SLOT.unpack_from(self._mmap, HEADER.size + index * SLOT.size)
+            if stored == 0:
+                return None
+            if stored == key + 1:
+                return move, score
+            index = (index + 1) & (self.slot_count - 1)
+
+    def lookup(self, board, symbol: str) -> Optional[Tuple[Tuple[int, int], int]]:
+        """
+        Возвращает лучший ход и оценку для symbol или None,
+        если позиции нет в таблице.
+        """
+        if (board.size, board.win_length) != (self.size, self.win_length):
+            return None
+        # Таблица построена для партий, где первым ходит X
+        expected = 'X' if board.move_count % 2 == 0 else 'O'
+        if symbol != expected:
+            self.misses += 1
+            return None
+
+        codes = position_codes(board)
+        key = min(codes)
+        entry = self.probe(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        move, score = entry
+        transform = codes.index(key)
+        index = get_inverse_transforms(board.size)[transform][move]
+        return divmod(index, board.size), score
+
+
+# Открытые таблицы: (size, win_length) -> Tablebase или None
+_loaded: Dict[Tuple[int, int], Optional[Tablebase]] = {}
+
+
+def get_tablebase(size: int, win_length: int, directory: str = TABLES_DIR) -> Optional[Tablebase]:
+    """
+    Возвращает таблицу для поля или None, если файла нет.
+    Таблица открывается один раз на процесс.
+    Поврежденный файл - предупреждение RuntimeWarning и None: компьютер ищет ход сам.
+    """
+    key = (size, win_length)
+    if key not in _loaded:
+        path = get_table_path(size, win_length, directory)
+        table = None
+        if os.path.exists(path):
+            try:
+                table = Tablebase(path)
+            except (OSError, TablebaseError) as e:
+                warnings.warn(f"Таблица {path} не загружена: {e}", RuntimeWarning, stacklevel=2)
+        _loaded[key] = table
+    return _loaded[key]
+
+
+def generate(size: int, win_length: int, directory: str = TABLES_DIR) -> str:
+    """
+    Решает игру и записывает таблицу. Возвращает путь к файлу.
+    """
+    start = time.perf_counter()
+    solved = TablebaseSolver(size, win_length).solve()
+    path = get_table_path(size, win_length, directory)
+    write_tablebase(path, size, win_length, solved)
+    elapsed = time.perf_counter() - start
+    print(f"{size}x{size}, линия {win_length}: {len(solved)} позиций за {elapsed:.1f} с -> {path}")
+    return path
+
+
+def main(argv=None):
+    # argparse нужен только запуску из консоли, а не компьютеру, читающему таблицы
+    import argparse
+    parser = argparse.ArgumentParser(description="Генерация таблиц идеальной игры")
+    parser.add_argument('--size', type=int, help="размер поля")
+    parser.add_argument('--win-length', type=int, help="длина линии для победы")
+    parser.add_argument('--output-dir', default=TABLES_DIR, help="каталог для таблиц")
+    args = parser.parse_args(argv)
+
+    if args.size is None:
+        tables = DEFAULT_TABLES
+    else:
+        tables = ((args.size, args.win_length or args.size),)
+    for size, win_length in tables:
+        generate(size, win_length, args.output_dir)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
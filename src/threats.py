@@ -0,0 +1,203 @@
+"""
+Карта угроз поля.
+Для каждой клетки и каждого символа хранит, сколько открытых
+(без камней соперника) линий через клетку содержат n камней символа.
+Карта обновляется при каждом ходе и его отмене, поэтому
+победный ход, вынужденная блокировка и вилка читаются из нее напрямую.
+"""
+
+from functools import lru_cache
+from typing import List
+
+from .lines import get_win_lines
+
+SYMBOL_INDEX = {'X': 0, 'O': 1}
+
+
+@lru_cache(maxsize=None)
+def get_line_tables(size: int, win_length: int):
+    """
+    Индексы клеток каждой линии и номера линий через каждую клетку.
+    Return: (line_cells, cell_lines).
+    """
+    line_cells = tuple(
+        tuple(row * size + col for row, col in line)
+        for line in get_win_lines(size, win_length)
+    )
+    cell_lines = [[] for _ in range(size * size)]
+    for number, cells in enumerate(line_cells):
+        for cell in cells:
+            cell_lines[cell].append(number)
+    return line_cells, tuple(tuple(lines) for lines in cell_lines)
+
+
+class ThreatMap:
+    """
+    Счетчики открытых линий по клеткам.
+    counts[symbol][cell * (win_length + 1) + n] - число открытых для symbol
+    линий через cell, на которых стоит n камней symbol.
+    Ход обновляет не больше 4 * win_length линий по win_length клеток.
+    """
+
+    def __init__(self, size: int, win_length: int):
+        """
+        Создает карту пустого поля.
+        """
+        self.size = size
+        self.win_length = win_length
+        self.stride = win_length + 1
+        self.line_cells, self.cell_lines = get_line_tables(size, win_length)
+        # Число камней X и O на каждой линии
+        self.line_counts = [[0, 0] for _ in self.line_cells]
+
+        empty = [0] * (size * size * self.stride)
+        for cell, lines in enumerate(self.cell_lines):
+            empty[cell * self.stride] = len(lines)
+        self.counts = (empty, list(empty))
+
+    @classmethod
+    def from_board(cls, board) -> 'ThreatMap':
+        """
+        Строит карту по текущей позиции поля (Board или BitBoard).
+        """
+        threat_map = cls(board.size, board.win_length)
+        for row in range(board.size):
+            for col in range(board.size):
+                symbol = board.get_cell(row, col)
+                if symbol != ' ':
+                    threat_map.place(row * board.size + col, symbol)
+        return threat_map
+
+    def place(self, cell: int, symbol: str):
+        """
+        Учитывает камень symbol в клетке cell.
+        """
+        me = SYMBOL_INDEX[symbol]
+        mine_counts, their_counts = self.counts[me], self.counts[1 - me]
+        stride = self.stride
+        for line in self.cell_lines[cell]:
+            counts = self.line_counts[line]
+            mine, theirs = counts[me], counts[1 - me]
+            if theirs == 0:
+                # Линия остается открытой для нас, камней стало больше
+                for other in self.line_cells[line]:
+                    base = other * stride + mine
+                    mine_counts[base] -= 1
+                    mine_counts[base + 1] += 1
+            if mine == 0:
+                # Линия закрылась для соперника
+                for other in self.line_cells[line]:
+                    their_counts[other * stride + theirs] -= 1
+            counts[me] = mine + 1
+
+    def remove(self, cell: int, symbol: str):
+        """
+        Отменяет place(cell, symbol).
+        """
+        me = SYMBOL_INDEX[symbol]
+        mine_counts, their_counts = self.counts[me], self.counts[1 - me]
+        stride = self.stride
+        for line in self.cell_lines[cell]:
+            counts = self.line_counts[line]
+            mine = counts[me] - 1
+            theirs = counts[1 - me]
+            counts[me] = mine
+            if theirs == 0:
+                for other in self.line_cells[line]:
+                    base = other * stride + mine
+                    mine_counts[base + 1] -= 1
+                    mine_counts[base] += 1
+            if mine == 0:
+                for other in self.line_cells[line]:
+                    their_counts[other * stride + theirs] += 1
+
+    def open_lines(self, row: int, col: int, symbol: str, stones: int) -> int:
+        """
+        Число открытых для symbol линий через клетку с stones камнями symbol.
+        """
+        return self.counts[SYMBOL_INDEX[symbol]][(row * self.size + col) * self.stride + stones]
+
+    def is_win(self, row: int, col: int, symbol: str) -> bool:
+        """
+        Ход symbol в пустую клетку сразу выигрывает.
+        """
+        return self.open_lines(row, col, symbol, self.win_length - 1) > 0
+
+    def is_fork(self, row: int, col: int, symbol: str) -> bool:
+        """
+        Ход symbol в пустую клетку создает две угрозы победы сразу.
+        """
+        return self.open_lines(row, col, symbol, self.win_length - 2) >= 2
+
+    def profile(self, row: int, col: int, symbol: str) -> List[int]:
+        """
+        Счетчики открытых линий через клетку по числу камней: [n=0, n=1, ...].
+        """
+        start = (row * self.size + col) * self.stride
+        return self.counts[SYMBOL_INDEX[symbol]][start:start + self.stride]
+
+
+class LiveLines:
+    """
+    Счетчики камней по линиям для раннего обнаружения ничьей.
+    Линия мертва, когда на ней стоят камни обоих символов,
+    live - число линий, которые еще может собрать хотя бы один символ.
+    """
+
+    def __init__(self, size: int, win_length: int):
+        """
+        Создает счетчики пустого поля.
+        """
+        self.win_length = win_length
+        self.line_cells, self.cell_lines = get_line_tables(size, win_length)
+        # Число камней X и O на каждой линии
+        self.line_counts = ([0] * len(self.line_cells), [0] * len(self.line_cells))
+        self.live = len(self.line_cells)
+
+    @classmethod
+    def from_board(cls, board) -> 'LiveLines':
+        """
+        Строит счетчики по текущей позиции поля (Board или BitBoard).
+        """
+        live_lines = cls(board.size, board.win_length)
+        for row in range(board.size):
+            for col in range(board.size):
+                symbol = board.get_cell(row, col)
+                if symbol != ' ':
+                    live_lines.place(row * board.size + col, symbol)
+        return live_lines
+
+    def place(self, cell: int, symbol: str):
+        """
+        Учитывает камень symbol в клетке cell.
+        """
+        me = SYMBOL_INDEX[symbol]
+        mine, theirs = self.line_counts[me], self.line_counts[1 - me]
+        for line in self.cell_lines[cell]:
+            if not mine[line] and theirs[line]:
+                self.live -= 1
+            mine[line] += 1
+
+    def remove(self, cell: int, symbol: str):
+        """
+        Отменяет place(cell, symbol).
+        """
+        me = SYMBOL_INDEX[symbol]
+        mine, theirs = self.line_counts[me], self.line_counts[1 - me]
+        for line in self.cell_lines[cell]:
+            mine[line] -= 1
+            if not mine[line] and theirs[line]:
+                self.live += 1
+
+    def can_complete(self, symbol: str, moves_left: int) -> bool:
+        """
+        Есть открытая для symbol линия, которую можно собрать за moves_left ходов.
+        Ходы соперника не учитываются, поэтому False означает, что symbol
+        уже точно не выиграет.
+        """
+        me = SYMBOL_INDEX[symbol]
+        need = self.win_length - moves_left
+        for mine, theirs in zip(self.line_counts[me], self.line_counts[1 - me]):
+            if not theirs and mine >= need:
+                return True
+        return False
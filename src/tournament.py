@@ -0,0 +1,326 @@
+"""
+Турниры между компьютерными игроками.
+Партии раздаются пачками по процессам, результаты сводятся
+в общую статистику игроков. Прогресс сохраняется в файл,
+поэтому прерванный турнир можно продолжить.
+
+Запуск: python -m src.tournament --entrants easy medium hard --games 10
+"""
+
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, Any, List, Optional, Tuple
+
+from .game import create_game_from_config
+
+SCHEDULES = ('round_robin', 'swiss')
+
+# Версия формата файла контрольной точки
+CHECKPOINT_VERSION = 1
+
+
+def game_seed(base_seed: int, game_id: int) -> int:
+    """
+    Детерминированное зерно партии: не зависит от порядка
+    выполнения и числа процессов.
+    """
+    return (base_seed * 1_000_003 + game_id * 7_919) % (2 ** 32)
+
+
+def play_chunk(specs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Играет пачку партий в рабочем процессе.
+    specs - конфигурации create_game_from_config с полем 'game_id'.
+    Return: результаты партий.
+    """
+    results = []
+    for spec in specs:
+        config = dict(spec)
+        game_id = config.pop('game_id')
+        game = create_game_from_config(config)
+        game.play_full_game()
+        if not game.game_over:
+            raise RuntimeError(f"Партия {game_id} прервана с ошибкой")
+
+        player_x, player_o = game.players
+        results.append({
+            'game_id': game_id,
+            'x': player_x.name,
+            'o': player_o.name,
+            'winner': game.winner.name if game.winner else None,
+            'moves': len(game.history),
+            'stats': [player_x.get_stats(), player_o.get_stats()],
+        })
+    return results
+
+
+class Tournament:
+    """
+    Турнир по круговой или швейцарской системе.
+    Arg:
+        entrants - игроки: {'name': str, 'difficulty': str, 'time_limit': float}.
+        board_size, win_length - поле для всех партий.
+        games_per_pairing - партий в каждой паре, цвета чередуются.
+        schedule - 'round_robin' или 'swiss'.
+        rounds - число туров для швейцарской системы.
+        seed - базовое зерно турнира.
+        workers - число процессов, по умолчанию по числу ядер.
+        chunk_size - партий в одной пачке работы.
+        checkpoint_path - файл для сохранения прогресса.
+    """
+
+    def __init__(self, entrants: List[Dict[str, Any]], board_size: int = 3,
+                 win_length: Optional[int] = None, games_per_pairing: int = 2,
+                 schedule: str = 'round_robin', rounds: Optional[int] = None,
+                 seed: int = 0, workers: Optional[int] = None, chunk_size: int = 50,
+                 checkpoint_path: Optional[str] = None):
+        """
+        Проверяет параметры турнира.
+        """
+        if len(entrants) < 2:
+            raise ValueError("В турнире должно быть хотя бы два игрока")
+        names = [entrant['name'] for entrant in entrants]
+        if len(set(names)) != len(names):
+            raise ValueError("Имена игроков должны быть уникальными")
+        if schedule not in SCHEDULES:
+            raise ValueError(f"Неизвестная система турнира: {schedule}")
+        if games_per_pairing <= 0 or chunk_size <= 0:
+            raise ValueError("Число партий и размер пачки должны быть положительными")
+
+        self.entrants = {entrant['name']: entrant for entrant in entrants}
+        self.board_size = board_size
+        self.win_length = win_length
+        self.games_per_pairing = games_per_pairing
+        self.schedule = schedule
+        self.rounds = rounds if schedule == 'swiss' else 1
+        if self.rounds is None:
+            # Для швейцарской системы хватает log2(N) туров
+            self.rounds = max(1, (len(entrants) - 1).bit_length())
+        self.seed = seed
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.checkpoint_path = checkpoint_path
+
+        self.completed_chunks = set()
+        self.standings = {name: self._empty_record(name) for name in names}
+        self.played_pairs = set()
+        self.round_pairings: Dict[int, List[Tuple[str, str]]] = {}
+        self.total_moves = 0
+
+    @staticmethod
+    def _empty_record(name: str) -> Dict[str, Any]:
+        """
+        Пустая статистика игрока.
+        """
+        return {'name': name, 'wins': 0, 'losses': 0, 'draws': 0, 'total_games': 0,
+                'win_rate': 0.0, 'points': 0.0}
+
+    def _fingerprint(self) -> Dict[str, Any]:
+        """
+        Параметры, которые должны совпасть при продолжении турнира.
+        """
+        return {
+            'entrants': sorted(self.entrants.values(), key=lambda entrant: entrant['name']),
+            'board_size': self.board_size,
+            'win_length': self.win_length,
+            'games_per_pairing': self.games_per_pairing,
+            'schedule': self.schedule,
+            'rounds': self.rounds,
+            'seed': self.seed,
+            'chunk_size': self.chunk_size,
+        }
+
+    def pairings(self, round_number: int) -> List[Tuple[str, str]]:
+        """
+        Пары игроков тура.
+        Круговая система - все пары сразу.
+        Швейцарская - соседи по таблице, избегая повторных встреч.
+        Пары тура запоминаются, чтобы продолжение турнира их не меняло.
+        """
+        if round_number not in self.round_pairings:
+            self.round_pairings[round_number] = self._make_pairings()
+        return self.round_pairings[round_number]
+
+    def _make_pairings(self) -> List[Tuple[str, str]]:
+        """
+        Составляет пары по текущей таблице.
+        """
+        names = sorted(self.entrants)
+        if self.schedule == 'round_robin':
+            return [(a, b) for i, a in enumerate(names) for b in names[i + 1:]]
+
+        # Сортировка по очкам, при равенстве - по имени для детерминизма
+        ranked = sorted(names, key=lambda name: (-self.standings[name]['points'], name))
+        pairs = []
+        while len(ranked) > 1:
+            first = ranked.pop(0)
+            opponent = next((name for name in ranked
+                             if tuple(sorted((first, name))) not in self.played_pairs), ranked[0])
+            ranked.remove(opponent)
+            pairs.append((first, opponent))
+        return pairs
+
+    def _game_config(self, name_x: str, name_o: str, game_id: int) -> Dict[str, Any]:
+        """
+        Конфигурация одной партии для create_game_from_config.
+        """
+        entrant_x, entrant_o = self.entrants[name_x], self.entrants[name_o]
+        seed = game_seed(self.seed, game_id)
+        return {
+            'game_id': game_id,
+            'player1_type': 'ai',
+            'player1_name': name_x,
+            'player1_symbol': 'X',
+            'player1_difficulty': entrant_x.get('difficulty', 'easy'),
+            'player1_time_limit': entrant_x.get('time_limit', 0.1),
+            'player1_seed': seed,
+            # Общий кэш позиций сделал бы партию зависимой от предыдущих в процессе
+            'player1_use_cache': False,
+            'player2_type': 'ai',
+            'player2_name': name_o,
+            'player2_symbol': 'O',
+            'player2_difficulty': entrant_o.get('difficulty', 'easy'),
+            'player2_time_limit': entrant_o.get('time_limit', 0.1),
+            'player2_seed': seed + 1,
+            'player2_use_cache': False,
+            'board_size': self.board_size,
+            'win_length': self.win_length,
+            'think_time': 0,
+            'verbose': False,
+        }
+
+    def _round_chunks(self, round_number: int) -> List[Tuple[int, List[Dict[str, Any]]]]:
+        """
+        Делит партии тура на пачки работы.
+        Номера партий и пачек уникальны в пределах турнира.
+        """
+        specs = []
+        games_per_round = len(self.entrants) ** 2 * self.games_per_pairing
+        game_id = round_number * games_per_round
+        for name_a, name_b in self.pairings(round_number):
+            for number in range(self.games_per_pairing):
+                # Цвета чередуются
+                if number % 2 == 0:
+                    specs.append(self._game_config(name_a, name_b, game_id))
+                else:
+                    specs.append(self._game_config(name_b, name_a, game_id))
+                game_id += 1
+
+        chunks_per_round = games_per_round // self.chunk_size + 1
+        return [
+            (round_number * chunks_per_round + index, specs[start:start + self.chunk_size])
+            for index, start in enumerate(range(0, len(specs), self.chunk_size))
+        ]
+
+    def _merge(self, results: List[Dict[str, Any]]):
+        """
+        Добавляет результаты партий в таблицу.
+        """
+        for result in results:
+            self.total_moves += result['moves']
+            self.played_pairs.add(tuple(sorted((result['x'], result['o']))))
+            for stats in result['stats']:
+                record = self.standings[stats['name']]
+                record['wins'] += stats['wins']
+                record['total_games'] += stats['total_games']
+                if result['winner'] is None:
+                    record['draws'] += 1
+                    record['points'] += 0.5
+                elif result['winner'] == stats['name']:
+                    record['points'] += 1
+                else:
+                    record['losses'] += 1
+                record['win_rate'] = record['wins'] / record['total_games'] * 100
+
+    def _load_checkpoint(self):
+        """
+        Загружает прогресс, если файл контрольной точки есть.
+        """
+        if not self.checkpoint_path or not os.path.exists(self.checkpoint_path):
+            return
+        with open(self.checkpoint_path, encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('version') != CHECKPOINT_VERSION:
+            raise ValueError(f"Неподдерживаемая версия контрольной точки: {data.get('version')}")
+        if data['config'] != json.loads(json.dumps(self._fingerprint())):
+            raise ValueError("Контрольная точка создана для другого турнира")
+        self.completed_chunks = set(data['completed_chunks'])
+        self.standings = data['standings']
+        self.played_pairs = {tuple(pair) for pair in data['played_pairs']}
+        self.round_pairings = {int(number): [tuple(pair) for pair in pairs]
+                               for number, pairs in data['round_pairings'].items()}
+        self.total_moves = data['total_moves']
+
+    def _save_checkpoint(self):
+        """
+        Атомарно сохраняет прогресс.
+        """
+        if not self.checkpoint_path:
+            return
+        data = {
+            'version': CHECKPOINT_VERSION,
+            'config': self._fingerprint(),
+            'completed_chunks': sorted(self.completed_chunks),
+            'standings': self.standings,
+            'played_pairs': sorted(self.played_pairs),
+            'round_pairings': self.round_pairings,
+            'total_moves': self.total_moves,
+        }
+        temp_path = self.checkpoint_path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(temp_path, self.checkpoint_path)
+
+    def run(self) -> List[Dict[str, Any]]:
+        """
+        Проводит турнир (или продолжает прерванный).
+        Return: таблица игроков по убыванию очков.
+        """
+        self._load_checkpoint()
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            for round_number in range(self.rounds):
+                chunks = [(chunk_id, specs) for chunk_id, specs in self._round_chunks(round_number)
+                          if chunk_id not in self.completed_chunks]
+                futures = {executor.submit(play_chunk, specs): chunk_id for chunk_id, specs in chunks}
+                for future in as_completed(futures):
+                    self._merge(future.result())
+                    self.completed_chunks.add(futures[future])
+                    self._save_checkpoint()
+        return self.get_standings()
+
+    def get_standings(self) -> List[Dict[str, Any]]:
+        """
+        Возвращает таблицу игроков по убыванию очков.
+        """
+        return sorted(self.standings.values(), key=lambda record: (-record['points'], record['name']))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Турнир компьютерных игроков")
+    parser.add_argument('--entrants', nargs='+', default=['easy', 'medium', 'hard'],
+                        help="уровни участников")
+    parser.add_argument('--size', type=int, default=3, help="размер поля")
+    parser.add_argument('--win-length', type=int, help="длина линии для победы")
+    parser.add_argument('--games', type=int, default=10, help="партий в каждой паре")
+    parser.add_argument('--schedule', choices=SCHEDULES, default='round_robin')
+    parser.add_argument('--rounds', type=int, help="туров швейцарской системы")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workers', type=int)
+    parser.add_argument('--chunk-size', type=int, default=50)
+    parser.add_argument('--checkpoint', help="файл для сохранения прогресса")
+    args = parser.parse_args(argv)
+
+    entrants = [{'name': f"{difficulty}-{number}", 'difficulty': difficulty}
+                for number, difficulty in enumerate(args.entrants, 1)]
+    tournament = Tournament(entrants, args.size, args.win_length, args.games, args.schedule,
+                            args.rounds, args.seed, args.workers, args.chunk_size, args.checkpoint)
+    for place, record in enumerate(tournament.run(), 1):
+        print(f"{place}. {record['name']}: {record['points']} очков, "
+              f"{record['wins']}/{record['draws']}/{record['losses']}, {record['win_rate']:.1f}%")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,133 @@
+"""
+Таблица транспозиций для поискового движка.
+Хранит результаты поиска по хешу Зобриста позиции.
+"""
+
+from array import array
+from typing import Dict, Any, Optional, Tuple
+
+# Тип оценки в записи
+EXACT = 1   # точная оценка
+LOWER = 2   # оценка не меньше сохраненной (отсечение по beta)
+UPPER = 3   # оценка не больше сохраненной (не превысили alpha)
+
+
+class TranspositionTable:
+    """
+    Таблица транспозиций с ограничением по памяти.
+    Каждая корзина содержит два слота:
+        - слот с предпочтением глубины: заменяется только записью
+          с не меньшей глубиной;
+        - слот "заменять всегда": получает все остальные записи.
+    Данные лежат в плоских массивах array, поэтому занимаемая
+    память известна заранее.
+    Arg:
+        memory_mb - максимальный размер таблицы в мегабайтах.
+    """
+    # Байт на слот: ключ (8), оценка (8), глубина (1), тип (1), ход (2).
+    # Ход - индекс клетки row * size + col: на полях от 12х12 он не помещается в байт
+    SLOT_BYTES = 20
+
+    def __init__(self, memory_mb: float = 16):
+        """
+        Создает пустую таблицу.
+        """
+        if memory_mb <= 0:
+            raise ValueError(f"Размер таблицы должен быть положительным, введено {memory_mb}")
+
+        # Число корзин - степень двойки, чтобы брать индекс маской
+        buckets = max(1, int(memory_mb * 1024 * 1024) // (2 * self.SLOT_BYTES))
+        self.bucket_count = 1 << (buckets.bit_length() - 1)
+        self.memory_bytes = self.bucket_count * 2 * self.SLOT_BYTES
+        self._index_mask = self.bucket_count - 1
+
+        slots = self.bucket_count * 2
+        self.keys = array('Q', bytes(8 * slots))
+        self.scores = array('q', bytes(8 * slots))
+        self.depths = array('b', bytes(slots))
+        self.flags = array('b', bytes(slots))
+        self.moves = array('h', bytes(2 * slots))
+
+        self.reset_stats()
+
+    def reset_stats(self):
+        """
+        Сбрасывает счетчики
+        """
+        self.hits = 0
+        self.misses = 0
+        self.collisions = 0
+        self.stores = 0
+        self.replacements = 0
+
+    def clear(self):
+        """
+        Очищает таблицу
+        """
+        slots = self.bucket_count * 2
+        self.flags = array('b', bytes(slots))
+        self.reset_stats()
+
+    def probe(self, key: int) -> Optional[Tuple[int, int, int, int]]:
+        """
+        Ищет позицию в таблице.
+        Return: (depth, score, flag, move) или None.
+        """
+        slot = (key & self._index_mask) << 1
+        flags = self.flags
+        keys = self.keys
+        for index in (slot, slot + 1):
+            if flags[index] and keys[index] == key:
+                self.hits += 1
+                return self.depths[index], self.scores[index], flags[index], self.moves[index]
+
+        self.misses += 1
+        if flags[slot] or flags[slot + 1]:
+            # Корзина занята другими позициями
+            self.collisions += 1
+        return None
+
+    def store(self, key: int, depth: int, score: int, flag: int, move: int = -1):
+        """
+        Сохраняет результат поиска позиции.
+        """
+        slot = (key & self._index_mask) << 1
+        flags = self.flags
+
+        # Та же позиция уже есть - обновляем ее слот
+        if flags[slot] and self.keys[slot] == key:
+            # Более мелкий результат не вытесняет глубокий
+            index = slot if depth >= self.depths[slot] else slot + 1
+        elif flags[slot + 1] and self.keys[slot + 1] == key:
+            index = slot + 1
+        elif not flags[slot] or depth >= self.depths[slot]:
+            index = slot
+        else:
+            index = slot + 1
+
+        if flags[index] and self.keys[index] != key:
+            self.replacements += 1
+        self.keys[index] = key
+        self.scores[index] = score
+        self.depths[index] = depth
+        flags[index] = flag
+        self.moves[index] = move
+        self.stores += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Возвращает статистику таблицы
+        """
+        probes = self.hits + self.misses
+        used = sum(1 for flag in self.flags if flag)
+        return {
+            'memory_bytes': self.memory_bytes,
+            'slots': self.bucket_count * 2,
+            'used_slots': used,
+            'hits': self.hits,
+            'misses': self.misses,
+            'collisions': self.collisions,
+            'stores': self.stores,
+            'replacements': self.replacements,
+            'hit_rate': self.hits / probes * 100 if probes else 0.0,
+        }
@@ -0,0 +1,37 @@
+"""
+Ключи Зобриста для хеширования позиций.
+Хеш позиции - XOR ключей всех занятых клеток, поэтому
+он обновляется за O(1) при каждом ходе и его отмене.
+"""
+
+import random
+from functools import lru_cache
+from typing import Dict, Tuple
+
+# Фиксированное зерно: хеши одинаковы между запусками и процессами
+ZOBRIST_SEED = 20240229
+
+
+@lru_cache(maxsize=None)
+def get_zobrist_keys(size: int) -> Dict[str, Tuple[int, ...]]:
+    """
+    Возвращает 64-битные ключи для каждой клетки и каждого символа.
+    Клетка (row, col) имеет индекс row * size + col.
+    """
+    rng = random.Random(ZOBRIST_SEED + size)
+    return {
+        symbol: tuple(rng.getrandbits(64) for _ in range(size * size))
+        for symbol in ('X', 'O')
+    }
+
+
+def get_sparse_key(row: int, col: int, symbol: str) -> int:
+    """
+    64-битный ключ клетки без таблицы - для полей без ограничения размера.
+    Ключ получается перемешиванием координат (splitmix64).
+    """
+    value = ((row & 0xFFFFFFFF) << 33 | (col & 0xFFFFFFFF) << 1 | (symbol == 'O')) + ZOBRIST_SEED
+    value = (value + 0x9E3779B97F4A7C15) & 0xFFFFFFFFFFFFFFFF
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & 0xFFFFFFFFFFFFFFFF
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & 0xFFFFFFFFFFFFFFFF
+    return value ^ (value >> 31)
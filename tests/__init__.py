@@ -0,0 +1,4 @@
+"""
+Пакет tests - проверки на pytest.
+Запуск: python -m pytest -q
+"""
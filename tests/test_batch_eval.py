@@ -0,0 +1,96 @@
+"""
+Пакетная оценка на NumPy совпадает со скалярным Board поэлементно:
+победитель, свободные клетки, заполненность и угрозы на случайных позициях.
+"""
+
+import random
+
+import numpy as np
+import pytest
+
+from src.batch_eval import evaluate_batch, boards_to_array, X, O, BOTH_WIN
+from src.bitboard import BitBoard
+from src.board import Board
+from src.lines import get_win_lines
+
+POSITIONS = 300
+WINNER_CODES = {None: 0, 'X': X, 'O': O}
+
+
+def random_position(rng, size, win_length):
+    """
+    Позиция случайной партии, остановленной на случайном ходу
+    (в том числе после победы или на заполненном поле).
+    """
+    board = Board(size, win_length, verbose=False)
+    stop = rng.randint(0, size * size)
+    symbol = 'X'
+    while board.move_count < stop and not board.winner and not board.is_full():
+        board.make_move(*board.random_move(rng), symbol)
+        symbol = 'O' if symbol == 'X' else 'X'
+    return board
+
+
+def scalar_threats(board, symbol):
+    """
+    Открытые линии, где symbol не хватает одного камня, - перебором линий.
+    """
+    threats = 0
+    for line in get_win_lines(board.size, board.win_length):
+        cells = [board.get_cell(row, col) for row, col in line]
+        if cells.count(symbol) == board.win_length - 1 and cells.count(' ') == 1:
+            threats += 1
+    return threats
+
+
+@pytest.mark.parametrize('size', range(3, Board.MAX_SIZE + 1))
+def test_matches_board(size):
+    rng = random.Random(size)
+    for win_length in range(3, size + 1):
+        boards = [random_position(rng, size, win_length) for _ in range(POSITIONS // size)]
+        result = evaluate_batch(boards_to_array(boards), win_length)
+        for number, board in enumerate(boards):
+            assert result['winner'][number] == WINNER_CODES[board.winner]
+            assert result['is_full'][number] == board.is_full()
+            legal = {tuple(cell) for cell in np.argwhere(result['legal_moves'][number])}
+            expected = set() if board.winner else set(board.get_available_moves())
+            assert legal == expected
+            assert result['x_threats'][number] == scalar_threats(board, 'X')
+            assert result['o_threats'][number] == scalar_threats(board, 'O')
+
+
+def test_last_move_agrees_with_check_winner_after_move():
+    # Победитель пачки - тот, кого находит проверка через последний ход
+    rng = random.Random(0)
+    for _ in range(POSITIONS):
+        size = rng.randint(3, Board.MAX_SIZE)
+        board = random_position(rng, size, rng.randint(3, size))
+        if not board.moves:
+            continue
+        row, col = board.moves[-1]
+        symbol = board.get_cell(row, col)
+        before = evaluate_batch(boards_to_array([board]), board.win_length)['winner'][0]
+        board.pop()
+        # place ставит камень и вызывает check_winner_after_move
+        is_winning = board.place(row, col, symbol)
+        assert before == (WINNER_CODES[symbol] if is_winning else 0)
+
+
+def test_bitboard_input():
+    rng = random.Random(1)
+    boards = [random_position(rng, 6, 4) for _ in range(50)]
+    bit_boards = [BitBoard.from_board(board) for board in boards]
+    assert np.array_equal(boards_to_array(boards), boards_to_array(bit_boards))
+
+
+def test_arbitrary_arrays_both_win():
+    # Недостижимые в игре позиции: линии могут быть собраны у обоих
+    rng = np.random.default_rng(0)
+    boards = rng.integers(0, 3, size=(500, 5, 5), dtype=np.int8)
+    winner = evaluate_batch(boards, 4)['winner']
+    lines = get_win_lines(5, 4)
+    for number, position in enumerate(boards):
+        x_won = any(all(position[r, c] == X for r, c in line) for line in lines)
+        o_won = any(all(position[r, c] == O for r, c in line) for line in lines)
+        expected = BOTH_WIN if x_won and o_won else X if x_won else O if o_won else 0
+        assert winner[number] == expected
@@ -0,0 +1,88 @@
+"""
+BitBoard ведет себя так же, как Board, на случайных партиях:
+результат каждого хода, победитель, выигрышная комбинация, ничья и состояние.
+"""
+
+import random
+
+import pytest
+
+from src.bitboard import BitBoard
+from src.board import Board
+
+GAMES = 500
+
+
+def assert_same(board, bit_board):
+    assert bit_board.get_state() == board.get_state()
+    assert bit_board.is_draw() == board.is_draw()
+    assert sorted(bit_board.get_available_moves()) == sorted(board.get_available_moves())
+    assert bit_board.hash == board.hash
+
+
+@pytest.mark.parametrize('seed', range(GAMES))
+def test_random_game(seed):
+    rng = random.Random(seed)
+    size = rng.randint(3, Board.MAX_SIZE)
+    win_length = rng.randint(3, size)
+    board = Board(size, win_length, verbose=False)
+    bit_board = BitBoard(size, win_length, verbose=False)
+
+    symbol = 'X'
+    while True:
+        move = board.random_move(rng)
+        result = board.make_move(*move, symbol)
+        assert bit_board.make_move(*move, symbol) == result
+        assert_same(board, bit_board)
+        if result[1] or board.is_draw():
+            break
+        symbol = 'O' if symbol == 'X' else 'X'
+
+    # Отмена до пустого поля тоже совпадает
+    while board.moves:
+        assert bit_board.pop() == board.pop()
+        assert_same(board, bit_board)
+
+
+@pytest.mark.parametrize('size', range(3, Board.MAX_SIZE + 1))
+def test_rejected_moves(size):
+    board = Board(size, verbose=False)
+    bit_board = BitBoard(size, verbose=False)
+    board.make_move(0, 0, 'X')
+    bit_board.make_move(0, 0, 'X')
+    for move in ((0, 0, 'O'), (1, 1, 'X'), (size, 0, 'O'), (0, -1, 'O'), (1, 1, 'Z')):
+        assert bit_board.make_move(*move) == board.make_move(*move) == (False, False)
+    assert_same(board, bit_board)
+
+
+def test_full_board_draw():
+    # X O X / X O O / O X X - поле заполнено, победителя нет
+    moves = [(0, 0), (0, 1), (0, 2), (1, 1), (1, 0), (1, 2), (2, 1), (2, 0), (2, 2)]
+    board = Board(3, verbose=False)
+    bit_board = BitBoard(3, verbose=False)
+    for number, move in enumerate(moves):
+        symbol = 'X' if number % 2 == 0 else 'O'
+        assert bit_board.make_move(*move, symbol) == board.make_move(*move, symbol)
+    assert board.is_full() and board.is_draw() and board.winner is None
+    assert_same(board, bit_board)
+
+
+@pytest.mark.parametrize('seed', range(100))
+def test_from_board_pop(seed):
+    # Board хранит для отмены обычного хода только last_symbol, а после победы - кортеж
+    rng = random.Random(seed)
+    size = rng.randint(3, Board.MAX_SIZE)
+    board = Board(size, rng.randint(3, size), verbose=False)
+    while not board.winner and not board.is_full():
+        board.push(*board.random_move(rng))
+        if board.winner and rng.random() < 0.5:
+            # Ход поверх победы: у Board в стеке отмены будет кортеж
+            move = board.random_move(rng)
+            if move is not None:
+                board.push(*move)
+
+    bit_board = BitBoard.from_board(board)
+    assert_same(board, bit_board)
+    while board.moves:
+        assert bit_board.pop() == board.pop()
+        assert_same(board, bit_board)
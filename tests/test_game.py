@@ -0,0 +1,60 @@
+"""
+Недопустимые ходы в Game: человеку ход предлагается снова,
+остальные игроки завершают ход с ошибкой, а не зацикливают партию.
+"""
+
+from src.events import EventSink, MOVE_REJECTED, OCCUPIED, ERROR
+from src.game import Game
+from src.players import Player
+
+
+class ScriptedPlayer(Player):
+    """
+    Ходит по списку, последний ход повторяет.
+    """
+    __slots__ = ('moves', 'calls')
+
+    def __init__(self, symbol, moves):
+        super().__init__(symbol)
+        self.moves = list(moves)
+        self.calls = 0
+
+    def get_move(self, board):
+        self.calls += 1
+        return self.moves.pop(0) if len(self.moves) > 1 else self.moves[0]
+
+
+class InteractivePlayer(ScriptedPlayer):
+    __slots__ = ()
+    interactive = True
+
+
+class Collector(EventSink):
+    def __init__(self):
+        self.events = []
+
+    def emit(self, kind, **fields):
+        self.events.append((kind, fields))
+
+
+def test_illegal_move_ends_turn_with_error():
+    sink = Collector()
+    stubborn = ScriptedPlayer('O', [(0, 0)])
+    game = Game(ScriptedPlayer('X', [(0, 0), (1, 1)]), stubborn, events=sink)
+    # Раньше партия здесь зацикливалась
+    game.play_full_game()
+
+    assert stubborn.calls == 1
+    assert not game.game_over
+    assert len(game.history) == 1
+    reasons = [fields['reason'] for kind, fields in sink.events if kind == MOVE_REJECTED]
+    assert reasons == [OCCUPIED, ERROR]
+
+
+def test_interactive_player_is_asked_again():
+    human = InteractivePlayer('O', [(0, 0), (0, 0), (2, 2)])
+    game = Game(ScriptedPlayer('X', [(0, 0), (1, 1)]), human, verbose=False)
+    assert game.play_turn()
+    assert game.play_turn()
+    assert human.calls == 3
+    assert game.history[-1]['position'] == (2, 2)
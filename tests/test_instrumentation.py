@@ -0,0 +1,29 @@
+"""
+Гистограммы задержек: квантили и снимки в JSON.
+"""
+
+import json
+
+from src.instrumentation import Histogram, Instrumentation, describe_p99
+
+
+def test_quantile_within_buckets():
+    histogram = Histogram(buckets=(0.001, 0.01, 0.1))
+    for seconds in (0.0005, 0.005, 0.005, 0.05):
+        histogram.observe(seconds)
+    assert histogram.quantile(0.5) == 0.01
+    assert histogram.quantile(0.99) == 0.1
+
+
+def test_quantile_above_last_bucket_is_valid_json():
+    metrics = Instrumentation(targets=[])
+    histogram = metrics.histograms.setdefault('slow', Histogram(buckets=(0.001, 0.01)))
+    histogram.observe(5.0)
+    assert histogram.quantile(0.99) is None
+
+    # Стандартный json.loads принимает Infinity, поэтому проверяем строгим разбором
+    def reject(constant):
+        raise ValueError(constant)
+    data = json.loads(metrics.to_json(), parse_constant=reject)
+    assert data['slow']['p99'] is None
+    assert describe_p99(data['slow']) == "p99 > 10000 мкс"
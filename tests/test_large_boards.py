@@ -0,0 +1,66 @@
+"""
+Компьютер на больших разреженных полях и на поле без границ.
+"""
+
+import pytest
+
+from src.game import Game
+from src.players import AIPlayer
+from src.records import GameRecordWriter, RecordError, read_games
+from src.sparse_board import SparseBoard
+from src.transposition import TranspositionTable
+
+
+def test_transposition_table_stores_large_cell_index():
+    table = TranspositionTable(0.01)
+    table.store(12345, 3, 7, 1, 15 * 15 - 1)
+    assert table.probe(12345) == (3, 7, 1, 224)
+
+
+@pytest.mark.parametrize('difficulty', ['hard', 'mcts'])
+def test_ai_plays_on_15x15(difficulty):
+    players = [AIPlayer(symbol, difficulty=difficulty, time_limit=0.1, think_time=0,
+                        use_cache=False, seed=0) for symbol in ('X', 'O')]
+    game = Game(*players, board_size=15, board_backend='sparse', win_length=5, verbose=False)
+    for _ in range(4):
+        assert game.play_turn()
+    assert len(game.history) == 4
+
+
+@pytest.mark.parametrize('difficulty', ['hard', 'mcts'])
+def test_bounded_difficulties_reject_unbounded_board(difficulty):
+    player = AIPlayer('X', difficulty=difficulty, think_time=0, use_cache=False)
+    with pytest.raises(ValueError, match="поле с границами"):
+        Game(player, AIPlayer('O', think_time=0), board_size=None, board_backend='sparse',
+             verbose=False)
+    with pytest.raises(ValueError, match="поле с границами"):
+        player.get_move(SparseBoard(None, verbose=False))
+
+
+@pytest.mark.parametrize('difficulty', ['easy', 'medium'])
+def test_unbounded_board(difficulty):
+    players = [AIPlayer(symbol, difficulty=difficulty, think_time=0, seed=1) for symbol in ('X', 'O')]
+    game = Game(*players, board_size=None, board_backend='sparse', verbose=False)
+    for _ in range(6):
+        assert game.play_turn()
+
+
+@pytest.mark.parametrize('size', [None, 16])
+def test_record_writer_rejects_board_outside_format(tmp_path, size):
+    players = [AIPlayer(symbol, think_time=0, seed=0) for symbol in ('X', 'O')]
+    with GameRecordWriter(str(tmp_path / 'games.rec')) as writer:
+        with pytest.raises(RecordError):
+            Game(*players, board_size=size, board_backend='sparse', verbose=False,
+                 record_writer=writer)
+
+
+def test_record_writer_on_15x15(tmp_path):
+    path = str(tmp_path / 'games.rec')
+    players = [AIPlayer(symbol, think_time=0, seed=0) for symbol in ('X', 'O')]
+    with GameRecordWriter(path) as writer:
+        game = Game(*players, board_size=15, board_backend='sparse', win_length=5,
+                    verbose=False, record_writer=writer)
+        for _ in range(3):
+            assert game.play_turn()
+    record, = read_games(path)
+    assert record.moves == game.board.moves
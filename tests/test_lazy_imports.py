@@ -0,0 +1,39 @@
+"""
+Модули движков грузятся только для уровней, которым они нужны.
+Каждая проверка - в новом процессе, где еще ничего не импортировано.
+"""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ENGINE_MODULES = ('src.search', 'src.mcts', 'src.ponder', 'src.tablebase', 'src.position_cache')
+
+
+def loaded_modules(code):
+    script = code + "\nimport sys\nprint(' '.join(name for name in sys.modules if name.startswith('src.')))"
+    result = subprocess.run([sys.executable, '-c', script], cwd=ROOT,
+                            capture_output=True, text=True, check=True)
+    return set(result.stdout.split())
+
+
+@pytest.mark.parametrize('difficulty', ['easy', 'medium'])
+def test_simple_levels_skip_engines(difficulty):
+    modules = loaded_modules(
+        "from src.board import Board\n"
+        "from src.players import AIPlayer\n"
+        f"player = AIPlayer('X', difficulty='{difficulty}', think_time=0)\n"
+        "player.get_move(Board(3, verbose=False))")
+    assert not modules & set(ENGINE_MODULES)
+
+
+def test_hard_loads_search_without_ponder():
+    modules = loaded_modules(
+        "from src.board import Board\n"
+        "from src.players import AIPlayer\n"
+        "AIPlayer('X', difficulty='hard', time_limit=0.05).get_move(Board(5, 4, verbose=False))")
+    assert {'src.search', 'src.tablebase', 'src.position_cache'} <= modules
+    assert 'src.ponder' not in modules and 'src.mcts' not in modules
@@ -0,0 +1,59 @@
+"""
+Общий кэш позиций не отдает ходы, найденные с другими настройками поиска.
+"""
+
+import pytest
+
+from src.board import Board
+from src.players import AIPlayer
+from src.position_cache import PositionCache
+
+
+@pytest.fixture
+def shared_cache(monkeypatch):
+    cache = PositionCache()
+    monkeypatch.setattr(AIPlayer, 'position_cache', cache)
+    return cache
+
+
+def test_settings_are_part_of_key():
+    cache = PositionCache()
+    board = Board(5, 4, verbose=False)
+    board.push(2, 2)
+    cache.put(board, 'O', (1, 1), settings=('hard', 2, 0.05))
+    assert cache.get(board, 'O', settings=('hard', 4, 1.0)) is None
+    assert cache.get(board, 'O', settings=('hard', 2, 0.05)) == (1, 1)
+
+
+def test_symmetric_position_with_same_settings():
+    cache = PositionCache()
+    board = Board(5, 4, verbose=False)
+    board.push(0, 1)
+    cache.put(board, 'O', (1, 1), settings='s')
+    mirrored = Board(5, 4, verbose=False)
+    mirrored.push(1, 0)
+    assert cache.get(mirrored, 'O', settings='s') == (1, 1)
+
+
+def test_players_with_different_settings(shared_cache):
+    board = Board(5, 4, verbose=False)
+    board.push(2, 2)
+    shallow = AIPlayer('O', difficulty='hard', max_depth=1, time_limit=5, think_time=0)
+    deep = AIPlayer('O', difficulty='hard', max_depth=2, time_limit=5, think_time=0)
+
+    shallow.get_move(board)
+    assert shared_cache.misses == 1 and len(shared_cache) == 1
+    deep.get_move(board)
+    assert shared_cache.hits == 0 and len(shared_cache) == 2
+
+    # Тот же игрок (и такие же настройки) берет ход из кэша
+    same = AIPlayer('O', difficulty='hard', max_depth=1, time_limit=5, think_time=0)
+    assert same.get_move(board) == shallow.get_move(board)
+    assert shared_cache.hits == 2
+
+
+def test_use_cache_false(shared_cache):
+    board = Board(5, 4, verbose=False)
+    board.push(2, 2)
+    AIPlayer('O', difficulty='hard', max_depth=1, time_limit=5, use_cache=False).get_move(board)
+    assert len(shared_cache) == 0 and shared_cache.misses == 0
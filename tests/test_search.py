@@ -0,0 +1,56 @@
+"""
+Поисковый движок: одна таблица транспозиций на разных полях.
+"""
+
+import random
+
+from src.board import Board
+from src.search import SearchEngine
+from src.sparse_board import SparseBoard
+
+
+def test_win_length_change_does_not_reuse_scores():
+    # Ключи Зобриста на 4х4 одни и те же для линии 3 и 4
+    rng = random.Random(0)
+    for _ in range(15):
+        short_line = Board(4, 3, verbose=False)
+        board = Board(4, 4, verbose=False)
+        for _ in range(rng.randint(2, 6)):
+            move = board.random_move(rng)
+            board.push(*move)
+            short_line.push(*move)
+        if short_line.winner:
+            continue
+        symbol = 'O' if board.last_symbol == 'X' else 'X'
+
+        shared = SearchEngine(time_limit=5, max_depth=4)
+        shared.search(short_line, symbol)
+        shared.search(board, symbol)
+        fresh = SearchEngine(time_limit=5, max_depth=4)
+        fresh.search(board, symbol)
+        assert shared.last_stats['score'] == fresh.last_stats['score']
+
+
+def search_after_two_moves(backend, warm_up):
+    """
+    Поиск после двух ходов; warm_up - тем же движком перед этими ходами.
+    Return: (ход, узлы второго поиска).
+    """
+    board = backend(6, 4, verbose=False)
+    engine = SearchEngine(time_limit=30, max_depth=4)
+    for row, col in ((2, 2), (3, 3)):
+        board.push(row, col)
+    if warm_up:
+        engine.search(board, 'X')
+    for row, col in ((2, 3), (3, 2)):
+        board.push(row, col)
+    move = engine.search(board, 'X')
+    return move, engine.last_stats['nodes']
+
+
+def test_sparse_board_reuses_table_across_moves():
+    # Ключ корня на SparseBoard совпадает с ключами потомков из прошлого поиска
+    fresh = search_after_two_moves(SparseBoard, warm_up=False)
+    warm = search_after_two_moves(SparseBoard, warm_up=True)
+    assert warm[1] < fresh[1]
+    assert warm == search_after_two_moves(Board, warm_up=True)
@@ -0,0 +1,204 @@
+"""
+Сервер игровых сессий: разбор протокола, ход партии в GameSession
+и ходы клиента во время хода компьютера.
+Ходы компьютера считаются в пуле потоков, а не процессов.
+"""
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.server import players as server_players
+from src.server.players import AsyncPlayer, compute_ai_move
+from src.server.server import GameServer
+from src.server.session import GameSession, DRAW, TIMEOUT
+
+TIMEOUT_S = 10
+
+
+class GatedExecutor(ThreadPoolExecutor):
+    """
+    Пул, в котором ход компьютера начинается только после gate.set().
+    """
+
+    def __init__(self):
+        super().__init__(max_workers=2)
+        self.gate = threading.Event()
+        self.gate.set()
+
+    def submit(self, fn, *args, **kwargs):
+        def gated():
+            self.gate.wait(TIMEOUT_S)
+            return fn(*args, **kwargs)
+        return super().submit(gated)
+
+
+class ScriptedPlayer(AsyncPlayer):
+    __slots__ = ('moves',)
+
+    def __init__(self, symbol, moves):
+        super().__init__(symbol)
+        self.moves = list(moves)
+
+    async def get_move(self, board):
+        if not self.moves:
+            await asyncio.sleep(TIMEOUT_S)
+        return self.moves.pop(0)
+
+
+def run(coroutine):
+    return asyncio.run(asyncio.wait_for(coroutine, TIMEOUT_S))
+
+
+async def connect(server):
+    reader, writer = await asyncio.open_connection(server.host, server.port)
+
+    async def send(line):
+        writer.write(line.encode() + b'\n')
+        await writer.drain()
+
+    async def receive():
+        return (await reader.readline()).decode().strip()
+
+    return send, receive, writer
+
+
+async def with_server(client, executor=None, **options):
+    executor = executor or ThreadPoolExecutor(max_workers=2)
+    server = GameServer(port=0, executor=executor, **options)
+    await server.start()
+    try:
+        return await client(server)
+    finally:
+        await server.close()
+        executor.shutdown(wait=False)
+
+
+def test_parse_new():
+    server = GameServer()
+    assert server._parse_new(['NEW']) == (3, None, 'easy', 'X')
+    assert server._parse_new(['NEW', '5', '4', 'hard', 'o']) == (5, 4, 'hard', 'O')
+    with pytest.raises(ValueError, match="difficulty"):
+        server._parse_new(['NEW', '3', '3', 'expert'])
+    with pytest.raises(ValueError, match="symbol"):
+        server._parse_new(['NEW', '3', '3', 'easy', 'Z'])
+    with pytest.raises(ValueError):
+        server._parse_new(['NEW', 'big'])
+
+
+@pytest.mark.parametrize('command, reply', [
+    ('HELLO', 'ERROR expected NEW'),
+    ('NEW 3 3 expert', 'ERROR unknown difficulty expert'),
+    ('NEW 12', 'ERROR Допустимый размер поля от 3 до 8, ваше значение - 12'),
+])
+def test_bad_new(command, reply):
+    async def client(server):
+        send, receive, writer = await connect(server)
+        await send(command)
+        assert await receive() == reply
+        writer.close()
+    run(with_server(client))
+
+
+def test_full_game_against_easy():
+    async def client(server):
+        send, receive, writer = await connect(server)
+        await send('NEW 3 3 easy X')
+        assert (await receive()).split()[2:] == ['3', '3', 'X']
+        free = [(row, col) for row in range(3) for col in range(3)]
+        await send('MOVE 1 1')
+        free.remove((1, 1))
+        while True:
+            line = await receive()
+            if line.startswith('END'):
+                break
+            kind, row, col, symbol = line.split()
+            assert kind == 'MOVE' and symbol == 'O'
+            free.remove((int(row), int(col)))
+            move = free.pop(0)
+            await send(f'MOVE {move[0]} {move[1]}')
+        assert line.split()[1] in ('X', 'O', DRAW)
+        writer.close()
+        return server.get_stats()
+
+    stats = run(with_server(client))
+    assert stats['total_sessions'] == 1 and sum(stats['results'].values()) == 1
+
+
+def test_protocol_errors_during_game():
+    async def client(server):
+        send, receive, writer = await connect(server)
+        await send('NEW 3 3 easy X')
+        await receive()
+        await send('JUMP 1 1')
+        assert await receive() == 'ERROR expected MOVE <row> <col>'
+        await send('MOVE a b')
+        assert await receive() == 'ERROR coordinates must be integers'
+        await send('MOVE 5 5')
+        assert await receive() == 'ERROR illegal move'
+        await send('MOVE 1 1')
+        assert (await receive()).startswith('MOVE ')
+        writer.close()
+    run(with_server(client))
+
+
+def test_move_during_ai_turn_is_rejected():
+    executor = GatedExecutor()
+
+    async def client(server):
+        send, receive, writer = await connect(server)
+        executor.gate.clear()
+        # Компьютер играет X и ходит первым
+        await send('NEW 3 3 easy O')
+        await receive()
+        await send('MOVE 0 0')
+        assert await receive() == 'ERROR not your turn'
+
+        executor.gate.set()
+        _, row, col, _ = (await receive()).split()
+        # Отклоненный ход не остался в очереди: клиента снова ждут
+        free = next((r, c) for r in range(3) for c in range(3) if (r, c) != (int(row), int(col)))
+        executor.gate.clear()
+        await send(f'MOVE {free[0]} {free[1]}')
+        await asyncio.sleep(0.1)
+        await send(f'MOVE {free[0]} {free[1]}')
+        assert await receive() == 'ERROR not your turn'
+        executor.gate.set()
+        assert (await receive()).startswith('MOVE ')
+        writer.close()
+    run(with_server(client, executor))
+
+
+def test_session_rejects_illegal_move_and_finds_winner():
+    events = []
+
+    async def listener(event, symbol, row, col):
+        events.append((event, symbol, row, col))
+
+    player_x = ScriptedPlayer('X', [(0, 0), (0, 1), (0, 2)])
+    player_o = ScriptedPlayer('O', [(0, 0), (1, 0), (1, 1)])
+    session = GameSession(1, player_x, player_o, listener=listener)
+    assert run(session.play()) == 'X'
+    assert ('rejected', 'O', 0, 0) in events
+    assert [event for event in events if event[0] == 'move'][-1] == ('move', 'X', 0, 2)
+    assert player_x.wins == 1 and player_o.total_games == 1
+
+
+def test_session_draw_and_timeout():
+    moves_x = [(0, 0), (0, 2), (1, 0), (2, 1), (2, 2)]
+    moves_o = [(0, 1), (1, 1), (1, 2), (2, 0)]
+    session = GameSession(1, ScriptedPlayer('X', moves_x), ScriptedPlayer('O', moves_o))
+    assert run(session.play()) == DRAW
+
+    session = GameSession(2, ScriptedPlayer('X', []), ScriptedPlayer('O', []), move_timeout=0.05)
+    assert run(session.play()) == TIMEOUT
+
+
+def test_worker_players_keyed_by_board(monkeypatch):
+    monkeypatch.setattr(server_players, '_worker_players', {})
+    compute_ai_move('hard', 'X', 5, 4, [], 0.05)
+    compute_ai_move('hard', 'X', 5, 5, [], 0.05)
+    compute_ai_move('hard', 'X', 5, 4, [(2, 2), (1, 1)], 0.05)
+    assert len(server_players._worker_players) == 2
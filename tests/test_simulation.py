@@ -0,0 +1,48 @@
+"""
+Пакетная симуляция дает те же итоги и длины партий, что и Game.
+"""
+
+import pytest
+
+from src.board import Board
+from src.game import Game
+from src.players import AIPlayer, Player
+from src.simulation import _simulate_players, run_simulation
+
+
+def new_players(seed):
+    return {symbol: AIPlayer(symbol, difficulty='medium', think_time=0, use_cache=False,
+                             seed=seed + index)
+            for index, symbol in enumerate(('X', 'O'))}
+
+
+@pytest.mark.parametrize('size, win_length', [(3, 3), (4, 3), (5, 4)])
+def test_matches_game(size, win_length):
+    for seed in range(20):
+        players = new_players(seed)
+        game = Game(players['X'], players['O'], board_size=size, win_length=win_length,
+                    verbose=False)
+        game.play_full_game()
+        result = 0 if game.winner is None else (1 if game.winner.symbol == 'X' else 2)
+
+        outcomes = _simulate_players(1, Board(size, win_length, verbose=False), new_players(seed))
+        assert outcomes == [len(game.history) * 3 + result]
+
+
+class OccupiedCellPlayer(Player):
+    __slots__ = ()
+
+    def get_move(self, board):
+        return 0, 0
+
+
+def test_illegal_move_raises():
+    players = {'X': OccupiedCellPlayer('X'), 'O': OccupiedCellPlayer('O')}
+    with pytest.raises(ValueError, match="недопустимый ход"):
+        _simulate_players(1, Board(3, verbose=False), players)
+
+
+def test_hard_time_limit():
+    stats = run_simulation(2, size=4, x_difficulty='hard', o_difficulty='easy',
+                           seed=0, time_limit=0.01)
+    assert stats['games'] == 2
@@ -0,0 +1,23 @@
+"""
+Загрузка таблиц идеальной игры.
+"""
+
+import pytest
+
+from src import tablebase
+
+
+def test_corrupt_table_warns_instead_of_printing(tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr(tablebase, '_loaded', {})
+    path = tablebase.get_table_path(3, 3, str(tmp_path))
+    with open(path, 'wb') as file:
+        file.write(b'not a table')
+
+    with pytest.warns(RuntimeWarning, match="не загружена"):
+        assert tablebase.get_tablebase(3, 3, str(tmp_path)) is None
+    assert capsys.readouterr().out == ''
+
+
+def test_missing_table(tmp_path, monkeypatch):
+    monkeypatch.setattr(tablebase, '_loaded', {})
+    assert tablebase.get_tablebase(3, 3, str(tmp_path)) is None
@@ -0,0 +1,102 @@
+"""
+Проверка победы через последний ход против полного перебора поля.
+Случайные партии на полях от 3х3 до 8х8 с линией короче поля:
+диагонали в любом месте, линии у края, линии длиннее win_length.
+"""
+
+import random
+
+import pytest
+
+from src.bitboard import BitBoard
+from src.board import Board
+from src.lines import DIRECTIONS
+from src.sparse_board import SparseBoard
+
+GAMES_PER_SIZE = 150
+BACKENDS = (Board, BitBoard, SparseBoard)
+
+
+def brute_force_winner(grid, win_length):
+    """
+    Перебирает все клетки и направления.
+    Return: символ, собравший линию, или None.
+    """
+    size = len(grid)
+    for row in range(size):
+        for col in range(size):
+            symbol = grid[row][col]
+            if symbol == ' ':
+                continue
+            for dr, dc in DIRECTIONS:
+                end_row = row + dr * (win_length - 1)
+                end_col = col + dc * (win_length - 1)
+                if not (0 <= end_row < size and 0 <= end_col < size):
+                    continue
+                if all(grid[row + dr * i][col + dc * i] == symbol for i in range(win_length)):
+                    return symbol
+    return None
+
+
+def assert_winning_cells(board, row, col, symbol):
+    """
+    Выигрышная комбинация - win_length подряд идущих клеток symbol через ход.
+    """
+    cells = board.winning_cells
+    assert len(cells) == board.win_length
+    assert (row, col) in cells
+    assert all(board.get_cell(r, c) == symbol for r, c in cells)
+    dr, dc = cells[1][0] - cells[0][0], cells[1][1] - cells[0][1]
+    assert (dr, dc) in DIRECTIONS
+    assert all(cells[i] == (cells[0][0] + dr * i, cells[0][1] + dc * i) for i in range(len(cells)))
+
+
+@pytest.mark.parametrize('backend', BACKENDS, ids=lambda cls: cls.__name__)
+@pytest.mark.parametrize('size', range(3, 9))
+def test_random_games(backend, size):
+    rng = random.Random(size)
+    for _ in range(GAMES_PER_SIZE):
+        win_length = rng.randint(3, size)
+        board = backend(size, win_length, verbose=False)
+        grid = [[' '] * size for _ in range(size)]
+        symbol = 'X'
+        while True:
+            row, col = board.random_move(rng)
+            _, is_winning = board.make_move(row, col, symbol)
+            grid[row][col] = symbol
+            expected = brute_force_winner(grid, win_length)
+            assert is_winning == (expected is not None)
+            assert board.winner == expected
+            if is_winning:
+                assert_winning_cells(board, row, col, symbol)
+                break
+            if board.is_full():
+                break
+            symbol = 'O' if symbol == 'X' else 'X'
+
+
+@pytest.mark.parametrize('backend', BACKENDS, ids=lambda cls: cls.__name__)
+def test_edge_lines(backend):
+    # На 8х8 линия из 5 у каждого края и на коротких диагоналях в углах
+    lines = [
+        [(0, col) for col in range(3, 8)],
+        [(row, 7) for row in range(2, 7)],
+        [(7, col) for col in range(0, 5)],
+        [(row, 0) for row in range(3, 8)],
+        [(3 + i, i) for i in range(5)],
+        [(i, 4 - i) for i in range(5)],
+        [(3 + i, 7 - i) for i in range(5)],
+    ]
+    for line in lines:
+        board = backend(8, 5, verbose=False)
+        taken = set(line)
+        others = [(row, col) for row in range(8) for col in range(8) if (row, col) not in taken]
+        # Ответы O вдали от линии, X ставит последний камень в середину
+        order = line[:2] + line[3:] + line[2:3]
+        for number, (row, col) in enumerate(order):
+            _, is_winning = board.make_move(row, col, 'X')
+            assert is_winning == (number == len(order) - 1)
+            if not is_winning:
+                assert board.make_move(*others.pop(), 'O')[0]
+        assert board.winner == 'X'
+        assert sorted(board.winning_cells) == sorted(line)